@@ -156,3 +156,48 @@ class AuthenticatedAreaClient(AreaClient):
             Tuple[int, list]: HTTP status code and a list of service names (as JSON).
         """
         return await self.request("GET", "api/user_services/connected")
+
+    async def list_dead_letters(self, count: int = 50):
+        """
+        GET /api/admin/dead-letters
+        Retrieve the latest tasks that exhausted their retries (admin only).
+
+        Args:
+            count (int): Number of entries to retrieve, newest first.
+
+        Returns:
+            Tuple[int, dict]: HTTP status code and {"total", "entries"} (as JSON).
+        """
+        return await self.request(
+            "GET", "api/admin/dead-letters", params={"count": count}
+        )
+
+    async def replay_dead_letter(self, entry_id: str):
+        """
+        POST /api/admin/dead-letters/{entry_id}/replay
+        Push a dead letter back onto the task queue (admin only).
+
+        Returns:
+            Tuple[int, dict]: HTTP status code and {"replayed"} (as JSON).
+        """
+        return await self.request("POST", f"api/admin/dead-letters/{entry_id}/replay")
+
+    async def replay_dead_letters(self):
+        """
+        POST /api/admin/dead-letters/replay
+        Push every dead letter back onto the task queue (admin only).
+
+        Returns:
+            Tuple[int, dict]: HTTP status code and {"replayed"} (as JSON).
+        """
+        return await self.request("POST", "api/admin/dead-letters/replay")
+
+    async def delete_dead_letter(self, entry_id: str):
+        """
+        DELETE /api/admin/dead-letters/{entry_id}
+        Drop a dead letter for good (admin only).
+
+        Returns:
+            Tuple[int, dict]: HTTP status code and {"deleted"} (as JSON).
+        """
+        return await self.request("DELETE", f"api/admin/dead-letters/{entry_id}")
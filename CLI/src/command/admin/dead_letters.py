@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import List, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from src.async_typer import AsyncTyper
+from src.client.auth_client import AuthenticatedAreaClient
+from src.command.config import settings
+from src.utils.auth import get_auth_area
+
+console = Console()
+app = AsyncTyper(no_args_is_help=True)
+
+
+@app.command("list")
+async def list_dead_letters(
+    count: int = typer.Option(50, help="Number of dead letters to show"),
+    username: str = typer.Option(settings.user_name, help="Username"),
+    password: Optional[str] = typer.Option(settings.password, help="Password"),
+):
+    """
+    List the latest tasks that exhausted their retries, newest first.
+    """
+    client: AuthenticatedAreaClient = await get_auth_area(username, password)
+    status, data = await client.list_dead_letters(count)
+
+    if status != 200:
+        console.print(f"[red]Failed to retrieve dead letters (status={status}).[/red]")
+        console.print(data)
+        raise typer.Exit(code=1)
+
+    if not data["entries"]:
+        console.print("[yellow]No dead letters.[/yellow]")
+        return
+
+    table = Table(title=f"Dead letters ({data['total']} in total)")
+    table.add_column("ID", style="bold cyan")
+    table.add_column("Failed at", style="dim")
+    table.add_column("Reaction", style="green")
+    table.add_column("User", style="dim")
+    table.add_column("Attempts", justify="right")
+    table.add_column("Error", style="red")
+
+    for entry in data["entries"]:
+        table.add_row(
+            entry["id"],
+            datetime.fromtimestamp(entry["failed_at"]).isoformat(" ", "seconds"),
+            entry["reaction"] or "-",
+            entry["tenant"] or "-",
+            str(entry["attempts"]),
+            entry["error"],
+        )
+
+    console.print(table)
+
+
+@app.command("replay")
+async def replay_dead_letters(
+    entry_ids: Optional[List[str]] = typer.Argument(
+        None, help="IDs of the dead letters to replay"
+    ),
+    all_: bool = typer.Option(False, "--all", help="Replay every dead letter"),
+    username: str = typer.Option(settings.user_name, help="Username"),
+    password: Optional[str] = typer.Option(settings.password, help="Password"),
+):
+    """
+    Push dead letters back onto the task queue with a fresh retry budget.
+    """
+    if not entry_ids and not all_:
+        console.print("[red]Give dead letter IDs or --all.[/red]")
+        raise typer.Exit(code=1)
+
+    client: AuthenticatedAreaClient = await get_auth_area(username, password)
+
+    if all_:
+        status, data = await client.replay_dead_letters()
+        if status != 200:
+            console.print(
+                f"[red]Failed to replay dead letters (status={status}).[/red]"
+            )
+            console.print(data)
+            raise typer.Exit(code=1)
+        console.print(f"[green]Replayed {data['replayed']} dead letters.[/green]")
+        return
+
+    await _for_each(client.replay_dead_letter, entry_ids, "Replayed")
+
+
+@app.command("drop")
+async def drop_dead_letters(
+    entry_ids: List[str] = typer.Argument(..., help="IDs of the dead letters"),
+    username: str = typer.Option(settings.user_name, help="Username"),
+    password: Optional[str] = typer.Option(settings.password, help="Password"),
+):
+    """
+    Delete dead letters for good.
+    """
+    client: AuthenticatedAreaClient = await get_auth_area(username, password)
+    await _for_each(client.delete_dead_letter, entry_ids, "Dropped")
+
+
+async def _for_each(request, entry_ids: List[str], done: str):
+    failed = 0
+    for entry_id in entry_ids:
+        status, data = await request(entry_id)
+        if status == 200:
+            console.print(f"[green]{done} {entry_id}.[/green]")
+        else:
+            failed += 1
+            console.print(f"[red]{entry_id}: {data.get('detail', status)}[/red]")
+    if failed:
+        raise typer.Exit(code=1)
@@ -5,6 +5,7 @@ import typer
 from src.async_typer import AsyncTyper
 from src.command import config, utils
 from src.command.account import auth
+from src.command.admin import dead_letters
 from src.command.area import area, config
 from src.command.oauth import oauth
 
@@ -16,6 +17,7 @@ app.add_typer(utils.app, name="utils", help="Utils")
 app.add_typer(oauth.app, name="oauth", help="Oauth")
 app.add_typer(area.app, name="area", help="Workflow !")
 app.add_typer(config.app, name="config", help="Workflow Config!")
+app.add_typer(dead_letters.app, name="dead-letters", help="Failed tasks")
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,28 @@
+"""index updated_at for the trigger manager change feed
+
+Revision ID: 3c5e1f9a7b42
+Revises: b2007d8b116b
+Create Date: 2025-01-24 10:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5e1f9a7b42'
+down_revision: Union[str, None] = 'b2007d8b116b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_areas_updated_at', 'areas', ['updated_at'], unique=False)
+    op.create_index('ix_triggers_updated_at', 'triggers', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_triggers_updated_at', table_name='triggers')
+    op.drop_index('ix_areas_updated_at', table_name='areas')
@@ -0,0 +1,26 @@
+"""add state to triggers for checkpointed trigger cursors
+
+Revision ID: 8d41b6e2c0f3
+Revises: 3c5e1f9a7b42
+Create Date: 2025-01-25 09:31:07.552310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41b6e2c0f3'
+down_revision: Union[str, None] = '3c5e1f9a7b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('triggers', sa.Column('state', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('triggers', 'state')
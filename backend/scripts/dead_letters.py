@@ -0,0 +1,70 @@
+"""
+Inspect and replay the tasks that exhausted their retries.
+
+Usage (from the backend directory):
+
+    python -m scripts.dead_letters list [--count 50]
+    python -m scripts.dead_letters replay <entry id>... | --all
+    python -m scripts.dead_letters drop <entry id>...
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from src.config import async_redis_binary_client, settings
+from src.service.Queue.factory import make_dead_letters, make_task_queue
+
+
+async def run(args) -> int:
+    queue = make_task_queue(settings.queue, async_redis_binary_client)
+    dead_letters = make_dead_letters(settings.queue, queue, async_redis_binary_client)
+
+    if args.command == "list":
+        print(f"{await dead_letters.count()} dead letters in {dead_letters.key}")
+        for entry in await dead_letters.list(args.count):
+            failed_at = datetime.fromtimestamp(entry["failed_at"]).isoformat(" ")
+            print(
+                f"{entry['id']}  {failed_at}  {entry['reaction'] or '-'}  "
+                f"user {entry['tenant'] or '-'}  {entry['attempts']} attempts\n"
+                f"    {entry['error']}"
+            )
+        return 0
+
+    if args.command == "replay" and args.all:
+        print(f"Replayed {await dead_letters.replay_all()} dead letters.")
+        return 0
+
+    action = dead_letters.replay if args.command == "replay" else dead_letters.delete
+    missing = 0
+    for entry_id in args.ids:
+        if await action(entry_id):
+            print(f"{args.command}: {entry_id}")
+        else:
+            print(f"{args.command}: {entry_id} not found")
+            missing += 1
+    return 1 if missing else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="Show the latest dead letters")
+    list_parser.add_argument("--count", type=int, default=50)
+
+    replay_parser = commands.add_parser("replay", help="Queue dead letters again")
+    replay_parser.add_argument("ids", nargs="*", metavar="ID")
+    replay_parser.add_argument("--all", action="store_true", help="Replay them all")
+
+    drop_parser = commands.add_parser("drop", help="Delete dead letters")
+    drop_parser.add_argument("ids", nargs="+", metavar="ID")
+
+    args = parser.parse_args()
+    if args.command == "replay" and not (args.ids or args.all):
+        parser.error("replay needs entry ids or --all")
+    raise SystemExit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
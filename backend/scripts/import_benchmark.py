@@ -0,0 +1,116 @@
+"""
+Import-time benchmark of the web app and of the service.
+
+Each entry point is imported in a fresh interpreter, several times, and the
+script reports the median wall time, the number of modules loaded and whether
+heavy service runtime modules were pulled in, and by which module. It exits
+with status 1 when the web app's own modules import any of them.
+
+Usage (from the backend directory):
+
+    python scripts/import_benchmark.py [--runs 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+TARGETS = {
+    "web": "src.web.controllers.main",
+    "service": "src.service.main",
+}
+
+# Targets that must not import the runtime modules
+LEAN_TARGETS = {"web"}
+
+# Modules the web app should not need to import
+RUNTIME_MODULES = [
+    "src.service.Worker.worker",
+    "src.service.Trigger.discord.new_message_in_channel",
+    "src.service.services.discord.gateway",
+    "websockets",
+    "aiohttp",
+    "msgpack",
+    "zstandard",
+]
+
+PROBE = """
+import importlib, json, sys, time
+
+# Runtime module -> module whose import statement loaded it
+importers = {{}}
+
+class Recorder:
+    def find_spec(self, name, path=None, target=None):
+        if name in {runtime!r} and name not in importers:
+            frame = sys._getframe(1)
+            while frame and frame.f_code.co_filename.startswith("<frozen"):
+                frame = frame.f_back
+            importers[name] = frame.f_globals.get("__name__") if frame else None
+        return None
+
+sys.meta_path.insert(0, Recorder())
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "modules": len(sys.modules),
+    "runtime": {{
+        name: importers.get(name) for name in {runtime!r} if name in sys.modules
+    }},
+}}))
+"""
+
+
+def measure(module: str) -> dict:
+    code = PROBE.format(module=module, runtime=RUNTIME_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Imports per target")
+    args = parser.parse_args()
+
+    failed = False
+    for target, module in TARGETS.items():
+        try:
+            samples = [measure(module) for _ in range(args.runs)]
+        except subprocess.CalledProcessError as e:
+            print(f"{target:<8} {module}: import failed\n{e.stderr}")
+            failed = True
+            continue
+
+        seconds = statistics.median(sample["seconds"] for sample in samples)
+        last = samples[-1]
+        runtime = (
+            ", ".join(f"{name} (from {by})" for name, by in last["runtime"].items())
+            or "none"
+        )
+        print(
+            f"{target:<8} {module}: {seconds * 1000:.0f}ms median over "
+            f"{args.runs} runs, {last['modules']} modules, "
+            f"runtime modules: {runtime}"
+        )
+        # Third party packages may load them on their own (e.g. httpx loads
+        # zstandard when installed), only the project's imports count
+        pulled = [
+            name
+            for name, by in last["runtime"].items()
+            if name.startswith("src.") or (by or "").startswith("src.")
+        ]
+        if target in LEAN_TARGETS and pulled:
+            print(f"{target:<8} must not import: {', '.join(pulled)}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
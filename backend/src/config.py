@@ -6,6 +6,13 @@ from sqlalchemy.orm import Session
 from src.db.config import PostgresConfig
 from src.oauth.config import OAuthConfig
 from src.redis.config import RedisConfig
+from src.service.config.runtime import (
+    GatewayConfig,
+    MetricsConfig,
+    QueueConfig,
+    SchedulerConfig,
+    WorkerConfig,
+)
 from src.utils import (
     make_async_engine,
     make_async_redis_client,
@@ -22,6 +29,11 @@ class Settings(BaseSettings):
     postgres: PostgresConfig = PostgresConfig()
     redis: RedisConfig = RedisConfig()
     oauth: OAuthConfig = OAuthConfig()
+    scheduler: SchedulerConfig = SchedulerConfig()
+    worker: WorkerConfig = WorkerConfig()
+    queue: QueueConfig = QueueConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    discord_gateway: GatewayConfig = GatewayConfig()
     frontend_url: str = "http://localhost:8081"  # Default value if not set in .env
 
     class Config:
@@ -41,6 +53,10 @@ sync_session_factory = make_session_factory(sync_engine)
 
 # Make Async Redis Client
 async_redis_client = make_async_redis_client(config=settings.redis)
+# Same server, raw bytes replies, for the binary task envelopes
+async_redis_binary_client = make_async_redis_client(
+    config=settings.redis, decode_responses=False
+)
 
 
 # Dependency function for a database session
@@ -12,9 +12,10 @@ class Trigger(Base):
     area_id = Column(Integer, ForeignKey("areas.id"), nullable=False)
     config = Column(JSON, nullable=False)
     last_run = Column(DateTime, nullable=True)
+    state = Column(JSON, nullable=True)  # Checkpointed cursor of the running trigger
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(
-        DateTime, default=func.now(), onupdate=func.now(), nullable=False
+        DateTime, default=func.now(), onupdate=func.now(), nullable=False, index=True
     )
 
     # Relationship
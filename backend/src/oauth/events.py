@@ -0,0 +1,24 @@
+import json
+import logging
+
+LOGGER = logging.getLogger(__name__)
+
+# Redis channel announcing that a user's token for a service changed
+TOKEN_INVALIDATION_CHANNEL = "oauth:token_invalidations"
+
+
+async def publish_token_invalidation(redis_client, user_id: int, service_id: int):
+    """
+    Tell the trigger managers that the stored token of ``user_id`` for
+    ``service_id`` was created, refreshed or removed.
+
+    Failures are only logged: the token caches expire on their own anyway.
+    """
+    message = json.dumps({"user_id": user_id, "service_id": service_id})
+    try:
+        await redis_client.publish(TOKEN_INVALIDATION_CHANNEL, message)
+    except Exception as e:
+        LOGGER.error(
+            f"Failed to publish token invalidation for user {user_id}, "
+            f"service {service_id}: {e}"
+        )
@@ -3,10 +3,8 @@ from typing import Dict, Optional
 from pydantic import BaseModel, Extra, ValidationError
 
 from src.schemas.trigger import TriggerResponse
-from src.service.Action.actions import Action
-from src.service.main import ALL_COMPONENTS
-from src.service.Reaction.reactions import Reaction
-from src.service.Trigger.triggers import Trigger
+from src.service.components import REGISTRY
+from src.service.registry import ComponentKind
 
 
 class AreaBase(BaseModel):
@@ -61,48 +59,26 @@ class AreaResponse(AreaBase):
         base = super().dict(**kwargs)
 
         if "action_id" in base and "action_config" in base:
-            action_class = next(
-                (
-                    component
-                    for component in ALL_COMPONENTS
-                    if issubclass(component, Action)
-                    and component.name == base["action_id"]
-                ),
-                None,
-            )
-            if action_class:
+            action_component = REGISTRY.get(ComponentKind.ACTION, base["action_id"])
+            if action_component:
                 base["action_config"] = self.validate_and_transform_config(
-                    base["action_config"] or {}, action_class.config
+                    base["action_config"] or {}, action_component.config
                 )
 
         if "reaction_id" in base and "reaction_config" in base:
-            reaction_class = next(
-                (
-                    component
-                    for component in ALL_COMPONENTS
-                    if issubclass(component, Reaction)
-                    and component.name == base["reaction_id"]
-                ),
-                None,
+            reaction_component = REGISTRY.get(
+                ComponentKind.REACTION, base["reaction_id"]
             )
-            if reaction_class:
+            if reaction_component:
                 base["reaction_config"] = self.validate_and_transform_config(
-                    base["reaction_config"] or {}, reaction_class.config
+                    base["reaction_config"] or {}, reaction_component.config
                 )
 
         if "trigger_id" in base and "trigger_config" in base:
-            trigger_class = next(
-                (
-                    component
-                    for component in ALL_COMPONENTS
-                    if issubclass(component, Trigger)
-                    and component.name == base["trigger_id"]
-                ),
-                None,
-            )
-            if trigger_class:
+            trigger_component = REGISTRY.get(ComponentKind.TRIGGER, base["trigger_id"])
+            if trigger_component:
                 base["trigger_config"] = self.validate_and_transform_config(
-                    base["trigger_config"] or {}, trigger_class.config
+                    base["trigger_config"] or {}, trigger_component.config
                 )
 
         return base
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from src.service import metrics
+from src.service.Queue.queues import DEFAULT_LANE, PendingTask, TaskData, TaskQueue
+from src.service.Scheduler.limits import WaitStats
+
+LOGGER = logging.getLogger(__name__)
+
+
+class EnqueueBuffer:
+    """
+    Groups the tasks pushed by all trigger runners and hands them to the
+    queue in batches, with a single pipelined round trip per batch.
+
+    A batch is flushed once it holds ``max_batch`` tasks or ``max_delay``
+    seconds after its first task, whichever comes first. ``push`` only
+    returns once its task has been written, so the runner checkpoints its
+    cursor after the event is safely queued: a process stopping mid-flush
+    replays the event instead of losing it.
+    """
+
+    def __init__(
+        self,
+        queue: TaskQueue,
+        max_batch: int = 64,
+        max_delay: float = 0.005,
+        report_interval: float = 60.0,
+    ):
+        """
+        :param queue: Task queue the batches are written to.
+        :param max_batch: Tasks that trigger a flush right away.
+        :param max_delay: Seconds a task may wait for its batch to fill up.
+        :param report_interval: Seconds between two flush summaries.
+        """
+        self.queue = queue
+        self.max_batch = max(max_batch, 1)
+        self.max_delay = max_delay
+        self.report_interval = report_interval
+        self._pending: List[Tuple[PendingTask, asyncio.Future]] = []
+        self._started = asyncio.Event()
+        self._full = asyncio.Event()
+        # Batches, tasks and flush latency since the last report
+        self.batches = 0
+        self.tasks = 0
+        self.largest = 0
+        self.latency = WaitStats()
+        self._reported_at = time.monotonic()
+
+    async def push(
+        self, data: TaskData, tenant: Optional[str] = None, lane: str = DEFAULT_LANE
+    ):
+        """
+        Queue a serialized task with the next batch and wait until the batch
+        is written. Raises the error of a failed flush.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((PendingTask(data, tenant, lane), future))
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        self._started.set()
+        await future
+
+    async def run(self):
+        """
+        Flush the batches until cancelled, then flush what is left.
+        """
+        try:
+            while True:
+                await self._started.wait()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+                await self.flush()
+        finally:
+            while self._pending:
+                await self.flush()
+
+    async def flush(self):
+        """
+        Write the pending tasks, at most ``max_batch`` of them.
+        """
+        batch = self._pending[: self.max_batch]
+        self._pending = self._pending[self.max_batch :]
+        if len(self._pending) < self.max_batch:
+            self._full.clear()
+        if not self._pending:
+            self._started.clear()
+        if not batch:
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.queue.push_many([task for task, _ in batch])
+        except Exception as e:
+            LOGGER.error(f"Failed to enqueue a batch of {len(batch)} tasks: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.latency.record(time.perf_counter() - start)
+        self.batches += 1
+        self.tasks += len(batch)
+        self.largest = max(self.largest, len(batch))
+        metrics.ENQUEUE_BATCH.observe(len(batch))
+        # Runners cancelled meanwhile have their task written all the same
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+        self._report()
+
+    def _report(self):
+        now = time.monotonic()
+        if now - self._reported_at < self.report_interval:
+            return
+        if self.batches:
+            LOGGER.info(
+                f"Enqueued {self.tasks} tasks in {self.batches} batches "
+                f"(average {self.tasks / self.batches:.1f}, max {self.largest}), "
+                f"flushed in {self.latency.average * 1000:.1f}ms on average, "
+                f"{self.latency.max * 1000:.1f}ms at most."
+            )
+        self.batches = self.tasks = self.largest = 0
+        self.latency = WaitStats()
+        self._reported_at = now
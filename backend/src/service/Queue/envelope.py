@@ -0,0 +1,137 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import msgpack
+import zstandard
+
+from src.service.Queue.queues import TaskData
+
+# Envelopes start with their version byte, then a flags byte, then the
+# msgpack body. Tasks enqueued before envelopes are JSON objects, so start
+# with "{" and never collide with a version byte.
+ENVELOPE_VERSION = 1
+FLAG_ZSTD = 0x01
+
+_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+_DECOMPRESSOR = zstandard.ZstdDecompressor()
+
+
+class EnvelopeError(ValueError):
+    """
+    Raised for data that is neither an envelope nor a legacy JSON task.
+    """
+
+
+@dataclass
+class TaskEnvelope:
+    """
+    What travels through the task queue for one event: the event itself,
+    once, and references to the area and the tokens the worker resolves.
+
+    Tasks enqueued in the former JSON format decode to an envelope holding
+    the full task in ``legacy``, nothing left to resolve.
+    """
+
+    trigger: str
+    action: str
+    reaction: str
+    event: Dict[str, Any] = field(default_factory=dict)
+    enqueued_at: Optional[float] = None
+    area_id: Optional[int] = None
+    # ``areas.updated_at`` when the event fired, so that the worker can tell
+    # whether its copy of the area's configuration is current
+    area_revision: Optional[float] = None
+    user_id: Optional[int] = None
+    action_service_id: Optional[int] = None
+    reaction_service_id: Optional[int] = None
+    # Failed deliveries so far (see RetryScheduler)
+    attempts: int = 0
+    # When the trigger's execution returned the event, for the pipeline
+    # latency metrics; added after the other fields so that older envelopes
+    # still decode
+    fired_at: Optional[float] = None
+    legacy: Optional[Dict[str, Any]] = None
+
+
+def encode_task(
+    envelope: TaskEnvelope, compress_threshold: Optional[int] = 4096
+) -> bytes:
+    """
+    Serialize an envelope, compressed with zstd when its body is larger than
+    ``compress_threshold`` bytes (None to never compress). Legacy tasks are
+    written back as JSON.
+    """
+    if envelope.legacy is not None:
+        return json.dumps({**envelope.legacy, "attempts": envelope.attempts}).encode()
+
+    body = msgpack.packb(
+        [
+            envelope.trigger,
+            envelope.action,
+            envelope.reaction,
+            envelope.event,
+            envelope.enqueued_at,
+            envelope.area_id,
+            envelope.area_revision,
+            envelope.user_id,
+            envelope.action_service_id,
+            envelope.reaction_service_id,
+            envelope.attempts,
+            envelope.fired_at,
+        ],
+        use_bin_type=True,
+    )
+    flags = 0
+    if compress_threshold is not None and len(body) > compress_threshold:
+        body = _COMPRESSOR.compress(body)
+        flags |= FLAG_ZSTD
+    return bytes((ENVELOPE_VERSION, flags)) + body
+
+
+def decode_task(data: TaskData) -> TaskEnvelope:
+    """
+    Deserialize an envelope, or wrap a legacy JSON task.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    if data[:1] == b"{":
+        return _from_legacy(data)
+    if len(data) < 2 or data[0] != ENVELOPE_VERSION:
+        raise EnvelopeError(f"Unknown task format (first byte {data[:1]!r}).")
+
+    body = data[2:]
+    try:
+        if data[1] & FLAG_ZSTD:
+            body = _DECOMPRESSOR.decompress(body)
+        fields = msgpack.unpackb(body, raw=False)
+        return TaskEnvelope(*fields)
+    except (TypeError, ValueError, zstandard.ZstdError) as e:
+        raise EnvelopeError(f"Corrupted task envelope: {e}")
+
+
+def _from_legacy(data: bytes) -> TaskEnvelope:
+    try:
+        task = json.loads(data)
+        return TaskEnvelope(
+            trigger=(task.get("trigger") or {}).get("name", ""),
+            action=task["action"]["name"],
+            reaction=task["reaction"]["name"],
+            event=task.get("event_data") or {},
+            enqueued_at=task.get("enqueued_at"),
+            attempts=task.get("attempts", 0),
+            legacy=task,
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise EnvelopeError(f"Invalid JSON task: {e}")
+
+
+def with_attempts(
+    data: TaskData, attempts: int, compress_threshold: Optional[int] = 4096
+) -> bytes:
+    """
+    Re-encode a serialized task with its number of failed deliveries.
+    """
+    envelope = decode_task(data)
+    envelope.attempts = attempts
+    return encode_task(envelope, compress_threshold)
@@ -0,0 +1,49 @@
+import os
+import socket
+
+from src.service.config.runtime import QueueConfig
+from src.service.Queue.fair_queue import FairQueue
+from src.service.Queue.list_queue import ListQueue
+from src.service.Queue.queues import TaskQueue
+from src.service.Queue.retry import DeadLetters
+from src.service.Queue.stream_queue import StreamQueue
+
+
+def make_task_queue(config: QueueConfig, redis_client) -> TaskQueue:
+    """
+    Build the task queue selected by ``QUEUE_BACKEND``.
+    """
+    if config.backend == "stream":
+        return StreamQueue(
+            redis_client,
+            config.name,
+            group=config.group,
+            consumer=config.consumer or f"{socket.gethostname()}-{os.getpid()}",
+            maxlen=config.maxlen,
+            block_timeout=config.block_timeout,
+            claim_idle=config.claim_idle,
+            claim_interval=config.claim_interval,
+        )
+    if config.backend == "fair":
+        return FairQueue(
+            redis_client,
+            config.name,
+            lanes=config.lanes,
+            quantum=config.quantum,
+            block_timeout=config.block_timeout,
+        )
+    return ListQueue(redis_client, config.name, block_timeout=config.block_timeout)
+
+
+def make_dead_letters(
+    config: QueueConfig, queue: TaskQueue, redis_client
+) -> DeadLetters:
+    """
+    Dead letters of ``queue``, replayed onto it.
+    """
+    return DeadLetters(
+        redis_client,
+        queue,
+        maxlen=config.dead_letter_maxlen,
+        compress_threshold=config.compress_threshold,
+    )
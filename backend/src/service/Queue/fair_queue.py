@@ -0,0 +1,216 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from src.service.Queue.queues import (
+    DEFAULT_LANE,
+    PendingTask,
+    QueuedTask,
+    TaskData,
+    TaskQueue,
+    text,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+# Queues are laid out as:
+#   <name>:<lane>:<tenant>   list of the tenant's tasks in the lane
+#   <name>:<lane>:tenants    ring of the tenants having tasks in the lane
+#   <name>:doorbell          one entry per push, for idle workers to block on
+# A tenant is in its lane's ring exactly while its list is not empty; the
+# scripts keep that invariant atomically. They build key names themselves,
+# which a single Redis instance allows but Redis Cluster does not.
+
+PUSH_SCRIPT = """
+if redis.call('LPUSH', KEYS[1], ARGV[2]) == 1 then
+    redis.call('LPUSH', KEYS[2], ARGV[1])
+end
+redis.call('LPUSH', KEYS[3], 1)
+redis.call('LTRIM', KEYS[3], 0, tonumber(ARGV[3]) - 1)
+"""
+
+# ARGV: prefix, count, quantum, then (lane, weight) pairs by priority.
+# Each lane first gets a share of ``count`` proportional to its weight; what
+# a lane leaves unused goes to the next ones, in priority order. Within a
+# lane, tenants are served round-robin, ``quantum`` tasks at a time.
+POP_SCRIPT = """
+local prefix = ARGV[1]
+local count = tonumber(ARGV[2])
+local quantum = tonumber(ARGV[3])
+local lanes, weights, total = {}, {}, 0
+for i = 4, #ARGV, 2 do
+    lanes[#lanes + 1] = ARGV[i]
+    weights[#weights + 1] = tonumber(ARGV[i + 1])
+    total = total + tonumber(ARGV[i + 1])
+end
+
+local result = {}
+local taken = 0
+
+local function drain(lane, budget)
+    local ring = prefix .. ':' .. lane .. ':tenants'
+    local got = 0
+    while got < budget and redis.call('LLEN', ring) > 0 do
+        local tenant = redis.call('RPOPLPUSH', ring, ring)
+        local key = prefix .. ':' .. lane .. ':' .. tenant
+        local want = math.min(quantum, budget - got)
+        for _ = 1, want do
+            local item = redis.call('RPOP', key)
+            if not item then break end
+            result[#result + 1] = lane
+            result[#result + 1] = item
+            got = got + 1
+        end
+        if redis.call('LLEN', key) == 0 then
+            redis.call('LREM', ring, 1, tenant)
+        end
+    end
+    return got
+end
+
+for i, lane in ipairs(lanes) do
+    if taken >= count then break end
+    local share = math.ceil(count * weights[i] / total)
+    taken = taken + drain(lane, math.min(share, count - taken))
+end
+for _, lane in ipairs(lanes) do
+    if taken >= count then break end
+    taken = taken + drain(lane, count - taken)
+end
+
+local empty = true
+for _, lane in ipairs(lanes) do
+    if redis.call('LLEN', prefix .. ':' .. lane .. ':tenants') > 0 then
+        empty = false
+    end
+end
+if empty then
+    redis.call('DEL', prefix .. ':doorbell')
+end
+return result
+"""
+
+# ARGV: prefix, then the lanes. Returns (tenants, depth) per lane.
+STATS_SCRIPT = """
+local result = {}
+for i = 2, #ARGV do
+    local ring = ARGV[1] .. ':' .. ARGV[i] .. ':tenants'
+    local tenants = redis.call('LRANGE', ring, 0, -1)
+    local depth = 0
+    for _, tenant in ipairs(tenants) do
+        depth = depth + redis.call('LLEN', ARGV[1] .. ':' .. ARGV[i] .. ':' .. tenant)
+    end
+    result[#result + 1] = #tenants
+    result[#result + 1] = depth
+end
+return result
+"""
+
+
+class FairQueue(TaskQueue):
+    """
+    Queue split into priority lanes, each holding one Redis list per tenant.
+
+    A batch is shared between the lanes according to their weights, lanes
+    with nothing to do handing their share over to the next ones, and within
+    a lane the tenants are served round-robin, ``quantum`` tasks at a time.
+    A tenant flooding a lane therefore only delays itself, and a lane with a
+    higher weight keeps a bounded latency whatever the backlog of the others.
+
+    Pops are done server side by a Lua script, so workers in several
+    processes share the same rotation. Like ListQueue, a popped task is gone.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        name: str,
+        lanes: Dict[str, int],
+        quantum: int = 4,
+        block_timeout: float = 5.0,
+        doorbell_size: int = 1024,
+    ):
+        """
+        :param redis_client: Async Redis client.
+        :param name: Prefix of the Redis keys of the queue.
+        :param lanes: Lane name -> weight, highest priority first. Tasks
+            pushed to an unknown lane go to the last one.
+        :param quantum: Tasks taken from a tenant before moving to the next.
+        :param block_timeout: Seconds an idle pop waits for a task.
+        :param doorbell_size: Cap of the wake up list idle workers block on.
+        """
+        if not lanes:
+            raise ValueError("FairQueue needs at least one lane.")
+        self.redis_client = redis_client
+        self.name = name
+        self.lanes = {lane: max(weight, 1) for lane, weight in lanes.items()}
+        self.quantum = max(quantum, 1)
+        self.block_timeout = block_timeout
+        self.doorbell_size = max(doorbell_size, 1)
+        self._fallback_lane = list(self.lanes)[-1]
+        self._push = redis_client.register_script(PUSH_SCRIPT)
+        self._pop = redis_client.register_script(POP_SCRIPT)
+        self._stats = redis_client.register_script(STATS_SCRIPT)
+
+    @property
+    def doorbell(self) -> str:
+        return f"{self.name}:doorbell"
+
+    def lane_of(self, lane: Optional[str]) -> str:
+        return lane if lane in self.lanes else self._fallback_lane
+
+    async def push(
+        self, data: TaskData, tenant: Optional[str] = None, lane: str = DEFAULT_LANE
+    ):
+        await self._push(*self._push_args(data, tenant, lane))
+
+    async def push_many(self, tasks: List[PendingTask]):
+        pipe = self.redis_client.pipeline(transaction=False)
+        for task in tasks:
+            await self._push(
+                *self._push_args(task.data, task.tenant, task.lane), client=pipe
+            )
+        await pipe.execute()
+
+    def _push_args(self, data: TaskData, tenant: Optional[str], lane: str):
+        lane = self.lane_of(lane)
+        tenant = str(tenant) if tenant is not None else "_"
+        keys = [
+            f"{self.name}:{lane}:{tenant}",
+            f"{self.name}:{lane}:tenants",
+            self.doorbell,
+        ]
+        return keys, [tenant, data, self.doorbell_size]
+
+    async def pop_batch(self, count: int) -> List[QueuedTask]:
+        tasks = await self._pop_fair(max(count, 1))
+        if tasks:
+            return tasks
+        # Idle: wait for a push to ring the bell, then try again
+        if await self.redis_client.brpop(self.doorbell, timeout=self.block_timeout):
+            return await self._pop_fair(max(count, 1))
+        return []
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Number of tenants with pending tasks and depth of every lane.
+        """
+        args = [self.name, *self.lanes]
+        result = await self._stats(keys=[], args=args)
+        lanes = {
+            lane: {"tenants": int(result[2 * i]), "depth": int(result[2 * i + 1])}
+            for i, lane in enumerate(self.lanes)
+        }
+        return {
+            "depth": sum(lane["depth"] for lane in lanes.values()),
+            "lanes": lanes,
+        }
+
+    async def _pop_fair(self, count: int) -> List[QueuedTask]:
+        args = [self.name, count, self.quantum]
+        for lane, weight in self.lanes.items():
+            args += [lane, weight]
+        result = await self._pop(keys=[], args=args)
+        return [
+            QueuedTask(data, lane=text(lane))
+            for lane, data in zip(result[::2], result[1::2])
+        ]
@@ -0,0 +1,67 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from redis.exceptions import ResponseError
+from src.service.Queue.queues import (
+    DEFAULT_LANE,
+    PendingTask,
+    QueuedTask,
+    TaskData,
+    TaskQueue,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ListQueue(TaskQueue):
+    """
+    Queue on a plain Redis list: LPUSH to enqueue, BLMPOP from the right to
+    dequeue. A popped task is gone, so a worker crashing mid-task loses it.
+    """
+
+    def __init__(self, redis_client, name: str, block_timeout: float = 5.0):
+        """
+        :param redis_client: Async Redis client.
+        :param name: Key of the Redis list.
+        :param block_timeout: Seconds a blocking pop waits for a task.
+        """
+        self.redis_client = redis_client
+        self.name = name
+        self.block_timeout = block_timeout
+        # BLMPOP needs Redis >= 7.0, fall back to BRPOP + RPOP otherwise
+        self._blmpop_supported = True
+
+    async def push(
+        self, data: TaskData, tenant: Optional[str] = None, lane: str = DEFAULT_LANE
+    ):
+        await self.redis_client.lpush(self.name, data)
+
+    async def push_many(self, tasks: List[PendingTask]):
+        if tasks:
+            await self.redis_client.lpush(self.name, *(task.data for task in tasks))
+
+    async def pop_batch(self, count: int) -> List[QueuedTask]:
+        count = max(count, 1)
+        if self._blmpop_supported:
+            try:
+                result = await self.redis_client.blmpop(
+                    self.block_timeout, 1, self.name, direction="RIGHT", count=count
+                )
+                return [QueuedTask(data) for data in (result[1] if result else [])]
+            except ResponseError as e:
+                if "unknown command" not in str(e).lower():
+                    raise
+                LOGGER.warning("BLMPOP is not supported, falling back to BRPOP.")
+                self._blmpop_supported = False
+
+        result = await self.redis_client.brpop(self.name, timeout=self.block_timeout)
+        if not result:
+            return []
+        tasks = [result[1]]
+        if count > 1:
+            more = await self.redis_client.rpop(self.name, count - 1)
+            tasks += more or []
+        return [QueuedTask(data) for data in tasks]
+
+    async def stats(self) -> Dict[str, Any]:
+        return {"depth": await self.redis_client.llen(self.name)}
@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+# Lanes tasks are pushed to; only FairQueue tells them apart
+PRIORITY_LANE = "priority"
+DEFAULT_LANE = "default"
+
+
+# Serialized task, bytes from a binary client (see envelope)
+TaskData = Union[bytes, str]
+
+
+def text(value: Union[bytes, str]) -> str:
+    """
+    Decode a Redis reply, queues being read through a binary client.
+    """
+    return value.decode() if isinstance(value, bytes) else value
+
+
+@dataclass
+class QueuedTask:
+    """
+    A task popped from a queue, with the backend's id to acknowledge it and
+    the lane it came from.
+    """
+
+    data: TaskData
+    id: Optional[str] = None
+    lane: str = DEFAULT_LANE
+
+
+@dataclass
+class PendingTask:
+    """
+    A serialized task waiting to be pushed, with its tenant and lane.
+    """
+
+    data: TaskData
+    tenant: Optional[str] = None
+    lane: str = DEFAULT_LANE
+
+
+class TaskQueue(ABC):
+    """
+    Abstract queue of serialized tasks shared by the trigger manager, which
+    pushes them, and the workers, which pop and acknowledge them.
+    """
+
+    name: str
+
+    @abstractmethod
+    async def push(
+        self, data: TaskData, tenant: Optional[str] = None, lane: str = DEFAULT_LANE
+    ):
+        """
+        Append a serialized task to the queue.
+
+        :param tenant: Owner of the task, for backends sharing the queue
+            fairly between tenants.
+        :param lane: Priority lane of the task (see FairQueue).
+        """
+        pass
+
+    async def push_many(self, tasks: List[PendingTask]):
+        """
+        Append several tasks, in order. Backends override it to do so in a
+        single round trip.
+        """
+        for task in tasks:
+            await self.push(task.data, tenant=task.tenant, lane=task.lane)
+
+    @abstractmethod
+    async def pop_batch(self, count: int) -> List[QueuedTask]:
+        """
+        Wait for tasks and return up to ``count`` of them, or an empty list
+        once the backend's blocking timeout expires.
+        """
+        pass
+
+    async def ack(self, task: QueuedTask):
+        """
+        Mark a popped task as processed. No-op for backends without delivery
+        tracking.
+        """
+        pass
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Backend specific figures (depth, lag...) for monitoring.
+        """
+        return {}
@@ -0,0 +1,282 @@
+import asyncio
+import logging
+import random
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import msgpack
+
+from src.service.Queue.envelope import EnvelopeError, with_attempts
+from src.service.Queue.queues import (
+    DEFAULT_LANE,
+    PendingTask,
+    TaskData,
+    TaskQueue,
+    text,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+# Remove and return up to ARGV[2] members of the sorted set due by ARGV[1],
+# so that a retry is promoted by a single process
+CLAIM_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+end
+return due
+"""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retries of a failed task, declared as ``Reaction.retry_policy``.
+
+    The n-th retry waits ``base_delay * factor ** (n - 1)`` seconds, capped
+    at ``max_delay``, jittered down by up to half so that tasks failing
+    together (e.g. a provider outage) do not come back in lockstep.
+    """
+
+    max_attempts: int = 5  # Deliveries in total, the first one included
+    base_delay: float = 10.0
+    max_delay: float = 3600.0
+    factor: float = 2.0
+
+    def delay(self, attempts: int) -> float:
+        """
+        Seconds before the next delivery of a task that failed ``attempts``
+        times.
+        """
+        backoff = min(
+            self.base_delay * self.factor ** max(attempts - 1, 0), self.max_delay
+        )
+        return random.uniform(backoff / 2, backoff)
+
+
+class RetryScheduler:
+    """
+    Failed tasks waiting for their next delivery, in a Redis sorted set
+    scored by due time. ``run`` promotes the due ones back onto the task
+    queue in batches, so workers never wait on a retry.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        queue: TaskQueue,
+        poll_interval: float = 1.0,
+        batch_size: int = 100,
+        compress_threshold: Optional[int] = 4096,
+    ):
+        """
+        :param redis_client: Async Redis client, binary replies.
+        :param queue: Task queue retries are promoted to.
+        :param poll_interval: Seconds between two promotion passes.
+        :param batch_size: Retries promoted per round trip.
+        :param compress_threshold: See ``encode_task``.
+        """
+        self.redis_client = redis_client
+        self.queue = queue
+        self.key = f"{queue.name}:retry"
+        self.poll_interval = poll_interval
+        self.batch_size = max(batch_size, 1)
+        self.compress_threshold = compress_threshold
+        self._claim_due = redis_client.register_script(CLAIM_DUE_SCRIPT)
+        self.promoted = 0
+
+    async def schedule(
+        self,
+        data: TaskData,
+        attempts: int,
+        delay: float,
+        tenant: Optional[str] = None,
+        lane: str = DEFAULT_LANE,
+    ):
+        """
+        Deliver a task again in ``delay`` seconds, recording that it failed
+        ``attempts`` times.
+        """
+        member = msgpack.packb(
+            [
+                # Identical payloads must not collapse into one member
+                secrets.token_hex(8),
+                tenant,
+                lane,
+                with_attempts(data, attempts, self.compress_threshold),
+            ],
+            use_bin_type=True,
+        )
+        await self.redis_client.zadd(self.key, {member: time.time() + delay})
+
+    async def run(self):
+        """
+        Promote the due retries until cancelled.
+        """
+        LOGGER.info(f"Promoting due retries from {self.key}.")
+        while True:
+            try:
+                promoted = await self.promote()
+            except Exception as e:
+                LOGGER.error(f"Failed to promote retries: {e}", exc_info=True)
+                promoted = 0
+            if promoted < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def promote(self) -> int:
+        """
+        Move one batch of due retries to the task queue.
+        """
+        members = await self._claim_due(
+            keys=[self.key], args=[time.time(), self.batch_size]
+        )
+        if not members:
+            return 0
+
+        tasks = []
+        for member in members:
+            _, tenant, lane, data = msgpack.unpackb(member, raw=False)
+            tasks.append(PendingTask(data, tenant, lane))
+        try:
+            await self.queue.push_many(tasks)
+        except Exception:
+            # Put them back, due right away
+            await self.redis_client.zadd(
+                self.key, {member: time.time() for member in members}
+            )
+            raise
+
+        self.promoted += len(tasks)
+        LOGGER.debug(f"Promoted {len(tasks)} retries.")
+        return len(tasks)
+
+    async def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "scheduled": await self.redis_client.zcard(self.key),
+            "due": await self.redis_client.zcount(self.key, "-inf", now),
+        }
+
+
+class DeadLetters:
+    """
+    Tasks that failed for good, in a Redis Stream capped to about ``maxlen``
+    entries, with the error of their last delivery. Entries can be listed,
+    replayed onto the task queue with a fresh retry budget, or dropped.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        queue: TaskQueue,
+        maxlen: Optional[int] = 10_000,
+        compress_threshold: Optional[int] = 4096,
+    ):
+        """
+        :param redis_client: Async Redis client, binary replies.
+        :param queue: Task queue replayed tasks are pushed to.
+        :param maxlen: Approximate maximum length of the stream.
+        :param compress_threshold: See ``encode_task``.
+        """
+        self.redis_client = redis_client
+        self.queue = queue
+        self.key = f"{queue.name}:dead"
+        self.maxlen = maxlen
+        self.compress_threshold = compress_threshold
+
+    async def add(
+        self,
+        data: TaskData,
+        error: str,
+        reaction: str = "",
+        attempts: int = 0,
+        tenant: Optional[str] = None,
+        lane: str = DEFAULT_LANE,
+    ):
+        fields = {
+            "task": data,
+            "error": error[:2000],
+            "reaction": reaction,
+            "attempts": attempts,
+            "tenant": "" if tenant is None else str(tenant),
+            "lane": lane,
+            "failed_at": time.time(),
+        }
+        await self.redis_client.xadd(
+            self.key, fields, maxlen=self.maxlen, approximate=True
+        )
+
+    async def list(self, count: int = 50) -> List[Dict[str, Any]]:
+        """
+        The latest dead letters, newest first, without their payload.
+        """
+        entries = await self.redis_client.xrevrange(self.key, count=count)
+        return [self._describe(entry_id, fields) for entry_id, fields in entries]
+
+    async def count(self) -> int:
+        return await self.redis_client.xlen(self.key)
+
+    async def replay(self, entry_id: str) -> bool:
+        """
+        Push a dead letter back onto the task queue and remove it. Returns
+        False if there is no such entry.
+        """
+        entries = await self.redis_client.xrange(self.key, entry_id, entry_id)
+        if not entries:
+            return False
+        return await self._replay(entries) > 0
+
+    async def replay_all(self, batch_size: int = 100) -> int:
+        """
+        Replay every dead letter, oldest first. Returns how many were.
+        """
+        replayed = 0
+        start = "-"
+        while True:
+            entries = await self.redis_client.xrange(
+                self.key, min=start, count=batch_size
+            )
+            if not entries:
+                return replayed
+            replayed += await self._replay(entries)
+            # Exclusive range, entries that could not be replayed stay behind
+            start = f"({text(entries[-1][0])}"
+
+    async def delete(self, entry_id: str) -> bool:
+        return bool(await self.redis_client.xdel(self.key, entry_id))
+
+    async def _replay(self, entries) -> int:
+        tasks, replayed = [], []
+        for entry_id, fields in entries:
+            fields = {text(key): value for key, value in fields.items()}
+            try:
+                data = with_attempts(fields["task"], 0, self.compress_threshold)
+            except (KeyError, EnvelopeError) as e:
+                LOGGER.error(f"Cannot replay dead letter {text(entry_id)}: {e}")
+                continue
+            tenant = text(fields.get("tenant", b"")) or None
+            lane = text(fields.get("lane", DEFAULT_LANE))
+            tasks.append(PendingTask(data, tenant, lane))
+            replayed.append(entry_id)
+        if not tasks:
+            return 0
+
+        await self.queue.push_many(tasks)
+        await self.redis_client.xdel(self.key, *replayed)
+        LOGGER.info(f"Replayed {len(tasks)} dead letters.")
+        return len(tasks)
+
+    @staticmethod
+    def _describe(entry_id, fields) -> Dict[str, Any]:
+        fields = {text(key): value for key, value in fields.items()}
+        return {
+            "id": text(entry_id),
+            "reaction": text(fields.get("reaction", b"")),
+            "error": text(fields.get("error", b"")),
+            "attempts": int(fields.get("attempts", 0)),
+            "tenant": text(fields.get("tenant", b"")) or None,
+            "lane": text(fields.get("lane", DEFAULT_LANE)),
+            "failed_at": float(fields.get("failed_at", 0)),
+        }
@@ -0,0 +1,198 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from redis.exceptions import ResponseError
+from src.service.Queue.queues import (
+    DEFAULT_LANE,
+    PendingTask,
+    QueuedTask,
+    TaskData,
+    TaskQueue,
+    text,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+# Field of the stream entries holding the serialized task
+TASK_FIELD = "task"
+
+
+class StreamQueue(TaskQueue):
+    """
+    Queue on a Redis Stream read through a consumer group.
+
+    Every worker process is a consumer of the group: XREADGROUP hands each
+    entry to one of them, and the entry stays pending until it is XACKed
+    after processing. Entries left pending by a dead consumer for more than
+    ``claim_idle`` seconds are reclaimed with XAUTOCLAIM by the live ones.
+    The stream is capped to about ``maxlen`` entries on every XADD.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        name: str,
+        group: str = "workers",
+        consumer: str = "worker",
+        maxlen: Optional[int] = 100_000,
+        block_timeout: float = 5.0,
+        claim_idle: float = 60.0,
+        claim_interval: float = 30.0,
+    ):
+        """
+        :param redis_client: Async Redis client.
+        :param name: Key of the Redis Stream.
+        :param group: Consumer group shared by the workers.
+        :param consumer: Unique name of this consumer within the group.
+        :param maxlen: Approximate maximum length of the stream, None to
+            disable trimming.
+        :param block_timeout: Seconds a blocking read waits for a task.
+        :param claim_idle: Seconds after which a pending entry is considered
+            abandoned and may be reclaimed.
+        :param claim_interval: Seconds between two reclaim passes.
+        """
+        self.redis_client = redis_client
+        self.name = name
+        self.group = group
+        self.consumer = consumer
+        self.maxlen = maxlen
+        self.block_timeout = block_timeout
+        self.claim_idle = claim_idle
+        self.claim_interval = claim_interval
+        self._group_ready = False
+        self._claimed_at = 0.0
+        # XAUTOCLAIM cursor, so that successive passes walk the whole PEL
+        self._claim_cursor = "0-0"
+
+    async def push(
+        self, data: TaskData, tenant: Optional[str] = None, lane: str = DEFAULT_LANE
+    ):
+        await self.redis_client.xadd(
+            self.name, {TASK_FIELD: data}, maxlen=self.maxlen, approximate=True
+        )
+
+    async def push_many(self, tasks: List[PendingTask]):
+        pipe = self.redis_client.pipeline(transaction=False)
+        for task in tasks:
+            pipe.xadd(
+                self.name, {TASK_FIELD: task.data}, maxlen=self.maxlen, approximate=True
+            )
+        await pipe.execute()
+
+    async def pop_batch(self, count: int) -> List[QueuedTask]:
+        count = max(count, 1)
+        await self._ensure_group()
+
+        if time.monotonic() - self._claimed_at >= self.claim_interval:
+            self._claimed_at = time.monotonic()
+            claimed = await self._reclaim(count)
+            if claimed:
+                return claimed
+
+        try:
+            result = await self.redis_client.xreadgroup(
+                self.group,
+                self.consumer,
+                {self.name: ">"},
+                count=count,
+                block=int(self.block_timeout * 1000),
+            )
+        except ResponseError as e:
+            # The stream or the group was deleted behind our back
+            if "NOGROUP" not in str(e):
+                raise
+            self._group_ready = False
+            return []
+
+        tasks = []
+        for _, entries in result or []:
+            tasks += self._to_tasks(entries)
+        return tasks
+
+    async def ack(self, task: QueuedTask):
+        await self.redis_client.xack(self.name, self.group, task.id)
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Stream length, and the group's lag (entries not delivered yet) and
+        pending count (delivered, not acknowledged), per consumer too.
+        """
+        await self._ensure_group()
+        stats: Dict[str, Any] = {"depth": await self.redis_client.xlen(self.name)}
+        for group in await self.redis_client.xinfo_groups(self.name):
+            if text(group["name"]) == self.group:
+                stats["lag"] = group.get("lag")
+                stats["pending"] = group["pending"]
+        consumers = await self.redis_client.xinfo_consumers(self.name, self.group)
+        stats["consumers"] = {
+            text(consumer["name"]): {
+                "pending": consumer["pending"],
+                "idle": consumer["idle"] / 1000,
+            }
+            for consumer in consumers
+        }
+        return stats
+
+    async def _ensure_group(self):
+        if self._group_ready:
+            return
+        try:
+            await self.redis_client.xgroup_create(
+                self.name, self.group, id="0", mkstream=True
+            )
+            LOGGER.info(f"Created consumer group {self.group} on {self.name}.")
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def _reclaim(self, count: int) -> List[QueuedTask]:
+        """
+        Take over the entries abandoned by dead consumers, and forget the
+        consumers that have nothing pending and have been idle for long.
+        """
+        result = await self.redis_client.xautoclaim(
+            self.name,
+            self.group,
+            self.consumer,
+            min_idle_time=int(self.claim_idle * 1000),
+            start_id=self._claim_cursor,
+            count=count,
+        )
+        self._claim_cursor, entries = result[0], result[1]
+        # Redis >= 7 also reports pending entries trimmed from the stream
+        deleted = result[2] if len(result) > 2 else []
+        if deleted:
+            await self.redis_client.xack(self.name, self.group, *deleted)
+
+        consumers = await self.redis_client.xinfo_consumers(self.name, self.group)
+        for consumer in consumers:
+            name = text(consumer["name"])
+            if (
+                name != self.consumer
+                and consumer["pending"] == 0
+                and consumer["idle"] > self.claim_idle * 10 * 1000
+            ):
+                await self.redis_client.xgroup_delconsumer(self.name, self.group, name)
+                LOGGER.info(f"Removed idle consumer {name}.")
+
+        tasks = self._to_tasks(entries)
+        if tasks or deleted:
+            LOGGER.warning(
+                f"Reclaimed {len(tasks)} abandoned tasks from {self.name} "
+                f"({len(deleted)} already trimmed)."
+            )
+        return tasks
+
+    @staticmethod
+    def _to_tasks(entries) -> List[QueuedTask]:
+        # Malformed entries are handed out too, so that they get acknowledged
+        return [
+            QueuedTask(
+                fields.get(TASK_FIELD) or fields.get(TASK_FIELD.encode(), b""),
+                text(entry_id),
+            )
+            for entry_id, fields in entries
+            if fields is not None
+        ]
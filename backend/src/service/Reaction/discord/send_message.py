@@ -4,6 +4,7 @@ from typing import Dict
 from pydantic import Extra, Field
 
 from src.config import settings  # Assuming settings provide access to the Discord token
+from src.service.Queue.retry import RetryPolicy
 from src.service.Reaction.reactions import Reaction, ReactionConfig, ReactionResponse
 from src.service.services.discord.dicord import DiscordAPI
 
@@ -39,6 +40,8 @@ class SendMessage(Reaction):
 
     name: str = "send_message"
     config = SendMessageReactionConfig
+    # Discord rate limits reset within seconds
+    retry_policy = RetryPolicy(max_attempts=5, base_delay=2.0, max_delay=60.0)
 
     def __init__(self, config: SendMessageReactionConfig):
         """
@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import Field
 
+from src.service.Queue.retry import RetryPolicy
 from src.service.Reaction.reactions import Reaction, ReactionConfig, ReactionResponse
 
 from ...services.github.github import GitHubAPI
@@ -23,6 +24,8 @@ class CreateIssueReaction(Reaction):
 
     name = "create_issue"
     config = GitHubReactionConfig
+    # Creating an issue is not idempotent, and secondary rate limits are long
+    retry_policy = RetryPolicy(max_attempts=3, base_delay=60.0)
 
     def __init__(self, config: GitHubReactionConfig):
         super().__init__(config)
@@ -3,6 +3,7 @@ from typing import List, Optional
 
 from pydantic import Field
 
+from src.service.Queue.retry import RetryPolicy
 from src.service.Reaction.reactions import Reaction, ReactionConfig, ReactionResponse
 from src.service.services.google.google import GoogleAPI
 
@@ -29,6 +30,8 @@ class GmailSendReaction(Reaction):
 
     name = "send_email"
     config = GmailSendReactionConfig
+    # A retry may send the mail twice, keep them few
+    retry_policy = RetryPolicy(max_attempts=3, base_delay=30.0)
 
     def __init__(self, config: GmailSendReactionConfig):
         super().__init__(config)
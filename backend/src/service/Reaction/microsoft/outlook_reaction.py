@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import Field
 
+from src.service.Queue.retry import RetryPolicy
 from src.service.Reaction.reactions import Reaction, ReactionConfig, ReactionResponse
 from src.service.services.microsoft.outlook_api import OutlookAPI
 
@@ -28,6 +29,8 @@ class OutlookSendReaction(Reaction):
 
     name = "send_mail"
     config = OutlookSendReactionConfig
+    # A retry may send the mail twice, keep them few
+    retry_policy = RetryPolicy(max_attempts=3, base_delay=30.0)
 
     def __init__(self, config: OutlookSendReactionConfig):
         super().__init__(config)
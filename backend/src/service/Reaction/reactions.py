@@ -4,6 +4,8 @@ from typing import Any, Dict
 from pydantic import BaseModel
 from typing_extensions import Optional
 
+from src.service.Queue.retry import RetryPolicy
+
 
 class ReactionConfig(BaseModel):
     """
@@ -23,6 +25,12 @@ class ReactionResponse(BaseModel):
     details: Dict[str, Any]  # Additional details specific to the reaction
 
 
+class ReactionFailed(Exception):
+    """
+    Raised by the worker when a reaction reports that it did not succeed.
+    """
+
+
 class Reaction(ABC):
     """
     Abstract base class for all reactions, using ReactionConfig for configuration
@@ -31,6 +39,8 @@ class Reaction(ABC):
 
     name: str = "generic_reaction"
     config = ReactionConfig
+    # Retries of the failed tasks, None for the worker's default policy
+    retry_policy: Optional[RetryPolicy] = None
 
     def __init__(self, config: ReactionConfig):
         """
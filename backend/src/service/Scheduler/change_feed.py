@@ -0,0 +1,168 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import or_
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from src.db.models import Area as db_area
+from src.db.models import Trigger as db_trigger
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class AreaChanges:
+    """
+    Result of one change feed poll.
+    """
+
+    upserted: List[db_area] = field(default_factory=list)
+    deleted: Set[int] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.upserted or self.deleted)
+
+
+def area_signature(area: db_area) -> str:
+    """
+    Fingerprint of everything a running trigger depends on.
+
+    Two polls returning the same signature for an area mean its running task
+    can be left untouched.
+    """
+    trigger = area.trigger
+    payload = {
+        "user_id": area.user_id,
+        "action_id": area.action_id,
+        "reaction_id": area.reaction_id,
+        "action_config": area.action_config,
+        "reaction_config": area.reaction_config,
+        "trigger": (
+            {"id": trigger.id, "name": trigger.name, "config": trigger.config}
+            if trigger
+            else None
+        ),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class AreaChangeFeed:
+    """
+    Incremental view over the ``areas`` and ``triggers`` tables.
+
+    Created and updated areas are found through an ``updated_at`` watermark,
+    deleted areas (and areas whose trigger row was swapped) through a cheap
+    ``(area.id, trigger.id)`` index scan. Only the areas that actually changed
+    are loaded with their relationships.
+    """
+
+    def __init__(self, session_factory, overlap: float = 30.0):
+        """
+        :param session_factory: Async SQLAlchemy session factory.
+        :param overlap: Seconds re-read behind the watermark, to catch rows
+            committed by transactions that started before the last poll.
+        """
+        self.session_factory = session_factory
+        self.overlap = timedelta(seconds=overlap)
+        self.watermark: Optional[datetime] = None
+
+        # area_id -> trigger_id as seen on the last poll
+        self.known: Dict[int, Optional[int]] = {}
+        # area_id -> signature of the last version handed out
+        self.signatures: Dict[int, str] = {}
+
+    async def poll(self) -> AreaChanges:
+        """
+        Fetch the areas created, updated or deleted since the previous poll.
+        """
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(db_area.id, db_trigger.id).outerjoin(db_area.trigger)
+            )
+            current = {area_id: trigger_id for area_id, trigger_id in result.all()}
+
+            reshaped = {
+                area_id
+                for area_id, trigger_id in current.items()
+                if area_id in self.known and self.known[area_id] != trigger_id
+            }
+
+            stmt = select(db_area).options(
+                selectinload(db_area.trigger),
+                selectinload(db_area.action),
+                selectinload(db_area.reaction),
+            )
+            if self.watermark is not None:
+                since = self.watermark - self.overlap
+                conditions = [
+                    db_area.updated_at > since,
+                    db_trigger.updated_at > since,
+                ]
+                if reshaped:
+                    conditions.append(db_area.id.in_(reshaped))
+                stmt = stmt.outerjoin(db_area.trigger).where(or_(*conditions))
+
+            result = await session.execute(stmt)
+            candidates = result.scalars().unique().all()
+
+        changes = AreaChanges()
+        changes.deleted = set(self.known) - set(current)
+        for area_id in changes.deleted:
+            self.signatures.pop(area_id, None)
+
+        for area in candidates:
+            self._advance_watermark(area)
+            signature = area_signature(area)
+            if self.signatures.get(area.id) == signature:
+                continue
+            self.signatures[area.id] = signature
+            changes.upserted.append(area)
+
+        self.known = current
+        if changes:
+            LOGGER.info(
+                f"Change feed: {len(changes.upserted)} upserted, "
+                f"{len(changes.deleted)} deleted (watermark {self.watermark})."
+            )
+        return changes
+
+    async def load(self, area_ids: Iterable[int]) -> List[db_area]:
+        """
+        Load the given areas with their relationships, regardless of the
+        watermark. Used when areas are handed over from another process.
+        """
+        area_ids = list(area_ids)
+        if not area_ids:
+            return []
+
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(db_area)
+                .where(db_area.id.in_(area_ids))
+                .options(
+                    selectinload(db_area.trigger),
+                    selectinload(db_area.action),
+                    selectinload(db_area.reaction),
+                )
+            )
+            areas = result.scalars().all()
+
+        for area in areas:
+            self.signatures[area.id] = area_signature(area)
+        return areas
+
+    def _advance_watermark(self, area: db_area):
+        stamps = [area.updated_at]
+        if area.trigger is not None:
+            stamps.append(area.trigger.updated_at)
+        for stamp in stamps:
+            if stamp is None:
+                continue
+            if self.watermark is None or stamp > self.watermark:
+                self.watermark = stamp
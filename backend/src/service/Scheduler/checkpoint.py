@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import bindparam, update
+
+from src.db.models import Trigger as db_trigger
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TriggerCheckpointer:
+    """
+    Batched, debounced persistence of the trigger cursors (``triggers.state``)
+    and of ``triggers.last_run``.
+
+    The runner marks a trigger after each evaluation; only the latest state of
+    each trigger is kept and all pending ones are written together every
+    ``flush_interval`` seconds, in a single UPDATE executed for the batch.
+    ``updated_at`` is left untouched so checkpoints do not show up in the area
+    change feed.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        flush_interval: float = 10.0,
+        last_run_interval: float = 60.0,
+    ):
+        """
+        :param session_factory: Async SQLAlchemy session factory.
+        :param flush_interval: Seconds between two batched writes.
+        :param last_run_interval: Minimum seconds between two writes of an
+            unchanged trigger, only to refresh its ``last_run``.
+        """
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.last_run_interval = last_run_interval
+        # trigger id -> (state, last run) waiting to be written
+        self._pending: Dict[int, Tuple[Dict[str, Any], datetime]] = {}
+        # trigger id -> (state, monotonic time) last handed to the database
+        self._saved: Dict[int, Tuple[Dict[str, Any], float]] = {}
+
+    def restore(self, trigger_id: int, state: Optional[Dict[str, Any]]):
+        """
+        Remember the state a trigger was rehydrated from, so that an unchanged
+        cursor is not written back right away.
+        """
+        self._saved[trigger_id] = (state or {}, time.monotonic())
+
+    def mark(self, trigger_id: int, trigger, fired: bool = False):
+        """
+        Record the state of ``trigger`` after an evaluation.
+        """
+        state = trigger.get_state()
+        saved = self._saved.get(trigger_id)
+        if (
+            not fired
+            and saved is not None
+            and saved[0] == state
+            and time.monotonic() - saved[1] < self.last_run_interval
+        ):
+            return
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        self._pending[trigger_id] = (state, now)
+
+    async def run(self):
+        """
+        Flush the pending checkpoints periodically until cancelled.
+        """
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+        finally:
+            await self.flush()
+
+    async def flush(self):
+        """
+        Write every pending checkpoint in one batch.
+        """
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        table = db_trigger.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("trigger_id"))
+            .values(
+                state=bindparam("trigger_state"),
+                last_run=bindparam("trigger_last_run"),
+                # Keep the change feed watermark out of it
+                updated_at=table.c.updated_at,
+            )
+        )
+        rows = [
+            {"trigger_id": trigger_id, "trigger_state": state, "trigger_last_run": at}
+            for trigger_id, (state, at) in pending.items()
+        ]
+
+        try:
+            async with self.session_factory() as session:
+                await session.execute(stmt, rows)
+                await session.commit()
+        except Exception as e:
+            LOGGER.error(f"Failed to checkpoint {len(rows)} triggers: {e}")
+            # Keep them for the next flush, unless a newer state was marked
+            for trigger_id, entry in pending.items():
+                self._pending.setdefault(trigger_id, entry)
+            return
+
+        now = time.monotonic()
+        for trigger_id, (state, _) in pending.items():
+            self._saved[trigger_id] = (state, now)
+        LOGGER.debug(f"Checkpointed {len(rows)} triggers.")
@@ -0,0 +1,91 @@
+import hashlib
+import logging
+import time
+from typing import Dict
+
+from src.service import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+KEY_PREFIX = "dedup"
+
+
+class EventDeduplicator:
+    """
+    Drops events a trigger emits again, e.g. after a restart or a reconnect.
+
+    Each event is identified by its area and its fingerprint (see
+    ``Trigger.fingerprint``), remembered in Redis with ``SET NX EX``: the
+    first claim of a fingerprint wins, the following ones are duplicates.
+    A claim only holds for ``pending_ttl`` seconds until ``confirm`` keeps it
+    for ``ttl`` seconds once the task is enqueued, so that an event whose
+    runner died in between goes through when emitted again.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        ttl: int = 86400,
+        pending_ttl: int = 300,
+        report_interval: float = 60.0,
+    ):
+        """
+        :param redis_client: Async Redis client.
+        :param ttl: Seconds a fingerprint is remembered, 0 to disable.
+        :param pending_ttl: Seconds a claim holds until it is confirmed.
+        :param report_interval: Seconds between two drop summaries.
+        """
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.pending_ttl = min(pending_ttl, ttl) if ttl > 0 else pending_ttl
+        self.report_interval = report_interval
+        # Trigger name -> duplicates dropped since the last report
+        self.dropped: Dict[str, int] = {}
+        self.total_dropped = 0
+        self._reported_at = time.monotonic()
+
+    async def claim(self, area_id: int, trigger_name: str, fingerprint: str) -> bool:
+        """
+        Record an event until confirmed; returns False if it was already
+        recorded.
+        """
+        if self.ttl <= 0:
+            return True
+        first = await self.redis_client.set(
+            self._key(area_id, fingerprint), 1, nx=True, ex=self.pending_ttl
+        )
+        if not first:
+            self.dropped[trigger_name] = self.dropped.get(trigger_name, 0) + 1
+            self.total_dropped += 1
+            metrics.DUPLICATES_DROPPED.labels(trigger_name).inc()
+            self._report()
+        return bool(first)
+
+    async def confirm(self, area_id: int, fingerprint: str):
+        """
+        Remember an event for ``ttl`` seconds once its task is enqueued.
+        """
+        if self.ttl > 0:
+            await self.redis_client.expire(self._key(area_id, fingerprint), self.ttl)
+
+    async def release(self, area_id: int, fingerprint: str):
+        """
+        Forget an event whose task could not be enqueued, so that it goes
+        through when emitted again.
+        """
+        if self.ttl > 0:
+            await self.redis_client.delete(self._key(area_id, fingerprint))
+
+    @staticmethod
+    def _key(area_id: int, fingerprint: str) -> str:
+        digest = hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+        return f"{KEY_PREFIX}:{area_id}:{digest}"
+
+    def _report(self):
+        now = time.monotonic()
+        if now - self._reported_at < self.report_interval:
+            return
+        for name, count in self.dropped.items():
+            LOGGER.info(f"Dropped {count} duplicate {name} events.")
+        self.dropped = {}
+        self._reported_at = now
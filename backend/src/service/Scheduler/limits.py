@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from src.service import metrics
+from src.service.Scheduler.poller import credential_key
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Execution budget of a trigger class, declared as ``Trigger.rate_limit``.
+
+    Concurrency is bounded per provider and per token, and each token spends
+    from a token bucket refilled at ``rate`` calls per second. With
+    ``per_poll`` the bucket is spent by the upstream calls made through
+    ``Trigger.poll_shared`` rather than by each execution, so that triggers
+    reading a coalesced result do not spend it again.
+    """
+
+    provider: str
+    concurrency: Optional[int] = None  # Concurrent executions per provider
+    token_concurrency: Optional[int] = None  # Concurrent executions per token
+    rate: Optional[float] = None  # Executions (or polls) per second per token
+    burst: int = 1  # Bucket capacity, i.e. executions allowed back to back
+    per_poll: bool = False  # Spend per shared upstream poll, not per execution
+
+
+class TokenBucket:
+    """
+    Classic token bucket; ``acquire`` waits until a token is available.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # The lock keeps waiters in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+@dataclass
+class WaitStats:
+    """
+    Time trigger executions spent queued behind a provider's limits.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def record(self, wait: float):
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class ExecutionLimiter:
+    """
+    Enforces the ``rate_limit`` declared on trigger classes before their
+    ``execute()`` runs, and measures how long executions were held back.
+    """
+
+    def __init__(self, report_interval: float = 60.0):
+        """
+        :param report_interval: Seconds between two queued wait summaries.
+        """
+        self.report_interval = report_interval
+        self._provider_slots: Dict[str, asyncio.Semaphore] = {}
+        self._token_slots: Dict[Tuple[str, str], asyncio.Semaphore] = {}
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self.waits: Dict[str, WaitStats] = {}
+        self._reported_at = time.monotonic()
+
+    @asynccontextmanager
+    async def limit(self, trigger):
+        """
+        Hold the provider and token slots of ``trigger`` for the duration of
+        the block, after spending one token of its budget unless it is spent
+        per upstream poll (see RateLimit.per_poll).
+        """
+        limit: Optional[RateLimit] = getattr(trigger, "rate_limit", None)
+        if limit is None:
+            yield
+            return
+
+        token = (limit.provider, credential_key(trigger.config.token))
+        provider_slot = self._semaphore(
+            self._provider_slots, limit.provider, limit.concurrency
+        )
+        token_slot = self._semaphore(self._token_slots, token, limit.token_concurrency)
+
+        queued_at = time.monotonic()
+        if not limit.per_poll:
+            await self._spend(limit, token)
+
+        async with _optional(token_slot), _optional(provider_slot):
+            self._record_wait(limit.provider, time.monotonic() - queued_at)
+            yield
+
+    async def charge(self, trigger):
+        """
+        Spend one token of the budget of ``trigger`` for an upstream poll,
+        when it is spent per poll (see Trigger.poll_shared).
+        """
+        limit: Optional[RateLimit] = getattr(trigger, "rate_limit", None)
+        if limit is None or not limit.per_poll:
+            return
+        await self._spend(limit, (limit.provider, credential_key(trigger.config.token)))
+
+    async def _spend(self, limit: RateLimit, token: Tuple[str, str]):
+        if not limit.rate:
+            return
+        bucket = self._buckets.get(token)
+        if bucket is None:
+            bucket = self._buckets[token] = TokenBucket(limit.rate, limit.burst)
+        await bucket.acquire()
+
+    @staticmethod
+    def _semaphore(slots: Dict, key, size: Optional[int]):
+        if not size:
+            return None
+        semaphore = slots.get(key)
+        if semaphore is None:
+            semaphore = slots[key] = asyncio.Semaphore(size)
+        return semaphore
+
+    def _record_wait(self, provider: str, wait: float):
+        stats = self.waits.get(provider)
+        if stats is None:
+            stats = self.waits[provider] = WaitStats()
+        stats.record(wait)
+        metrics.LIMITER_WAIT.labels(provider).observe(wait)
+
+        now = time.monotonic()
+        if now - self._reported_at < self.report_interval:
+            return
+        for name, stats in self.waits.items():
+            LOGGER.info(
+                f"Limiter: {name} {stats.count} executions, queued wait "
+                f"avg {stats.average * 1000:.1f}ms max {stats.max * 1000:.1f}ms."
+            )
+        self.waits = {}
+        self._reported_at = now
+
+
+@asynccontextmanager
+async def _optional(semaphore: Optional[asyncio.Semaphore]):
+    if semaphore is None:
+        yield
+        return
+    async with semaphore:
+        yield
+
+
+# Process wide instance shared by the runner and the shared polls
+execution_limiter = ExecutionLimiter()
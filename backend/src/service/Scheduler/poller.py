@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import logging
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# (provider, resource, credential fingerprint)
+PollKey = Tuple[str, str, str]
+
+
+def credential_key(token: Optional[str]) -> str:
+    """
+    Fingerprint of a credential, so raw tokens never end up in keys or logs.
+    """
+    if not token:
+        return "anonymous"
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+@dataclass(eq=False)
+class PollEntry:
+    """
+    Last upstream result for one key and the triggers reading it.
+    """
+
+    value: Any = None
+    fetched_at: float = 0.0
+    used_at: float = 0.0
+    inflight: Optional[asyncio.Future] = None
+    subscribers: weakref.WeakSet = field(default_factory=weakref.WeakSet)
+
+
+class SharedPoller:
+    """
+    Coalesces identical upstream polls made by different triggers.
+
+    Triggers watching the same resource with the same credential read a single
+    upstream result: a call made while a fetch is in flight waits for it, and a
+    call made while the last result is younger than ``max_age`` reuses it. Each
+    trigger keeps its own state (last seen commit, message...) on top of it.
+    """
+
+    def __init__(self, idle_ttl: float = 600.0, report_interval: float = 60.0):
+        """
+        :param idle_ttl: Seconds after which an unused entry is dropped.
+        :param report_interval: Seconds between two fan-out summaries.
+        """
+        self.idle_ttl = idle_ttl
+        self.report_interval = report_interval
+        self.entries: Dict[PollKey, PollEntry] = {}
+        self.upstream_calls = 0
+        self.shared_calls = 0
+        self._reported_at = time.monotonic()
+
+    async def fetch(
+        self,
+        key: PollKey,
+        fetch: Callable[[], Awaitable[Any]],
+        max_age: float,
+        subscriber: Any = None,
+    ) -> Any:
+        """
+        Return the upstream result for ``key``, polling upstream only if no
+        fresh enough result is available.
+
+        :param key: (provider, resource, credential fingerprint).
+        :param fetch: Coroutine function performing the upstream call.
+        :param max_age: Oldest result, in seconds, the caller accepts.
+        :param subscriber: Trigger reading the result, used for reporting.
+        """
+        now = time.monotonic()
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = PollEntry()
+        entry.used_at = now
+        if subscriber is not None:
+            entry.subscribers.add(subscriber)
+
+        if entry.inflight is not None:
+            self.shared_calls += 1
+            return await asyncio.shield(entry.inflight)
+
+        if entry.fetched_at and now - entry.fetched_at < max_age:
+            self.shared_calls += 1
+            return entry.value
+
+        self.upstream_calls += 1
+        entry.inflight = asyncio.get_running_loop().create_future()
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            entry.inflight.cancel()
+            raise
+        except Exception as e:
+            entry.inflight.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            entry.inflight.exception()
+            raise
+        else:
+            entry.value = value
+            entry.fetched_at = time.monotonic()
+            entry.inflight.set_result(value)
+            return value
+        finally:
+            entry.inflight = None
+            self._maintain()
+
+    def _maintain(self):
+        now = time.monotonic()
+        if now - self._reported_at < self.report_interval:
+            return
+
+        for key, entry in list(self.entries.items()):
+            if entry.inflight is None and now - entry.used_at >= self.idle_ttl:
+                del self.entries[key]
+
+        subscribers = sum(len(entry.subscribers) for entry in self.entries.values())
+        LOGGER.info(
+            f"Shared poller: {len(self.entries)} resources for {subscribers} "
+            f"triggers, {self.upstream_calls} upstream calls, "
+            f"{self.shared_calls} served from a shared result."
+        )
+        self.upstream_calls = 0
+        self.shared_calls = 0
+        self._reported_at = now
+
+
+# Process wide instance used by the polling triggers
+shared_poller = SharedPoller()
@@ -0,0 +1,228 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    # Only for annotations: the web API imports this module for INTERVALS_KEY
+    from src.service.Trigger.triggers import Trigger
+
+from src.service import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+# Redis hash of area id -> effective polling interval, published by the manager
+INTERVALS_KEY = "scheduler:intervals"
+
+# Coroutine evaluating a trigger once and returning the delay until its next run
+RunOnce = Callable[["Trigger", Any], Awaitable[float]]
+
+
+@dataclass(eq=False)
+class ScheduledTrigger:
+    """
+    A trigger registered in the scheduler.
+    """
+
+    area_id: int
+    trigger: "Trigger"
+    area: Any
+    due: float = 0.0
+    running: bool = False
+
+
+@dataclass
+class LatenessStats:
+    """
+    How late dispatches ran relative to their due time, over a report window.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    worst_area_id: Optional[int] = None
+    started_at: float = field(default=0.0)
+
+    def record(self, area_id: int, lateness: float):
+        self.count += 1
+        self.total += lateness
+        if lateness >= self.max:
+            self.max = lateness
+            self.worst_area_id = area_id
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class TriggerScheduler:
+    """
+    Single timer heap driving every polled trigger of the process.
+
+    Instead of one sleeping task per area, triggers are kept in a heap keyed on
+    their next due time. A dispatcher pops due triggers and hands them to a
+    bounded pool of executor coroutines, which evaluate the trigger and push it
+    back with the delay returned by ``run_once``.
+    """
+
+    def __init__(
+        self,
+        run_once: RunOnce,
+        workers: int = 32,
+        lateness_warning: float = 5.0,
+        report_interval: float = 60.0,
+    ):
+        """
+        :param run_once: Coroutine evaluating a trigger once, returning the
+            number of seconds to wait before the next evaluation.
+        :param workers: Number of executor coroutines.
+        :param lateness_warning: Log a warning when a dispatch runs this many
+            seconds after its due time.
+        :param report_interval: Seconds between two lateness summaries.
+        """
+        self.run_once = run_once
+        self.workers = workers
+        self.lateness_warning = lateness_warning
+        self.report_interval = report_interval
+
+        self.jobs: Dict[int, ScheduledTrigger] = {}
+        self._heap: List[Tuple[float, int, ScheduledTrigger]] = []
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._ready: Optional[asyncio.Queue] = None
+        self.lateness = LatenessStats()
+
+    def __contains__(self, area_id: int) -> bool:
+        return area_id in self.jobs
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def add(self, area, trigger: "Trigger", delay: float = 0.0):
+        """
+        Schedule a trigger for the given area, replacing any previous one.
+        """
+        job = ScheduledTrigger(area_id=area.id, trigger=trigger, area=area)
+        self.jobs[area.id] = job
+        self._push(job, self._now() + delay)
+
+    def remove(self, area_id: int) -> Optional[ScheduledTrigger]:
+        """
+        Unschedule the trigger of the given area.
+
+        A run already in progress completes but is not rescheduled.
+        """
+        return self.jobs.pop(area_id, None)
+
+    def clear(self):
+        self.jobs.clear()
+        self._heap.clear()
+
+    async def run(self):
+        """
+        Run the dispatcher and the executor pool until cancelled.
+        """
+        self._wakeup = asyncio.Event()
+        self._ready = asyncio.Queue(maxsize=self.workers)
+        self.lateness = LatenessStats(started_at=self._now())
+
+        LOGGER.info(f"Trigger scheduler started with {self.workers} executors.")
+        executors = [
+            asyncio.create_task(self._execute(), name=f"trigger-executor-{i}")
+            for i in range(self.workers)
+        ]
+        try:
+            await self._dispatch()
+        finally:
+            for executor in executors:
+                executor.cancel()
+            await asyncio.gather(*executors, return_exceptions=True)
+            LOGGER.info("Trigger scheduler stopped.")
+
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def _push(self, job: ScheduledTrigger, due: float):
+        job.due = due
+        heapq.heappush(self._heap, (due, next(self._counter), job))
+        # Only wake the dispatcher when the earliest deadline moved
+        if self._wakeup is not None and self._heap[0][2] is job:
+            self._wakeup.set()
+
+    async def _dispatch(self):
+        while True:
+            if not self._heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            due, _, job = self._heap[0]
+            delay = due - self._now()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            heapq.heappop(self._heap)
+            # Skip entries of removed or replaced triggers
+            if self.jobs.get(job.area_id) is not job or job.running:
+                continue
+
+            job.running = True
+            await self._ready.put(job)
+
+    async def _execute(self):
+        while True:
+            job = await self._ready.get()
+            self._record_lateness(job, self._now() - job.due)
+
+            delay = 60.0
+            try:
+                delay = await self.run_once(job.trigger, job.area)
+            except asyncio.CancelledError:
+                # A shared poll cancelled by the trigger that started it lands
+                # here too (see SharedPoller.fetch): only the executor's own
+                # cancellation stops it, the other is an empty evaluation
+                if asyncio.current_task().cancelling():
+                    raise
+                LOGGER.warning(
+                    f"Shared poll of Area ID {job.area_id} was cancelled, "
+                    "no event this round."
+                )
+                delay = job.trigger.next_interval(False)
+            except Exception as e:
+                LOGGER.error(
+                    f"Unexpected error running trigger for Area ID {job.area_id}: {e}",
+                    exc_info=True,
+                )
+            finally:
+                job.running = False
+                self._ready.task_done()
+
+            if self.jobs.get(job.area_id) is job:
+                self._push(job, self._now() + delay)
+
+    def _record_lateness(self, job: ScheduledTrigger, lateness: float):
+        lateness = max(lateness, 0.0)
+        self.lateness.record(job.area_id, lateness)
+        metrics.SCHEDULER_LATENESS.observe(lateness)
+        if lateness >= self.lateness_warning:
+            LOGGER.warning(
+                f"Trigger for Area ID {job.area_id} dispatched {lateness:.2f}s late."
+            )
+
+        now = self._now()
+        if now - self.lateness.started_at >= self.report_interval:
+            LOGGER.info(
+                f"Scheduler: {len(self.jobs)} triggers, "
+                f"{self.lateness.count} dispatches, "
+                f"lateness avg {self.lateness.average * 1000:.1f}ms "
+                f"max {self.lateness.max * 1000:.1f}ms "
+                f"(Area ID {self.lateness.worst_area_id})."
+            )
+            self.lateness = LatenessStats(started_at=now)
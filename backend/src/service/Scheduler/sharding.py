@@ -0,0 +1,127 @@
+import bisect
+import hashlib
+import logging
+import os
+import socket
+import time
+from typing import Iterable, List, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping keys to node names.
+
+    Every node is placed ``replicas`` times on the ring so that a join or a
+    departure only moves about ``1 / len(nodes)`` of the keys.
+    """
+
+    def __init__(self, nodes: Iterable[str], replicas: int = 64):
+        self.nodes = sorted(set(nodes))
+        self._points: List[Tuple[int, str]] = sorted(
+            (_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(replicas)
+        )
+        self._hashes = [point for point, _ in self._points]
+
+    def owner(self, key: str) -> Optional[str]:
+        """
+        Return the node owning ``key``, or None if the ring is empty.
+        """
+        if not self._points:
+            return None
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._points)
+        return self._points[index][1]
+
+
+class ShardCoordinator:
+    """
+    Redis backed membership of the trigger manager processes.
+
+    Each process renews a lease in a sorted set (score = lease expiry). Live
+    members form a consistent hash ring and an area is polled only by the
+    member owning ``area:<id>`` on that ring, or the area's placement key when
+    its trigger shares a resource with others (see Trigger.placement_key).
+    Members whose lease expired are pruned by whoever heartbeats next, which
+    rebalances their areas.
+    """
+
+    MEMBERS_KEY = "scheduler:nodes"
+
+    def __init__(
+        self,
+        redis_client,
+        node_name: Optional[str] = None,
+        lease_ttl: float = 30.0,
+        replicas: int = 64,
+        members_key: str = MEMBERS_KEY,
+    ):
+        """
+        :param redis_client: Async Redis client.
+        :param node_name: Unique name of this process, defaults to host-pid.
+        :param lease_ttl: Seconds a member stays alive without heartbeat.
+        :param replicas: Virtual nodes per member on the hash ring.
+        :param members_key: Sorted set of the members, one per ring.
+        """
+        self.redis_client = redis_client
+        self.members_key = members_key
+        self.node_name = node_name or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_ttl = lease_ttl
+        self.replicas = replicas
+        self.ring = HashRing([self.node_name], replicas)
+        self.changed_at = time.monotonic()
+
+    async def heartbeat(self) -> bool:
+        """
+        Renew this node's lease and refresh the member list.
+
+        :return: True if the membership changed since the previous heartbeat.
+        """
+        now = time.time()
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.members_key, {self.node_name: now + self.lease_ttl})
+            pipe.zremrangebyscore(self.members_key, "-inf", now)
+            pipe.zrange(self.members_key, 0, -1)
+            _, _, members = await pipe.execute()
+
+        if sorted(members) == self.ring.nodes:
+            return False
+
+        LOGGER.info(
+            f"Scheduler membership changed: {self.ring.nodes} -> {sorted(members)}"
+        )
+        self.ring = HashRing(members, self.replicas)
+        self.changed_at = time.monotonic()
+        return True
+
+    async def leave(self):
+        """
+        Drop this node's lease so its areas are rebalanced right away.
+        """
+        try:
+            await self.redis_client.zrem(self.members_key, self.node_name)
+            LOGGER.info(f"Scheduler node {self.node_name} left the ring.")
+        except Exception as e:
+            LOGGER.error(f"Failed to leave the scheduler ring: {e}")
+
+    def owns(self, area_id: int, placement: Optional[str] = None) -> bool:
+        """
+        Whether this node is responsible for polling the given area.
+
+        :param placement: Placement key of the area, None to place it by id.
+        """
+        return self.owns_key(placement or f"area:{area_id}")
+
+    def owns_key(self, key: str) -> bool:
+        return self.ring.owner(key) == self.node_name
+
+    def settled(self, handoff_delay: float) -> bool:
+        """
+        Whether the membership has been stable for ``handoff_delay`` seconds,
+        i.e. long enough for the previous owners to have dropped their areas.
+        """
+        return time.monotonic() - self.changed_at >= handoff_delay
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.future import select
+
+from src.db.models import UserService
+from src.oauth.events import TOKEN_INVALIDATION_CHANNEL
+
+LOGGER = logging.getLogger(__name__)
+
+# (user_id, service_id)
+TokenKey = Tuple[int, int]
+
+
+def area_token_keys(area) -> Set[TokenKey]:
+    """
+    The (user, service) pairs whose tokens an area needs: the action's one for
+    its trigger and action, the reaction's one for its reaction.
+    """
+    keys = set()
+    for component in (area.action, area.reaction):
+        if component is not None:
+            keys.add((area.user_id, component.service_id))
+    return keys
+
+
+class TokenResolver:
+    """
+    In-process cache of the OAuth access tokens stored in ``user_services``.
+
+    Tokens of newly started areas are bulk loaded in a single query, entries
+    expire after ``ttl`` seconds and are reloaded right away when the web API
+    publishes an invalidation (see src.oauth.events), so resolving a token on
+    the event dispatch path normally needs no database round trip.
+    """
+
+    def __init__(self, session_factory, redis_client, ttl: float = 900.0):
+        """
+        :param session_factory: Async SQLAlchemy session factory.
+        :param redis_client: Async Redis client, used for the invalidations.
+        :param ttl: Seconds a cached token is trusted.
+        """
+        self.session_factory = session_factory
+        self.redis_client = redis_client
+        self.ttl = ttl
+        # (user_id, service_id) -> (access token or None, loaded at)
+        self._cache: Dict[TokenKey, Tuple[Optional[str], float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def preload(self, areas: Iterable):
+        """
+        Load the tokens of every given area not already cached, in one query.
+        """
+        keys = set()
+        for area in areas:
+            keys |= area_token_keys(area)
+        await self._load([key for key in keys if not self._fresh(key)])
+
+    async def get(self, user_id: int, service_id: Optional[int]) -> Optional[str]:
+        """
+        Return the access token of the user for the service, if any.
+        """
+        if service_id is None:
+            return None
+
+        key = (user_id, service_id)
+        if self._fresh(key):
+            self.hits += 1
+        else:
+            self.misses += 1
+            await self._load([key])
+        return self._cache[key][0]
+
+    def invalidate(self, user_id: int, service_id: int):
+        self._cache.pop((user_id, service_id), None)
+
+    async def listen(self, retry_delay: float = 5.0):
+        """
+        Apply the invalidations published by the web API until cancelled.
+        """
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(TOKEN_INVALIDATION_CHANNEL)
+                LOGGER.info(
+                    f"Listening for token invalidations on "
+                    f"{TOKEN_INVALIDATION_CHANNEL}."
+                )
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        await self._handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                LOGGER.error(f"Token invalidation listener failed: {e}")
+                # Tokens changed while disconnected are only caught by the TTL
+                self._cache.clear()
+            finally:
+                await pubsub.close()
+            await asyncio.sleep(retry_delay)
+
+    async def _handle_invalidation(self, data):
+        try:
+            payload = json.loads(data)
+            key = (int(payload["user_id"]), int(payload["service_id"]))
+        except (ValueError, KeyError, TypeError) as e:
+            LOGGER.error(f"Invalid token invalidation message: {e}")
+            return
+
+        self.invalidate(*key)
+        # Reload right away so the next dispatch still hits the cache
+        try:
+            await self._load([key])
+            LOGGER.info(f"Reloaded token of user {key[0]} for service {key[1]}.")
+        except Exception as e:
+            LOGGER.error(f"Failed to reload invalidated token: {e}")
+
+    def _fresh(self, key: TokenKey) -> bool:
+        entry = self._cache.get(key)
+        return entry is not None and time.monotonic() - entry[1] < self.ttl
+
+    async def _load(self, keys):
+        if not keys:
+            return
+
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(
+                    UserService.user_id,
+                    UserService.service_id,
+                    UserService.access_token,
+                ).where(tuple_(UserService.user_id, UserService.service_id).in_(keys))
+            )
+            rows = result.all()
+
+        now = time.monotonic()
+        # Missing rows are cached too, as "no token"
+        loaded = {key: None for key in keys}
+        for user_id, service_id, access_token in rows:
+            loaded[(user_id, service_id)] = access_token or None
+        for key, token in loaded.items():
+            self._cache[key] = (token, now)
+        LOGGER.debug(f"Loaded {len(keys)} tokens ({len(rows)} linked).")
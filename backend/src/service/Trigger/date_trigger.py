@@ -3,6 +3,7 @@ import time
 from datetime import datetime
 from typing import Optional
 
+from src.service.Queue.queues import PRIORITY_LANE
 from src.service.Trigger.triggers import Trigger, TriggerConfig, TriggerResponse
 
 LOGGER = logging.getLogger(__name__)
@@ -31,6 +32,8 @@ class DateTrigger(Trigger):
 
     name = "date_action"
     config = DateTriggerConfig
+    # Time-based, fired tasks should not wait behind bulk traffic
+    lane = PRIORITY_LANE
 
     def __init__(self, config: DateTriggerConfig):
         """
@@ -3,13 +3,12 @@ import logging
 import time
 from typing import Optional
 
-from src.config import settings
-from src.service.services.discord.dicord import DiscordAPI
 from src.service.Trigger.discord.base_config import (
     BaseDiscordConfig,
     GuildDiscordConfig,
 )
-from src.service.Trigger.triggers import Trigger, TriggerResponse
+from src.service.Trigger.discord.gateway_trigger import DiscordGatewayTrigger
+from src.service.Trigger.triggers import TriggerResponse
 
 LOGGER = logging.getLogger(__name__)
 
@@ -23,9 +22,11 @@ class ChannelUpdatedTriggerResponse(TriggerResponse):
     channel_name: str
 
 
-class ChannelUpdatedTrigger(Trigger):
+class ChannelUpdatedTrigger(DiscordGatewayTrigger):
     name = "channel_updated"
     config = GuildDiscordConfig
+    event_type = "CHANNEL_UPDATE"
+    scope_field = "guild_id"
 
     def __init__(self, config: GuildDiscordConfig):
         super().__init__(config)
@@ -36,25 +37,21 @@ class ChannelUpdatedTrigger(Trigger):
             LOGGER.error("Missing guild_id in trigger config.")
             return None
 
-        api = DiscordAPI(token=settings.oauth.providers.get("discord").token)
-        await api.connect()
-
-        async for channel_data in api.wait_for_event(
-            "CHANNEL_UPDATE", lambda c: c.get("guild_id") == self.guild_id
-        ):
-            channel_id = channel_data.get("id")
-            channel_name = channel_data.get("name")
-
-            # Pass the channel_id and relevant data to the reaction
-            return ChannelUpdatedTriggerResponse(
-                triggered_at=time.time(),
-                details={
-                    "event": "channel_updated",
-                    "guild_id": self.guild_id,
-                },
-                channel_id=channel_id,
-                channel_name=channel_name,
-                content=json.dumps(channel_data),
-            )
-
-        return None
+        channel_data = await self.next_event()
+        if channel_data is None:
+            return None
+
+        channel_id = channel_data.get("id")
+        channel_name = channel_data.get("name")
+
+        # Pass the channel_id and relevant data to the reaction
+        return ChannelUpdatedTriggerResponse(
+            triggered_at=time.time(),
+            details={
+                "event": "channel_updated",
+                "guild_id": self.guild_id,
+            },
+            channel_id=channel_id,
+            channel_name=channel_name,
+            content=json.dumps(channel_data),
+        )
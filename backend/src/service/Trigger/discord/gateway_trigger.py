@@ -0,0 +1,73 @@
+import logging
+from typing import Any, Dict, Optional
+
+from src.service.services.discord.gateway import (
+    DiscordGateway,
+    GatewaySubscription,
+    bot_gateway,
+)
+from src.service.Trigger.triggers import Trigger
+
+LOGGER = logging.getLogger(__name__)
+
+
+class DiscordGatewayTrigger(Trigger):
+    """
+    Base of the triggers fed by the shared Discord gateway session.
+
+    The trigger subscribes to ``event_type`` in the channel or guild named
+    by its ``scope_field`` config field on first evaluation; each evaluation
+    then takes at most one pending event without waiting for the next one,
+    and the next evaluation is due right away while events are pending.
+    The area is placed with the gateway shard receiving its guild's events.
+    """
+
+    event_type: str = ""
+    scope_field: str = "guild_id"  # channel_id or guild_id
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._gateway: Optional[DiscordGateway] = None
+        self._subscription: Optional[GatewaySubscription] = None
+        self._reported_missing_bot = False
+
+    async def next_event(self) -> Optional[dict]:
+        """
+        Oldest event received since the previous evaluation, if any.
+        """
+        if self._subscription is None:
+            self._gateway = bot_gateway()
+            if self._gateway is None:
+                if not self._reported_missing_bot:
+                    LOGGER.error(
+                        f"No Discord bot token configured, trigger '{self.name}' "
+                        "will never fire."
+                    )
+                    self._reported_missing_bot = True
+                return None
+            self._subscription = await self._gateway.subscribe(
+                self.event_type, getattr(self.config, self.scope_field)
+            )
+        return self._subscription.pop()
+
+    def next_interval(self, fired: bool) -> float:
+        interval = super().next_interval(fired)
+        # Drain the inbox before it overflows, e.g. in a busy channel
+        if self._subscription is not None and self._subscription.events:
+            return 0.0
+        return interval
+
+    @classmethod
+    async def placement_key(cls, config: Dict[str, Any]) -> Optional[str]:
+        gateway = bot_gateway()
+        if gateway is None:
+            return None
+        guild_id = config.get("guild_id")
+        if guild_id is None and config.get("channel_id"):
+            guild_id = await gateway.guild_of_channel(str(config["channel_id"]))
+        return await gateway.placement(guild_id)
+
+    async def close(self):
+        if self._subscription is not None:
+            await self._gateway.unsubscribe(self._subscription)
+            self._subscription = None
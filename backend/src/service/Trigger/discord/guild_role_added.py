@@ -3,13 +3,12 @@ import logging
 import time
 from typing import Optional
 
-from src.config import settings
-from src.service.services.discord.dicord import DiscordAPI
 from src.service.Trigger.discord.base_config import (
     BaseDiscordConfig,
     GuildDiscordConfig,
 )
-from src.service.Trigger.triggers import Trigger, TriggerResponse
+from src.service.Trigger.discord.gateway_trigger import DiscordGatewayTrigger
+from src.service.Trigger.triggers import TriggerResponse
 
 LOGGER = logging.getLogger(__name__)
 
@@ -23,9 +22,12 @@ class GuildRoleAddedTriggerResponse(TriggerResponse):
     role_name: str
 
 
-class GuildRoleAddedTrigger(Trigger):
+class GuildRoleAddedTrigger(DiscordGatewayTrigger):
     name = "guild_role_added"
     config = GuildDiscordConfig
+    fingerprint_fields = ("role_id",)
+    event_type = "GUILD_ROLE_CREATE"
+    scope_field = "guild_id"
 
     def __init__(self, config: GuildDiscordConfig):
         super().__init__(config)
@@ -36,34 +38,28 @@ class GuildRoleAddedTrigger(Trigger):
             LOGGER.error("Missing guild_id in trigger config.")
             return None
 
-        api = DiscordAPI(token=settings.oauth.providers.get("discord").token)
-        await api.connect()
-
-        async for role_data in api.wait_for_event(
-            "GUILD_ROLE_CREATE", lambda r: r.get("guild_id") == self.guild_id
-        ):
-            try:
-                role = role_data.get("role", {})
-                role_id = role.get("id")
-                role_name = role.get("name")
+        role_data = await self.next_event()
+        if role_data is None:
+            return None
 
-                if not role_id or not role_name:
-                    raise ValueError(
-                        "Role data is incomplete or missing required fields."
-                    )
+        try:
+            role = role_data.get("role", {})
+            role_id = role.get("id")
+            role_name = role.get("name")
 
-                return GuildRoleAddedTriggerResponse(
-                    triggered_at=time.time(),
-                    details={
-                        "event": "guild_role_added",
-                        "guild_id": self.guild_id,
-                    },
-                    role_id=role_id,
-                    role_name=role_name,
-                    content=json.dumps(role),
-                )
-            except Exception as e:
-                LOGGER.error(f"Error processing role data: {e}")
-                continue
+            if not role_id or not role_name:
+                raise ValueError("Role data is incomplete or missing required fields.")
 
-        return None
+            return GuildRoleAddedTriggerResponse(
+                triggered_at=time.time(),
+                details={
+                    "event": "guild_role_added",
+                    "guild_id": self.guild_id,
+                },
+                role_id=role_id,
+                role_name=role_name,
+                content=json.dumps(role),
+            )
+        except Exception as e:
+            LOGGER.error(f"Error processing role data: {e}")
+            return None
@@ -2,9 +2,8 @@ import logging
 import time
 from typing import Optional
 
-from src.config import settings
-from src.service.services.discord.dicord import DiscordAPI
-from src.service.Trigger.triggers import Trigger, TriggerResponse
+from src.service.Trigger.discord.gateway_trigger import DiscordGatewayTrigger
+from src.service.Trigger.triggers import TriggerResponse
 
 from .base_config import GuildDiscordConfig
 
@@ -21,13 +20,15 @@ class MemberRemovedTriggerResponse(TriggerResponse):
     guild_id: str
 
 
-class MemberRemovedTrigger(Trigger):
+class MemberRemovedTrigger(DiscordGatewayTrigger):
     """
     Trigger that activates when a member is removed from a specific Discord guild.
     """
 
     name = "member_removed"
     config = GuildDiscordConfig
+    event_type = "GUILD_MEMBER_REMOVE"
+    scope_field = "guild_id"
 
     def __init__(self, config: GuildDiscordConfig):
         """
@@ -48,28 +49,24 @@ class MemberRemovedTrigger(Trigger):
             LOGGER.error("Missing guild_id in trigger config.")
             return None
 
-        api = DiscordAPI(token=settings.oauth.providers.get("discord").token)
-        await api.connect()
-
-        async for member_data in api.wait_for_event(
-            "GUILD_MEMBER_REMOVE", lambda m: m.get("guild_id") == self.guild_id
-        ):
-            user_id = member_data.get("user", {}).get("id")
-            user_name = member_data.get("user", {}).get("username")
-
-            LOGGER.info(
-                f"Member removed from guild {self.guild_id}: {user_name} ({user_id})"
-            )
-
-            return MemberRemovedTriggerResponse(
-                triggered_at=time.time(),
-                details={
-                    "event": "member_removed",
-                    "guild_id": self.guild_id,
-                },
-                user_id=user_id,
-                user_name=user_name,
-                guild_id=self.guild_id,
-            )
-
-        return None
+        member_data = await self.next_event()
+        if member_data is None:
+            return None
+
+        user_id = member_data.get("user", {}).get("id")
+        user_name = member_data.get("user", {}).get("username")
+
+        LOGGER.info(
+            f"Member removed from guild {self.guild_id}: {user_name} ({user_id})"
+        )
+
+        return MemberRemovedTriggerResponse(
+            triggered_at=time.time(),
+            details={
+                "event": "member_removed",
+                "guild_id": self.guild_id,
+            },
+            user_id=user_id,
+            user_name=user_name,
+            guild_id=self.guild_id,
+        )
@@ -2,13 +2,12 @@ import logging
 import time
 from typing import Optional
 
-from src.config import settings
-from src.service.services.discord.dicord import DiscordAPI
 from src.service.Trigger.discord.base_config import (
     BaseDiscordConfig,
     GuildDiscordConfig,
 )
-from src.service.Trigger.triggers import Trigger, TriggerResponse
+from src.service.Trigger.discord.gateway_trigger import DiscordGatewayTrigger
+from src.service.Trigger.triggers import TriggerResponse
 
 LOGGER = logging.getLogger(__name__)
 
@@ -23,9 +22,11 @@ class MessageUpdatedTriggerResponse(TriggerResponse):
     channel_id: str
 
 
-class MessageUpdatedTrigger(Trigger):
+class MessageUpdatedTrigger(DiscordGatewayTrigger):
     name = "message_updated"
     config = BaseDiscordConfig
+    event_type = "MESSAGE_UPDATE"
+    scope_field = "channel_id"
 
     def __init__(self, config: BaseDiscordConfig):
         super().__init__(config)
@@ -36,24 +37,20 @@ class MessageUpdatedTrigger(Trigger):
             LOGGER.error("channel_id in trigger config.")
             return None
 
-        api = DiscordAPI(token=settings.oauth.providers.get("discord").token)
-        await api.connect()
-
-        async for message in api.wait_for_event(
-            "MESSAGE_UPDATE", lambda m: m.get("channel_id") == self.channel_id
-        ):
-            LOGGER.info(
-                f"Updated message in channel {self.channel_id}: {message.get('content')}"
-            )
-            return MessageUpdatedTriggerResponse(
-                triggered_at=time.time(),
-                details={
-                    "event": "message_updated",
-                    "channel_id": self.channel_id,
-                },
-                content=message.get("content"),
-                author=message.get("author"),
-                channel_id=self.channel_id,
-            )
-
-        return None
+        message = await self.next_event()
+        if message is None:
+            return None
+
+        LOGGER.info(
+            f"Updated message in channel {self.channel_id}: {message.get('content')}"
+        )
+        return MessageUpdatedTriggerResponse(
+            triggered_at=time.time(),
+            details={
+                "event": "message_updated",
+                "channel_id": self.channel_id,
+            },
+            content=message.get("content"),
+            author=message.get("author"),
+            channel_id=self.channel_id,
+        )
@@ -2,9 +2,8 @@ import logging
 import time
 from typing import Optional
 
-from src.config import settings
-from src.service.services.discord.dicord import DiscordAPI
-from src.service.Trigger.triggers import Trigger, TriggerResponse
+from src.service.Trigger.discord.gateway_trigger import DiscordGatewayTrigger
+from src.service.Trigger.triggers import TriggerResponse
 
 from .base_config import BaseDiscordConfig
 
@@ -19,15 +18,19 @@ class NewMessageInChannelResponse(TriggerResponse):
     content: str
     author: dict
     channel_id: str
+    message_id: Optional[str] = None
 
 
-class NewMessageInChannelTrigger(Trigger):
+class NewMessageInChannelTrigger(DiscordGatewayTrigger):
     """
     Trigger that activates when a new message is posted in a specific Discord channel.
     """
 
     name = "new_message_in_channel"
     config = BaseDiscordConfig
+    fingerprint_fields = ("message_id",)
+    event_type = "MESSAGE_CREATE"
+    scope_field = "channel_id"
 
     def __init__(self, config: BaseDiscordConfig):
         """
@@ -48,24 +51,21 @@ class NewMessageInChannelTrigger(Trigger):
             LOGGER.error("Missing channel_id in trigger config.")
             return None
 
-        api = DiscordAPI(token=settings.oauth.providers.get("discord").token)
-        await api.connect()
-
-        async for message in api.wait_for_event(
-            "MESSAGE_CREATE", lambda m: m.get("channel_id") == self.channel_id
-        ):
-            LOGGER.info(
-                f"New message received in channel {self.channel_id}: {message.get('content')}"
-            )
-            return NewMessageInChannelResponse(
-                triggered_at=time.time(),
-                details={
-                    "event": "new_message",
-                    "channel_id": self.channel_id,
-                },
-                content=message.get("content"),
-                author=message.get("author"),
-                channel_id=self.channel_id,
-            )
+        message = await self.next_event()
+        if message is None:
+            return None
 
-        return None
+        LOGGER.info(
+            f"New message received in channel {self.channel_id}: {message.get('content')}"
+        )
+        return NewMessageInChannelResponse(
+            triggered_at=time.time(),
+            details={
+                "event": "new_message",
+                "channel_id": self.channel_id,
+            },
+            content=message.get("content"),
+            author=message.get("author"),
+            channel_id=self.channel_id,
+            message_id=message.get("id"),
+        )
@@ -2,9 +2,8 @@ import logging
 import time
 from typing import Optional
 
-from src.config import settings
-from src.service.services.discord.dicord import DiscordAPI
-from src.service.Trigger.triggers import Trigger, TriggerResponse
+from src.service.Trigger.discord.gateway_trigger import DiscordGatewayTrigger
+from src.service.Trigger.triggers import TriggerResponse
 
 from .base_config import GuildDiscordConfig
 
@@ -22,13 +21,15 @@ class UserJoinsGuildTriggerResponse(TriggerResponse):
     guild_id: str
 
 
-class UserJoinsGuildTrigger(Trigger):
+class UserJoinsGuildTrigger(DiscordGatewayTrigger):
     """
     Trigger that activates when a user joins a specific Discord guild.
     """
 
     name = "user_joins_guild"
     config = GuildDiscordConfig
+    event_type = "GUILD_MEMBER_ADD"
+    scope_field = "guild_id"
 
     def __init__(self, config: GuildDiscordConfig):
         """
@@ -49,30 +50,26 @@ class UserJoinsGuildTrigger(Trigger):
             LOGGER.error("Missing guild_id in trigger config.")
             return None
 
-        api = DiscordAPI(token=settings.oauth.providers.get("discord").token)
-        await api.connect()
-
-        async for member_data in api.wait_for_event(
-            "GUILD_MEMBER_ADD", lambda m: m.get("guild_id") == self.guild_id
-        ):
-            user_id = member_data.get("user", {}).get("id")
-            user_name = member_data.get("user", {}).get("username")
-            joined_at = member_data.get("joined_at")
-
-            LOGGER.info(
-                f"New user joined guild {self.guild_id}: {user_name} ({user_id}) at {joined_at}"
-            )
-
-            return UserJoinsGuildTriggerResponse(
-                triggered_at=time.time(),
-                details={
-                    "event": "user_joins_guild",
-                    "guild_id": self.guild_id,
-                },
-                user_id=user_id,
-                user_name=user_name,
-                joined_at=joined_at,
-                guild_id=self.guild_id,
-            )
-
-        return None
+        member_data = await self.next_event()
+        if member_data is None:
+            return None
+
+        user_id = member_data.get("user", {}).get("id")
+        user_name = member_data.get("user", {}).get("username")
+        joined_at = member_data.get("joined_at")
+
+        LOGGER.info(
+            f"New user joined guild {self.guild_id}: {user_name} ({user_id}) at {joined_at}"
+        )
+
+        return UserJoinsGuildTriggerResponse(
+            triggered_at=time.time(),
+            details={
+                "event": "user_joins_guild",
+                "guild_id": self.guild_id,
+            },
+            user_id=user_id,
+            user_name=user_name,
+            joined_at=joined_at,
+            guild_id=self.guild_id,
+        )
@@ -5,6 +5,7 @@ from typing import Any, Dict, Optional, Tuple
 
 from pydantic import Field
 
+from ...Scheduler.limits import RateLimit
 from ...services.github.github import GitHubAPI
 from ..triggers import Trigger, TriggerConfig, TriggerResponse
 
@@ -32,6 +33,17 @@ class NewPushTrigger(Trigger):
 
     name = "new_push"
     config = GitHubTriggerConfig
+    state_fields = ("last_commit_sha",)
+    fingerprint_fields = ("commit_sha",)
+    # 5000 requests per hour and per token
+    rate_limit = RateLimit(
+        provider="github",
+        concurrency=16,
+        token_concurrency=2,
+        rate=1.3,
+        burst=20,
+        per_poll=True,
+    )
 
     def __init__(self, config: GitHubTriggerConfig):
         super().__init__(config)
@@ -44,7 +56,11 @@ class NewPushTrigger(Trigger):
         LOGGER.info(f"Attempting to fetch commits for repository: {self.config.repo}")
 
         try:
-            commits = await self.github_api.get_repo_commits(self.config.repo)
+            commits = await self.poll_shared(
+                "github",
+                f"commits:{self.config.repo}",
+                lambda: self.github_api.get_repo_commits(self.config.repo),
+            )
             if not commits:
                 LOGGER.info("No commits found in repository")
                 return None
@@ -4,6 +4,7 @@ from typing import Optional
 
 from pydantic import Field
 
+from src.service.Scheduler.limits import RateLimit
 from src.service.services.google.google import GoogleAPI
 from src.service.Trigger.triggers import Trigger, TriggerConfig, TriggerResponse
 
@@ -32,31 +33,53 @@ class GmailTrigger(Trigger):
 
     name = "gmail_receive"
     config = GmailTriggerConfig
+    state_fields = ("last_message_id",)
+    fingerprint_fields = ("message_id",)
+    # 250 quota units per second and per user, a poll costs up to 10
+    rate_limit = RateLimit(
+        provider="google",
+        concurrency=16,
+        token_concurrency=2,
+        rate=10,
+        burst=20,
+        per_poll=True,
+    )
 
     def __init__(self, config: GmailTriggerConfig):
         super().__init__(config)
-        self.last_check_time = time.time()
+        self.last_message_id: Optional[str] = None
         self.api = GoogleAPI(token=config.token)
 
     async def execute(self, *args, **kwargs) -> Optional[GmailTriggerResponse]:
         """Check for new emails since last check"""
         try:
-            # Get new messages since last check
-            query = f"after:{int(self.last_check_time)}"
-            messages = await self.api.list_messages(query=query)
+            # The inbox listing is shared by every trigger of the same account
+            messages = await self.poll_shared(
+                "google", "messages", lambda: self.api.list_messages()
+            )
 
             if not messages:
                 return None
 
             # Get the most recent message details
             message = messages[0]  # Most recent message
-            message_details = await self.api.get_message(message["id"])
+            if self.last_message_id is None:
+                # First check: only mails received from now on should fire
+                self.last_message_id = message["id"]
+                return None
+            if message["id"] == self.last_message_id:
+                return None
+
+            message_details = await self.poll_shared(
+                "google",
+                f"message:{message['id']}",
+                lambda: self.api.get_message(message["id"]),
+            )
 
             if not message_details:
                 return None
 
-            # Update last check time
-            self.last_check_time = time.time()
+            self.last_message_id = message["id"]
 
             # Extract relevant information
             headers = message_details.get("payload", {}).get("headers", [])
@@ -1,8 +1,9 @@
 import logging
 import time
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional
 
+from src.service.Queue.queues import PRIORITY_LANE
 from src.service.Trigger.triggers import Trigger, TriggerConfig, TriggerResponse
 
 LOGGER = logging.getLogger(__name__)
@@ -28,6 +29,8 @@ class HourlyTrigger(Trigger):
 
     name = "time_of_day_action"
     config = HourlyTriggerConfig
+    # Time-based, fired tasks should not wait behind bulk traffic
+    lane = PRIORITY_LANE
 
     def __init__(self, config: HourlyTriggerConfig):
         """
@@ -39,6 +42,17 @@ class HourlyTrigger(Trigger):
         self.target_time = self._parse_time_to_seconds(config.target_time)
         self.last_run_date = None  # Permet d'éviter de déclencher plusieurs fois le même jour
 
+    def get_state(self):
+        return {
+            "last_run_date": (
+                self.last_run_date.isoformat() if self.last_run_date else None
+            )
+        }
+
+    def load_state(self, state):
+        if state and state.get("last_run_date"):
+            self.last_run_date = date.fromisoformat(state["last_run_date"])
+
     def _parse_time_to_seconds(self, time_str: str) -> int:
         """
         Convertit un horaire (HH:mm:ss) en secondes depuis le début de la journée.
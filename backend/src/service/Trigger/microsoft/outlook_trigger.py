@@ -5,6 +5,7 @@ from typing import Optional, Tuple
 
 from pydantic import Field
 
+from src.service.Scheduler.limits import RateLimit
 from src.service.services.microsoft.outlook_api import OutlookAPI
 from src.service.Trigger.triggers import Trigger, TriggerConfig, TriggerResponse
 
@@ -34,34 +35,59 @@ class OutlookTrigger(Trigger):
 
     name = "outlook_receive"
     config = OutlookTriggerConfig
+    state_fields = ("last_check_time", "last_message_id")
+    fingerprint_fields = ("message_id",)
+    # Graph allows 4 concurrent requests and 10000 per 10 minutes per mailbox
+    rate_limit = RateLimit(
+        provider="microsoft",
+        concurrency=16,
+        token_concurrency=4,
+        rate=15,
+        burst=30,
+        per_poll=True,
+    )
 
     def __init__(self, config: OutlookTriggerConfig):
         super().__init__(config)
         self.last_check_time = time.time()
+        self.last_message_id: Optional[str] = None
         self.api = OutlookAPI(token=config.token)
 
     async def execute(self, *args, **kwargs) -> Optional[OutlookTriggerReponse]:
         """Check for new emails since last check"""
         try:
-            timestamp = time.strftime(
-                "%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.last_check_time)
+            # Listing shared by every trigger of the account using this filter
+            query = self.config.query or ""
+            messages = await self.poll_shared(
+                "microsoft",
+                f"messages:{query}",
+                lambda: self.api.list_messages(query=query),
             )
-            query = f"receivedDateTime gt {timestamp}"
-            if self.config.query:
-                query = f"({query}) and ({self.config.query})"
-
-            messages = await self.api.list_messages(query=query)
 
             if not messages:
                 return None
 
             message = messages[0]
-            message_details = await self.api.get_message(message["id"])
+            timestamp = time.strftime(
+                "%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.last_check_time)
+            )
+            if (
+                message["id"] == self.last_message_id
+                or message.get("receivedDateTime", "") <= timestamp
+            ):
+                return None
+
+            message_details = await self.poll_shared(
+                "microsoft",
+                f"message:{message['id']}",
+                lambda: self.api.get_message(message["id"]),
+            )
 
             if not message_details:
                 return None
 
             self.last_check_time = time.time()
+            self.last_message_id = message["id"]
 
             return OutlookTriggerReponse(
                 triggered_at=time.time(),
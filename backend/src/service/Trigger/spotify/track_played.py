@@ -1,4 +1,3 @@
-import asyncio
 import json
 import logging
 import time
@@ -7,6 +6,7 @@ from typing import Optional
 from pydantic import Field
 from typing_extensions import Optional
 
+from src.service.Scheduler.limits import RateLimit
 from src.service.services.spotify.spotify_api import SpotifyAPIClient
 from src.service.Trigger.triggers import Trigger, TriggerConfig, TriggerResponse
 
@@ -26,6 +26,8 @@ class TrackPlayedTriggerResponse(TriggerResponse):
     track_name: str
     artist_name: str
     album_name: str
+    # Playback state change time reported by Spotify (ms)
+    played_at: Optional[int] = None
 
 
 class CurrentlyPlayingTrigger(Trigger):
@@ -33,6 +35,13 @@ class CurrentlyPlayingTrigger(Trigger):
 
     name = "track_played"
     config = SpotifyTriggerConfig
+    state_fields = ("last_track_id",)
+    # The same track played again later is a new event
+    fingerprint_fields = ("track_id", "played_at")
+    # Spotify rate limits per app over a rolling 30 seconds window
+    rate_limit = RateLimit(
+        provider="spotify", concurrency=8, token_concurrency=1, rate=2, burst=5
+    )
 
     def __init__(self, config: SpotifyTriggerConfig):
         super().__init__(config)
@@ -42,50 +51,47 @@ class CurrentlyPlayingTrigger(Trigger):
     async def execute(self, *args, **kwargs) -> Optional[TrackPlayedTriggerResponse]:
         """Check for currently playing track and return when a new track is detected."""
         LOGGER.info("Running Track")
-        while True:
-            try:
-                current_track = await self.spotify_api.get_currently_playing()
-                LOGGER.info(current_track)
-                if (
-                    not current_track
-                    or "item" not in current_track
-                    or not current_track["item"]
-                ):
-                    LOGGER.info("No Track found skip")
-                    await asyncio.sleep(self.config.interval)
-                    continue
-
-                track = current_track["item"]
-                track_id = track["id"]
-
-                if track_id != self.last_track_id:
-                    self.last_track_id = track_id
-
-                    track_info = TrackPlayedTriggerResponse(
-                        triggered_at=time.time(),
-                        details={
-                            "event": "track_played",
-                        },
-                        track_id=track_id,
-                        track_name=track["name"],
-                        artist_name=(
-                            track["artists"][0]["name"]
-                            if track["artists"]
-                            else "Unknown Artist"
-                        ),
-                        album_name=(
-                            track["album"]["name"]
-                            if "album" in track
-                            else "Unknown Album"
-                        ),
-                        content=json.dumps(track),
-                    )
-
-                    LOGGER.info(f"New track detected: {track_info}")
-                    return track_info
-
-            except Exception as e:
-                LOGGER.error(f"Error checking currently playing track: {str(e)}")
-
-            # Sleep before the next check
-            await asyncio.sleep(self.config.interval)
+        try:
+            current_track = await self.spotify_api.get_currently_playing()
+            LOGGER.info(current_track)
+            if (
+                not current_track
+                or "item" not in current_track
+                or not current_track["item"]
+            ):
+                LOGGER.info("No Track found skip")
+                return None
+
+            track = current_track["item"]
+            track_id = track["id"]
+
+            if track_id == self.last_track_id:
+                return None
+
+            self.last_track_id = track_id
+
+            track_info = TrackPlayedTriggerResponse(
+                triggered_at=time.time(),
+                details={
+                    "event": "track_played",
+                },
+                track_id=track_id,
+                track_name=track["name"],
+                artist_name=(
+                    track["artists"][0]["name"]
+                    if track["artists"]
+                    else "Unknown Artist"
+                ),
+                album_name=(
+                    track["album"]["name"] if "album" in track else "Unknown Album"
+                ),
+                played_at=current_track.get("timestamp"),
+                content=json.dumps(track),
+            )
+
+            LOGGER.info(f"New track detected: {track_info}")
+            return track_info
+
+        except Exception as e:
+            LOGGER.error(f"Error checking currently playing track: {str(e)}")
+            return None
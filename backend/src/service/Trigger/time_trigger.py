@@ -38,6 +38,13 @@ class TimeTrigger(Trigger):
         """
         super().__init__(config)
 
+    def get_state(self):
+        return {"last_run": self.config.last_run}
+
+    def load_state(self, state):
+        if state and state.get("last_run") is not None:
+            self.config.last_run = state["last_run"]
+
     async def execute(self, *args, **kwargs) -> Optional[TimeTriggerResponse]:
         """
         Evaluate if the interval has passed since the last run.
@@ -1,11 +1,16 @@
 import asyncio
 import logging
+import random
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
+from src.service.Queue.queues import DEFAULT_LANE
+from src.service.Scheduler.limits import RateLimit, execution_limiter
+from src.service.Scheduler.poller import credential_key, shared_poller
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -21,6 +26,15 @@ class TriggerConfig(BaseModel):
     last_run: Optional[float] = Field(
         time.time(), description="Timestamp of the last run"
     )
+    adaptive: bool = Field(
+        False, description="Back off while no event fires, snap back when one does"
+    )
+    min_interval: Optional[float] = Field(
+        None, description="Adaptive floor in seconds, defaults to the interval"
+    )
+    max_interval: Optional[float] = Field(
+        None, description="Adaptive ceiling in seconds"
+    )
 
 
 class TriggerResponse(BaseModel):
@@ -40,6 +54,25 @@ class Trigger(ABC):
 
     name: str = "generic_trigger"  # Unique identifier for the trigger type
     config = TriggerConfig
+    # Provider budget enforced by the runner before every execute() call
+    rate_limit: Optional[RateLimit] = None
+    # Task queue lane of the tasks the trigger fires (see FairQueue)
+    lane: str = DEFAULT_LANE
+
+    # Attributes holding the trigger's cursor, checkpointed by the runner and
+    # restored on start so that a restart resumes where it stopped
+    state_fields: Tuple[str, ...] = ()
+    # Event fields identifying an event at its provider (e.g. a commit sha),
+    # so that the runner drops it when emitted again (see fingerprint)
+    fingerprint_fields: Tuple[str, ...] = ()
+
+    # Delay after a first failed evaluation when not adaptive, and its cap
+    # after consecutive failures
+    error_interval: float = 60.0
+    max_error_interval: float = 900.0
+    # Adaptive mode: growth factor while quiet and default ceiling (seconds)
+    backoff_factor: float = 2.0
+    default_max_interval: float = 300.0
 
     def __init__(self, config: TriggerConfig):
         """
@@ -50,6 +83,9 @@ class Trigger(ABC):
         self.config = config
         self.is_running = False
         self.last_run_time = config.last_run
+        # Delay before the next evaluation, as last decided by the runner
+        self.effective_interval = self._floor()
+        self.error_streak = 0
 
     @abstractmethod
     async def execute(self, *args, **kwargs) -> Optional[TriggerResponse]:
@@ -60,6 +96,123 @@ class Trigger(ABC):
         """
         pass
 
+    def get_state(self) -> Dict[str, Any]:
+        """
+        JSON serializable snapshot of the trigger's cursor.
+        """
+        return {field: getattr(self, field) for field in self.state_fields}
+
+    def load_state(self, state: Optional[Dict[str, Any]]):
+        """
+        Restore a cursor previously returned by ``get_state``.
+        """
+        for field in self.state_fields:
+            if state and field in state:
+                setattr(self, field, state[field])
+
+    @classmethod
+    async def placement_key(cls, config: Dict[str, Any]) -> Optional[str]:
+        """
+        Scheduler hash ring key of the resource the trigger listens to, so
+        that the areas sharing it run on the same process (see
+        ShardCoordinator). None places the area by its id.
+
+        :param config: Raw trigger configuration of the area.
+        """
+        return None
+
+    async def close(self):
+        """
+        Release what the trigger holds (subscriptions, connections...) once
+        it is stopped. Nothing by default.
+        """
+
+    def fingerprint(self, event: Dict[str, Any]) -> Optional[str]:
+        """
+        Stable identity of a serialized event, None if it has none and must
+        never be deduplicated.
+        """
+        if not self.fingerprint_fields:
+            return None
+        values = [event.get(field) for field in self.fingerprint_fields]
+        if any(value is None for value in values):
+            return None
+        return f"{self.name}:" + "|".join(str(value) for value in values)
+
+    def next_interval(self, fired: bool) -> float:
+        """
+        Delay before the next evaluation after a successful one.
+
+        In adaptive mode the delay grows by ``backoff_factor`` on every quiet
+        evaluation, up to the ceiling, and snaps back to the floor once an
+        event fires. Otherwise it is the configured interval.
+
+        :param fired: Whether the evaluation produced an event.
+        """
+        self.error_streak = 0
+        if not self.config.adaptive or fired:
+            self.effective_interval = self._floor()
+        else:
+            self.effective_interval = min(
+                self.effective_interval * self.backoff_factor, self._ceiling()
+            )
+        return self.effective_interval
+
+    def failure_interval(self) -> float:
+        """
+        Delay before the next evaluation after a failed one.
+
+        Consecutive failures back off exponentially, with jitter so that areas
+        failing together (e.g. a provider outage) do not retry in lockstep:
+        from ``error_interval`` up to ``max_error_interval``, or in adaptive
+        mode from the floor up to the ceiling.
+        """
+        self.error_streak += 1
+        if not self.config.adaptive:
+            backoff = min(
+                self.error_interval * self.backoff_factor ** (self.error_streak - 1),
+                self.max_error_interval,
+            )
+            return random.uniform(backoff / 2, backoff)
+
+        backoff = min(
+            self._floor() * self.backoff_factor**self.error_streak, self._ceiling()
+        )
+        self.effective_interval = random.uniform(backoff / 2, backoff)
+        return self.effective_interval
+
+    def _floor(self) -> float:
+        interval = self.config.interval
+        if self.config.adaptive and self.config.min_interval:
+            interval = self.config.min_interval
+        return float(interval if interval is not None else self.error_interval)
+
+    def _ceiling(self) -> float:
+        ceiling = self.config.max_interval or self.default_max_interval
+        return max(float(ceiling), self._floor())
+
+    async def poll_shared(
+        self, provider: str, resource: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Poll an upstream resource through the shared poller, so that every
+        trigger watching it with the same credential reuses one upstream call.
+
+        :param provider: Name of the upstream provider (github, google...).
+        :param resource: Identifier of the polled resource for that provider.
+        :param fetch: Coroutine function performing the upstream call.
+        """
+
+        async def charged_fetch():
+            # Only the upstream call spends the budget, not the shared reads
+            await execution_limiter.charge(self)
+            return await fetch()
+
+        key = (provider, resource, credential_key(self.config.token))
+        return await shared_poller.fetch(
+            key, charged_fetch, max_age=self.config.interval or 0, subscriber=self
+        )
+
     async def run(self, report_callback: Callable[[str, TriggerResponse], None]):
         """
         Continuous trigger loop that evaluates the trigger and reports back when conditions are met.
@@ -83,7 +236,7 @@ class Trigger(ABC):
                     )
                     await report_callback(self.name, response)
 
-                await asyncio.sleep(self.config.interval)
+                await asyncio.sleep(self.next_interval(bool(response)))
             except asyncio.CancelledError:
                 LOGGER.info(f"Trigger '{self.name}' loop cancelled.")
                 break
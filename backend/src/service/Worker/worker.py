@@ -1,24 +1,93 @@
 import asyncio
-import json
 import logging
-from typing import Dict, Type
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from pydantic import ValidationError
+from sqlalchemy import select
 
+from src.db.models import Area
+from src.service import metrics
 from src.service.Action.actions import Action
-from src.service.Reaction.reactions import Reaction
+from src.service.Queue.envelope import EnvelopeError, TaskEnvelope, decode_task
+from src.service.Queue.queues import QueuedTask, TaskQueue
+from src.service.Queue.retry import DeadLetters, RetryPolicy, RetryScheduler
+from src.service.Reaction.reactions import Reaction, ReactionFailed, ReactionResponse
+from src.service.registry import ComponentKind
+from src.service.Scheduler.limits import WaitStats
+from src.service.Worker.cache import ComponentCache
 
 LOGGER = logging.getLogger(__name__)
 
 
 class Worker:
-    def __init__(self, queue_name, redis_client, session_factory):
+    def __init__(
+        self,
+        queue: TaskQueue,
+        session_factory,
+        registry=None,
+        tokens=None,
+        retries: Optional[RetryScheduler] = None,
+        dead_letters: Optional[DeadLetters] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        batch_size: int = 32,
+        concurrency: int = 8,
+        prefetch: int = 64,
+        reaction_concurrency: Optional[Dict[str, int]] = None,
+        drain_timeout: float = 30.0,
+        report_interval: float = 60.0,
+        cache_size: int = 1024,
+    ):
         """
-        Worker initialization with queue, Redis client, and DB session factory.
+        Worker initialization with task queue and DB session factory.
+
+        Components not registered explicitly are looked up in ``registry``
+        (a ComponentRegistry) the first time a task uses them. Task envelopes
+        reference their area and tokens, which are resolved through the
+        database and ``tokens`` (a TokenResolver).
+
+        Failed tasks are retried through ``retries`` following the reaction's
+        ``retry_policy`` (``retry_policy`` by default), then moved to
+        ``dead_letters``. Invalid tasks (ValueError) are not retried.
+
+        :param queue: Task queue backend (see src.service.Queue).
+        :param batch_size: Maximum number of tasks popped per round trip.
+        :param concurrency: Number of tasks processed concurrently.
+        :param prefetch: Maximum number of popped tasks waiting in memory.
+        :param reaction_concurrency: Reaction name -> maximum number of its
+            tasks processed concurrently, on top of ``concurrency``.
+        :param drain_timeout: Seconds given to buffered and in-flight tasks
+            to complete when the worker stops.
+        :param report_interval: Seconds between two queue stats reports.
+        :param cache_size: Maximum number of configured action and reaction
+            instances kept for reuse.
         """
-        self.queue_name = queue_name
-        self.redis_client = redis_client
+        self.queue = queue
         self.session_factory = session_factory
+        self.registry = registry
+        self.tokens = tokens
+        self.retries = retries
+        self.dead_letters = dead_letters
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.batch_size = max(batch_size, 1)
+
+        self.concurrency = max(concurrency, 1)
+        self.prefetch = max(prefetch, 1)
+        self.reaction_concurrency = reaction_concurrency or {}
+        self.drain_timeout = drain_timeout
+        self.report_interval = report_interval
+        self._reaction_slots: Dict[str, asyncio.Semaphore] = {}
+        # (queued task, decoded envelope, pop time) waiting for a consumer
+        self._buffer: Optional[
+            asyncio.Queue[Tuple[QueuedTask, TaskEnvelope, float]]
+        ] = None
+        self.instances = ComponentCache(maxsize=cache_size)
+        # Area id -> (revision, action config, reaction config)
+        self._area_configs: Dict[int, Tuple[Optional[float], dict, dict]] = {}
+        self.in_flight = 0
+        # Lane -> time tasks spent in the queue, since the last report
+        self.waits: Dict[str, WaitStats] = {}
+        self._stopping = asyncio.Event()
 
         self.triggers: Dict[str, Dict] = {}
         self.actions: Dict[str, Dict] = {}
@@ -45,6 +114,16 @@ class Worker:
         self.reactions[name] = reaction_data
         LOGGER.info(f"Registered reaction: {name}")
 
+    def _lookup(self, registered: Dict[str, Dict], kind: ComponentKind, name: str):
+        data = registered.get(name)
+        if data is None and self.registry is not None:
+            component = self.registry.get(kind, name)
+            if component:
+                data = {"class": component.cls, "config": component.config}
+                registered[name] = data
+                LOGGER.info(f"Registered {kind.value}: {name}")
+        return data
+
     async def process_task(self, task: dict):
         """
         Process a single task from the queue.
@@ -53,8 +132,10 @@ class Worker:
             action_name = task["action"]["name"]
             reaction_name = task["reaction"]["name"]
 
-            action_data = self.actions.get(action_name)
-            reaction_data = self.reactions.get(reaction_name)
+            action_data = self._lookup(self.actions, ComponentKind.ACTION, action_name)
+            reaction_data = self._lookup(
+                self.reactions, ComponentKind.REACTION, reaction_name
+            )
             LOGGER.debug(f"Liste des actions enregistrées: {list(self.actions.keys())}")
             LOGGER.debug(
                 f"Liste des réactions enregistrées: {list(self.reactions.keys())}"
@@ -68,56 +149,366 @@ class Worker:
             # Initialize the action with validated configuration
             action_class: Type[Action] = action_data["class"]
 
-            action_config_model = action_class.config
+            area_id = task.get("area_id")
             try:
-                print(task["action"]["params"])
-                action_config = action_config_model(**task["action"]["params"])
+                action_instance = self.instances.build(
+                    action_class, area_id, {}, task["action"]["params"]
+                )
             except ValidationError as e:
                 raise ValueError(
                     f"Invalid action configuration for '{action_name}': {e}"
                 )
 
-            action_instance = action_class(action_config)
             action_result = await action_instance.execute(task["action"]["params"])
+            action_done_at = time.time()
+            labels = (task_trigger(task), action_name, reaction_name)
+            metrics.observe_stage(
+                "action", *labels, task.get("dequeued_at"), action_done_at
+            )
 
+            # The area's config and token are the stable part of the reaction
+            # config, the event's fields are overlaid on top of it
             reaction_class: Type[Reaction] = reaction_data["class"]
-            reaction_config_model = reaction_class.config
-            reaction_params = {
-                **task["reaction"]["params"],
-                "token": (
-                    task["reaction"]["config"]["token"]
-                    if "config" in task["reaction"]
-                    and "token" in task["reaction"]["config"]
-                    else None
-                ),
-            }
+            reaction_config = task["reaction"].get("config") or {}
             try:
-                reaction_config = reaction_config_model(**reaction_params)
+                reaction_instance = self.instances.build(
+                    reaction_class,
+                    area_id,
+                    {**reaction_config, "token": reaction_config.get("token")},
+                    task["reaction"]["params"],
+                )
             except ValidationError as e:
                 raise ValueError(
                     f"Invalid reaction configuration for '{reaction_name}': {e}"
                 )
-            reaction_instance = reaction_class(config=reaction_config)
-            await reaction_instance.execute(action_result)
+            reaction_result = await reaction_instance.execute(action_result)
+            if (
+                isinstance(reaction_result, ReactionResponse)
+                and not reaction_result.success
+            ):
+                raise ReactionFailed(
+                    f"Reaction '{reaction_name}' failed: {reaction_result.details}"
+                )
+            done_at = time.time()
+            metrics.observe_stage("reaction", *labels, action_done_at, done_at)
+            metrics.observe_stage("end_to_end", *labels, task.get("fired_at"), done_at)
 
         except Exception as e:
             LOGGER.error(f"Error processing task: {e}", exc_info=True)
+            raise
 
     async def listen(self):
         """
         Continuously listen for tasks from the queue.
+
+        Popped tasks go through an in-memory buffer of ``prefetch`` tasks
+        consumed by ``concurrency`` coroutines. When the worker is stopped or
+        cancelled, the buffered and in-flight tasks are drained first.
         """
-        LOGGER.info(f"Worker listening for tasks on queue: {self.queue_name}")
+        LOGGER.info(
+            f"Worker listening for tasks on queue: {self.queue.name} "
+            f"({self.concurrency} concurrent, prefetch {self.prefetch})"
+        )
+        self._buffer = asyncio.Queue(maxsize=self.prefetch)
+        consumers = [
+            asyncio.create_task(self._consume(), name=f"worker-consumer-{i}")
+            for i in range(self.concurrency)
+        ]
+        reported_at = time.monotonic()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    # Only pop what the buffer can take right away
+                    room = self.prefetch - self._buffer.qsize()
+                    count = min(max(room, 1), self.batch_size)
+                    popped = await self.queue.pop_batch(count)
+                    dequeued_at = time.time()
+                    for queued in popped:
+                        try:
+                            envelope = decode_task(queued.data)
+                        except EnvelopeError as e:
+                            LOGGER.error(f"Undecodable task: {e}")
+                            await self._dead_letter(queued, e)
+                            await self.queue.ack(queued)
+                            continue
+                        self._record_wait(queued.lane, envelope, dequeued_at)
+                        await self._buffer.put((queued, envelope, dequeued_at))
+                        metrics.WORKER_BUFFERED.set(self._buffer.qsize())
+
+                    if time.monotonic() - reported_at >= self.report_interval:
+                        reported_at = time.monotonic()
+                        await self._report()
+
+                except Exception as e:
+                    LOGGER.error(f"Error during task listening: {e}", exc_info=True)
+                    await asyncio.sleep(1)
+        finally:
+            await self._drain(consumers)
+
+    def stop(self):
+        """
+        Stop popping new tasks; ``listen`` returns once the others are done.
+        """
+        self._stopping.set()
+
+    async def _consume(self):
         while True:
+            queued, envelope, dequeued_at = await self._buffer.get()
+            metrics.WORKER_BUFFERED.set(self._buffer.qsize())
+            self.in_flight += 1
+            metrics.WORKER_IN_FLIGHT.inc()
             try:
-                task_data = await self.redis_client.rpop(self.queue_name)
-                if not task_data:
-                    await asyncio.sleep(1)
-                    continue
+                try:
+                    await self._execute(envelope, dequeued_at)
+                    self._count(envelope, "success")
+                except Exception as e:
+                    await self._failed(queued, envelope, e)
+                await self.queue.ack(queued)
+            except Exception as e:
+                LOGGER.error(f"Failed to settle task: {e}", exc_info=True)
+            finally:
+                self.in_flight -= 1
+                metrics.WORKER_IN_FLIGHT.dec()
+                self._buffer.task_done()
 
-                task = json.loads(task_data)
+    async def _execute(self, envelope: TaskEnvelope, dequeued_at: float):
+        task = await self._resolve(envelope)
+        if task is None:
+            return
+        task = {**task, "dequeued_at": dequeued_at, "fired_at": envelope.fired_at}
+        slot = self._reaction_slot(envelope)
+        if slot is None:
+            await self.process_task(task)
+        else:
+            async with slot:
                 await self.process_task(task)
 
-            except Exception as e:
-                LOGGER.error(f"Error during task listening: {e}", exc_info=True)
-                await asyncio.sleep(1)
+    async def _failed(
+        self, queued: QueuedTask, envelope: TaskEnvelope, error: Exception
+    ):
+        """
+        Schedule the retry of a failed task, or dead-letter it once its
+        policy's attempts are exhausted or if it is invalid.
+        """
+        attempts = envelope.attempts + 1
+        policy = self._retry_policy(envelope.reaction)
+        if (
+            self.retries is not None
+            and not isinstance(error, ValueError)
+            and attempts < policy.max_attempts
+        ):
+            delay = policy.delay(attempts)
+            LOGGER.warning(
+                f"Task of reaction '{envelope.reaction}' failed "
+                f"({attempts}/{policy.max_attempts}), retrying in {delay:.0f}s."
+            )
+            await self.retries.schedule(
+                queued.data,
+                attempts,
+                delay,
+                tenant=envelope.user_id,
+                lane=queued.lane,
+            )
+            self._count(envelope, "retried")
+            return
+        await self._dead_letter(queued, error, envelope, attempts)
+        self._count(envelope, "dead_lettered")
+
+    @staticmethod
+    def _count(envelope: TaskEnvelope, outcome: str):
+        metrics.TASKS.labels(
+            envelope.trigger, envelope.action, envelope.reaction, outcome
+        ).inc()
+
+    async def _dead_letter(
+        self,
+        queued: QueuedTask,
+        error: Exception,
+        envelope: Optional[TaskEnvelope] = None,
+        attempts: int = 1,
+    ):
+        reaction = envelope.reaction if envelope else ""
+        LOGGER.error(
+            f"Task of reaction '{reaction}' dead-lettered after {attempts} "
+            f"attempts: {error}"
+        )
+        if self.dead_letters is None:
+            return
+        await self.dead_letters.add(
+            queued.data,
+            f"{type(error).__name__}: {error}",
+            reaction=reaction,
+            attempts=attempts,
+            tenant=envelope.user_id if envelope else None,
+            lane=queued.lane,
+        )
+
+    def _retry_policy(self, reaction_name: str) -> RetryPolicy:
+        data = self._lookup(self.reactions, ComponentKind.REACTION, reaction_name)
+        policy = getattr(data["class"], "retry_policy", None) if data else None
+        return policy or self.retry_policy
+
+    async def _resolve(self, envelope: TaskEnvelope) -> Optional[dict]:
+        """
+        Build the full task of an envelope: area configurations, tokens and
+        the action and reaction parameters derived from the event.
+        """
+        if envelope.legacy is not None:
+            return envelope.legacy
+        try:
+            action_config, reaction_config = await self._area_config(envelope)
+        except LookupError as e:
+            LOGGER.error(f"Dropping task: {e}")
+            return None
+
+        action_token = reaction_token = None
+        if self.tokens is not None:
+            action_token = await self.tokens.get(
+                envelope.user_id, envelope.action_service_id
+            )
+            reaction_token = await self.tokens.get(
+                envelope.user_id, envelope.reaction_service_id
+            )
+
+        event = envelope.event
+        return {
+            "trigger": {"name": envelope.trigger},
+            "action": {
+                "name": envelope.action,
+                "params": extract_action_params(event, action_config),
+                "config": {**action_config, "token": action_token},
+            },
+            "reaction": {
+                "name": envelope.reaction,
+                "params": {**event, **reaction_config},
+                "config": {**reaction_config, "token": reaction_token},
+            },
+            "event_data": event,
+            "enqueued_at": envelope.enqueued_at,
+            "area_id": envelope.area_id,
+        }
+
+    async def _area_config(self, envelope: TaskEnvelope) -> Tuple[dict, dict]:
+        cached = self._area_configs.get(envelope.area_id)
+        if cached is not None and cached[0] == envelope.area_revision:
+            return cached[1], cached[2]
+
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Area.action_config, Area.reaction_config, Area.updated_at).where(
+                    Area.id == envelope.area_id
+                )
+            )
+            row = result.first()
+        if row is None:
+            raise LookupError(f"Area {envelope.area_id} no longer exists.")
+
+        action_config, reaction_config = row[0] or {}, row[1] or {}
+        revision = row[2].timestamp() if row[2] else None
+        # An older event keeps the cached configuration of a newer revision
+        if cached is None or (revision or 0) >= (cached[0] or 0):
+            self._area_configs[envelope.area_id] = (
+                revision,
+                action_config,
+                reaction_config,
+            )
+        return action_config, reaction_config
+
+    def _record_wait(self, lane: str, envelope: TaskEnvelope, dequeued_at: float):
+        enqueued_at = envelope.enqueued_at
+        if not isinstance(enqueued_at, (int, float)):
+            return
+        stats = self.waits.get(lane)
+        if stats is None:
+            stats = self.waits[lane] = WaitStats()
+        stats.record(max(dequeued_at - enqueued_at, 0.0))
+        metrics.observe_stage(
+            "queue",
+            envelope.trigger,
+            envelope.action,
+            envelope.reaction,
+            enqueued_at,
+            dequeued_at,
+        )
+
+    async def _report(self):
+        for lane, stats in self.waits.items():
+            LOGGER.info(
+                f"Lane {lane}: {stats.count} tasks waited {stats.average:.2f}s "
+                f"on average, {stats.max:.2f}s at most."
+            )
+        self.waits = {}
+        lookups = self.instances.hits + self.instances.misses
+        if lookups:
+            LOGGER.info(
+                f"Instance cache: {len(self.instances)} entries, hit rate "
+                f"{self.instances.hit_rate:.0%} over {lookups} lookups."
+            )
+        self.instances.reset_stats()
+        try:
+            stats = await self.queue.stats()
+            if self.retries is not None:
+                stats["retries"] = await self.retries.stats()
+            if self.dead_letters is not None:
+                stats["dead_letters"] = await self.dead_letters.count()
+        except Exception as e:
+            LOGGER.error(f"Failed to read queue stats: {e}")
+            return
+        LOGGER.info(
+            f"Worker: {self._buffer.qsize()} buffered, {self.in_flight} in flight, "
+            f"queue {self.queue.name}: {stats}"
+        )
+
+    def _reaction_slot(self, envelope: TaskEnvelope) -> Optional[asyncio.Semaphore]:
+        name = envelope.reaction
+        limit = self.reaction_concurrency.get(name)
+        if not limit:
+            return None
+        slot = self._reaction_slots.get(name)
+        if slot is None:
+            slot = self._reaction_slots[name] = asyncio.Semaphore(limit)
+        return slot
+
+    async def _drain(self, consumers: List[asyncio.Task]):
+        if self._buffer.qsize() or self.in_flight:
+            LOGGER.info(
+                f"Worker draining {self._buffer.qsize()} buffered and "
+                f"{self.in_flight} in-flight tasks before stopping..."
+            )
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(self._buffer.join()), self.drain_timeout
+            )
+        except asyncio.TimeoutError:
+            LOGGER.error(
+                f"Worker stopped with {self._buffer.qsize()} buffered tasks "
+                f"not processed after {self.drain_timeout}s."
+            )
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+            LOGGER.info("Worker stopped.")
+
+
+def task_trigger(task: dict) -> str:
+    """
+    Name of the trigger that fired a task, empty for old legacy tasks.
+    """
+    return (task.get("trigger") or {}).get("name", "")
+
+
+def extract_action_params(event_data: dict, config_model: Any) -> dict:
+    """
+    Dynamically map event_data into the action's params structure based on the config model.
+    """
+    try:
+        if hasattr(config_model, "__annotations__"):
+            expected_fields = config_model.__annotations__.keys()
+            return {
+                key: event_data.get(key) for key in expected_fields if key in event_data
+            }
+        return event_data
+    except Exception as e:
+        LOGGER.error(f"Failed to extract action params: {e}", exc_info=True)
+        return {}
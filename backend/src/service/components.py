@@ -0,0 +1,237 @@
+"""
+Manifest of the triggers, actions and reactions.
+
+Components are declared by (kind, name, "module:Class") so that listing them
+costs nothing: a module is only imported when one of its components is first
+looked up (see ComponentRegistry). Third party packages can add components
+through the ``area.components`` entry point group, named ``<kind>:<name>``.
+"""
+
+import logging
+from importlib.metadata import entry_points
+from typing import List
+
+from src.service.registry import ComponentKind, ComponentRegistry, ComponentSpec
+
+LOGGER = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "area.components"
+
+TRIGGER = ComponentKind.TRIGGER
+ACTION = ComponentKind.ACTION
+REACTION = ComponentKind.REACTION
+
+BUILTIN_COMPONENTS = [
+    # Discord
+    ComponentSpec(
+        TRIGGER,
+        "message_updated",
+        "src.service.Trigger.discord.message_updated:MessageUpdatedTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "message_updated",
+        "src.service.Action.discord.message_updated:MessageUpdatedAction",
+    ),
+    ComponentSpec(
+        TRIGGER,
+        "member_removed",
+        "src.service.Trigger.discord.member_removed:MemberRemovedTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "member_removed",
+        "src.service.Action.discord.member_removed:MemberRemovedAction",
+    ),
+    ComponentSpec(
+        TRIGGER,
+        "channel_deleted",
+        "src.service.Trigger.discord.channel_deleted:ChannelDeletedTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "channel_deleted",
+        "src.service.Action.discord.channel_deleted:ChannelDeletedAction",
+    ),
+    ComponentSpec(
+        TRIGGER,
+        "channel_updated",
+        "src.service.Trigger.discord.channel_upadte:ChannelUpdatedTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "channel_updated",
+        "src.service.Action.discord.channel_upadte:ChannelUpdatedAction",
+    ),
+    ComponentSpec(
+        TRIGGER,
+        "channel_created",
+        "src.service.Trigger.discord.channel_created:ChannelCreatedTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "channel_created",
+        "src.service.Action.discord.channel_created:ChannelCreatedAction",
+    ),
+    ComponentSpec(
+        TRIGGER,
+        "guild_role_added",
+        "src.service.Trigger.discord.guild_role_added:GuildRoleAddedTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "guild_role_added",
+        "src.service.Action.discord.guild_role_added:GuildRoleAddedAction",
+    ),
+    ComponentSpec(
+        TRIGGER,
+        "new_message_in_channel",
+        "src.service.Trigger.discord.new_message_in_channel"
+        ":NewMessageInChannelTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "new_message_in_channel",
+        "src.service.Action.discord.new_message_in_channel"
+        ":NewMessageInChannelAction",
+    ),
+    ComponentSpec(
+        REACTION,
+        "send_message",
+        "src.service.Reaction.discord.send_message:SendMessage",
+    ),
+    ComponentSpec(
+        REACTION,
+        "add_reaction",
+        "src.service.Reaction.discord.add_reaction:AddReaction",
+    ),
+    ComponentSpec(
+        REACTION,
+        "delete_message",
+        "src.service.Reaction.discord.delete_message:DeleteMessage",
+    ),
+    ComponentSpec(
+        REACTION,
+        "edit_message",
+        "src.service.Reaction.discord.edit_message:EditMessage",
+    ),
+    # Spotify
+    ComponentSpec(
+        TRIGGER,
+        "track_played",
+        "src.service.Trigger.spotify.track_played:CurrentlyPlayingTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "track_played",
+        "src.service.Action.spotify.track_played:TrackPlayedAction",
+    ),
+    ComponentSpec(
+        REACTION,
+        "add_to_playlist",
+        "src.service.Reaction.spotify.add_playlist:AddToPlaylistReaction",
+    ),
+    # Microsoft
+    ComponentSpec(
+        TRIGGER,
+        "outlook_receive",
+        "src.service.Trigger.microsoft.outlook_trigger:OutlookTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "outlook_receive",
+        "src.service.Action.microsoft.outlook_action:OutlookReceiveAction",
+    ),
+    ComponentSpec(
+        REACTION,
+        "send_mail",
+        "src.service.Reaction.microsoft.outlook_reaction:OutlookSendReaction",
+    ),
+    # Google
+    ComponentSpec(
+        TRIGGER,
+        "gmail_receive",
+        "src.service.Trigger.google.gmail_trigger:GmailTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "gmail_receive",
+        "src.service.Action.google.gmail_action:GmailReceiveAction",
+    ),
+    ComponentSpec(
+        REACTION,
+        "send_email",
+        "src.service.Reaction.google.gmail_reaction:GmailSendReaction",
+    ),
+    # GitHub
+    ComponentSpec(
+        TRIGGER,
+        "new_push",
+        "src.service.Trigger.github.github_trigger:NewPushTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "new_push",
+        "src.service.Action.github.github_action:NewPushAction",
+    ),
+    ComponentSpec(
+        REACTION,
+        "create_issue",
+        "src.service.Reaction.github.github_reaction:CreateIssueReaction",
+    ),
+    # Time
+    ComponentSpec(
+        TRIGGER,
+        "time_trigger",
+        "src.service.Trigger.time_trigger:TimeTrigger",
+    ),
+    ComponentSpec(
+        ACTION,
+        "time_action",
+        "src.service.Action.time_action:TimeAction",
+    ),
+    ComponentSpec(
+        TRIGGER,
+        "time_of_day_action",
+        "src.service.Trigger.hourly_trigger:HourlyTrigger",
+    ),
+    ComponentSpec(
+        TRIGGER,
+        "date_action",
+        "src.service.Trigger.date_trigger:DateTrigger",
+    ),
+    # Generic, the base action config used by the clients to create areas
+    ComponentSpec(
+        ACTION,
+        "generic_action",
+        "src.service.Action.actions:Action",
+    ),
+    # Debug
+    ComponentSpec(
+        REACTION,
+        "print_reaction",
+        "src.service.Reaction.print_reaction:PrintReaction",
+    ),
+]
+
+
+def plugin_components() -> List[ComponentSpec]:
+    """
+    Components declared by installed packages through entry points.
+    """
+    specs = []
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            kind, name = entry_point.name.split(":", 1)
+            specs.append(ComponentSpec(ComponentKind(kind), name, entry_point.value))
+        except ValueError:
+            LOGGER.error(
+                f"Invalid component entry point '{entry_point.name}', "
+                f"expected '<kind>:<name>'."
+            )
+    return specs
+
+
+# (kind, name) -> component, modules imported on first lookup
+REGISTRY = ComponentRegistry(BUILTIN_COMPONENTS + plugin_components())
+REGISTRY.report()
@@ -0,0 +1,114 @@
+from typing import Dict, List, Literal, Optional
+
+from pydantic_settings import BaseSettings
+
+
+class SchedulerConfig(BaseSettings):
+    """
+    Runtime settings of the trigger manager (``python -m src.service.main``).
+    """
+
+    refresh_interval: float = 10.0  # Seconds between two change feed polls
+    watermark_overlap: float = 30.0  # Seconds re-read behind the watermark
+    workers: int = 32  # Executor coroutines evaluating due triggers
+    lateness_warning: float = 5.0  # Warn when a dispatch runs this late (s)
+    token_ttl: float = 900.0  # Seconds an OAuth token stays cached
+    checkpoint_interval: float = 10.0  # Seconds between trigger state flushes
+    dedup_ttl: int = 86400  # Seconds an event fingerprint is kept, 0 disables
+    dedup_pending_ttl: int = 300  # Seconds a fingerprint is held until enqueued
+
+    # Sharding across several trigger manager processes
+    node_name: Optional[str] = None  # Defaults to "<hostname>-<pid>"
+    lease_ttl: float = 30.0  # Seconds before a silent node is considered dead
+    handoff_delay: float = 15.0  # Wait after a rebalance before claiming areas
+
+    class Config:
+        env_prefix = "SCHEDULER_"
+
+
+class WorkerConfig(BaseSettings):
+    """
+    Runtime settings of the task worker.
+    """
+
+    batch_size: int = 32  # Tasks drained from the queue per round trip
+    concurrency: int = 8  # Tasks processed concurrently
+    prefetch: int = 64  # Popped tasks waiting in memory
+    # Reaction name -> concurrent tasks (JSON, e.g. '{"send_email": 2}')
+    reaction_concurrency: Dict[str, int] = {}
+    drain_timeout: float = 30.0  # Seconds to finish pending tasks on shutdown
+    cache_size: int = 1024  # Configured action/reaction instances kept
+
+    # Default retry policy of the reactions (see Reaction.retry_policy)
+    retry_max_attempts: int = 5  # Deliveries in total, the first one included
+    retry_base_delay: float = 10.0  # Seconds before the first retry
+    retry_max_delay: float = 3600.0  # Cap of the exponential backoff
+
+    class Config:
+        env_prefix = "WORKER_"
+
+
+class QueueConfig(BaseSettings):
+    """
+    Task queue between the trigger manager and the workers.
+    """
+
+    backend: Literal["list", "stream", "fair"] = "list"
+    name: str = "task_queue"
+    block_timeout: float = 5.0  # Seconds a blocking pop waits for a task
+    enqueue_batch: int = 64  # Tasks pushed per pipelined round trip
+    enqueue_delay: float = 0.005  # Seconds a task may wait for its batch
+    # Tasks larger than this (bytes) are zstd compressed, None to disable
+    compress_threshold: Optional[int] = 4096
+    retry_poll_interval: float = 1.0  # Seconds between two retry promotions
+    dead_letter_maxlen: Optional[int] = 10_000  # Approximate dead letter cap
+
+    # Fair backend only
+    # Lane -> weight, highest priority first (JSON, e.g. '{"priority": 4}')
+    lanes: Dict[str, int] = {"priority": 4, "default": 1}
+    quantum: int = 4  # Tasks taken from a user before moving to the next
+
+    # Stream backend only
+    group: str = "workers"  # Consumer group shared by the workers
+    consumer: Optional[str] = None  # Defaults to "<hostname>-<pid>"
+    maxlen: Optional[int] = 100_000  # Approximate stream cap, None to disable
+    claim_idle: float = 60.0  # Seconds before a pending task is reclaimed
+    claim_interval: float = 30.0  # Seconds between two reclaim passes
+
+    class Config:
+        env_prefix = "QUEUE_"
+
+
+class MetricsConfig(BaseSettings):
+    """
+    Prometheus metrics of the trigger manager and worker process.
+    """
+
+    port: Optional[int] = 9100  # Port serving /metrics, None to disable
+    sample_interval: float = 15.0  # Seconds between two queue depth samples
+
+    class Config:
+        env_prefix = "METRICS_"
+
+
+class GatewayConfig(BaseSettings):
+    """
+    Discord gateway sessions shared by the Discord triggers.
+    """
+
+    compress: bool = True  # zlib-stream transport compression
+    inbox_size: int = 100  # Events kept per trigger between two evaluations
+    reconnect_delay: float = 5.0  # Seconds before reconnecting a lost session
+    # Shards the bot's guilds are split across, None for Discord's recommendation
+    shards: Optional[int] = None
+    # Read the dispatches from the Redis Streams fed by the gateway-ingest
+    # processes instead of opening gateway sessions
+    consume_streams: bool = False
+    stream_maxlen: int = 10_000  # Approximate entries kept per stream
+    stream_max_age: float = 300.0  # Seconds after which an entry is skipped
+    # Dispatch types the gateway-ingest processes publish, None for those the
+    # areas' Discord triggers need (privileged intents are only requested then)
+    ingest_events: Optional[List[str]] = None
+
+    class Config:
+        env_prefix = "DISCORD_GATEWAY_"
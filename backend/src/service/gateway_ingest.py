@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import signal
+from typing import Set
+
+from sqlalchemy.future import select
+
+from src.config import async_redis_client, async_session_factory, settings
+from src.db.models import Trigger as db_trigger
+from src.service import metrics
+from src.service.components import REGISTRY
+from src.service.registry import ComponentKind
+from src.service.Scheduler.sharding import ShardCoordinator
+from src.service.services.discord.bus import EventPublisher
+from src.service.services.discord.gateway import DiscordGateway
+from src.service.Trigger.discord.gateway_trigger import DiscordGatewayTrigger
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+LOGGER = logging.getLogger(__name__)
+
+# Hash ring of the gateway-ingest processes, apart from the trigger managers
+INGEST_NODES_KEY = "discord:ingest:nodes"
+
+
+async def ingested_events() -> Set[str]:
+    """
+    Dispatch types to publish: DISCORD_GATEWAY_INGEST_EVENTS, or those of the
+    Discord triggers some area uses, so that the sessions only request the
+    intents actually needed (see DiscordGateway).
+    """
+    configured = settings.discord_gateway.ingest_events
+    if configured is not None:
+        return set(configured)
+
+    async with async_session_factory() as session:
+        result = await session.execute(select(db_trigger.name).distinct())
+        names = result.scalars().all()
+    event_types = set()
+    for name in names:
+        trigger_class = REGISTRY.get_class(ComponentKind.TRIGGER, name)
+        if trigger_class and issubclass(trigger_class, DiscordGatewayTrigger):
+            event_types.add(trigger_class.event_type)
+    return event_types
+
+
+async def follow(
+    gateway: DiscordGateway, coordinator: ShardCoordinator, publisher: EventPublisher
+):
+    """
+    Keep publishing the dispatch types in use, from the shards this process
+    owns among the ingest processes.
+    """
+    while True:
+        try:
+            await coordinator.heartbeat()
+            event_types = await ingested_events()
+            if event_types != gateway.forwarded:
+                LOGGER.info(f"Publishing Discord dispatches {sorted(event_types)}.")
+                await gateway.forward(event_types, publisher.publish)
+            await gateway.assign_owned(coordinator, settings.scheduler.handoff_delay)
+        except Exception as e:
+            LOGGER.error(f"Error while following gateway shards: {e}", exc_info=True)
+        await asyncio.sleep(settings.scheduler.refresh_interval)
+
+
+async def main():
+    """
+    Gateway-ingest mode: hold the Discord gateway sessions and publish the
+    dispatches the areas' triggers need to the Redis Streams, for the service
+    processes running with DISCORD_GATEWAY_CONSUME_STREAMS to consume.
+    """
+    provider = settings.oauth.providers.get("discord")
+    if not getattr(provider, "token", None):
+        LOGGER.error("No Discord bot token configured, nothing to ingest.")
+        return
+
+    config = settings.discord_gateway
+    gateway = DiscordGateway(
+        provider.token,
+        redis_client=async_redis_client,
+        compress=config.compress,
+        reconnect_delay=config.reconnect_delay,
+        shard_count=config.shards,
+    )
+    coordinator = ShardCoordinator(
+        async_redis_client,
+        node_name=settings.scheduler.node_name,
+        lease_ttl=settings.scheduler.lease_ttl,
+        members_key=INGEST_NODES_KEY,
+    )
+
+    metrics.start_metrics_server(settings.metrics.port)
+
+    try:
+        publisher = EventPublisher(
+            async_redis_client,
+            num_shards=await gateway.configure(),
+            maxlen=config.stream_maxlen,
+        )
+        # Wait for the ring before opening any session
+        await gateway.assign(())
+
+        LOGGER.info("Starting Discord event publisher...")
+        publisher_task = asyncio.create_task(publisher.run())
+
+        LOGGER.info("Starting gateway shard assignment...")
+        shards_task = asyncio.create_task(follow(gateway, coordinator, publisher))
+
+        shutdown = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, shutdown.set)
+        shutdown_task = asyncio.create_task(shutdown.wait())
+        await asyncio.wait(
+            [publisher_task, shards_task, shutdown_task],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        LOGGER.info("Shutting down...")
+        shutdown_task.cancel()
+
+        # Close the sessions first, then write what they already received
+        shards_task.cancel()
+        await gateway.close()
+        publisher_task.cancel()
+        results = await asyncio.gather(
+            shards_task, publisher_task, return_exceptions=True
+        )
+        await publisher.flush()
+        for result in results:
+            if isinstance(result, Exception):
+                LOGGER.error(f"Task failed: {result}", exc_info=result)
+
+    except Exception as e:
+        LOGGER.error(f"Unexpected error in gateway ingest: {e}", exc_info=True)
+        await gateway.close()
+    finally:
+        await coordinator.leave()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
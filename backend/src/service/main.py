@@ -1,62 +1,33 @@
 import asyncio
-import json
 import logging
+import signal
+import time
+from datetime import datetime, timezone
 from typing import Dict, Optional
 
-from pydantic import BaseModel, ValidationError
-from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-
-from src.config import async_redis_client, async_session_factory
-from src.db.models import Area as db_area
-from src.db.models import UserService
-from src.service.Action.actions import Action
-from src.service.Action.discord import NewMessageInChannelAction
-from src.service.Action.discord.channel_created import ChannelCreatedAction
-from src.service.Action.discord.channel_deleted import ChannelDeletedAction
-from src.service.Action.discord.channel_upadte import ChannelUpdatedAction
-from src.service.Action.discord.guild_role_added import GuildRoleAddedAction
-from src.service.Action.discord.member_removed import (
-    MemberRemovedAction,
-    MemberRemovedActionConfig,
-)
-from src.service.Action.discord.message_updated import MessageUpdatedAction
-from src.service.Action.github.github_action import NewPushAction
-from src.service.Action.google.gmail_action import GmailReceiveAction
-from src.service.Action.microsoft.outlook_action import OutlookReceiveAction
-from src.service.Action.spotify.track_played import (
-    SpotifyActionConfig,
-    TrackPlayedAction,
-)
-from src.service.Action.time_action import TimeAction
-from src.service.Reaction.discord.add_reaction import AddReaction
-from src.service.Reaction.discord.delete_message import DeleteMessage
-from src.service.Reaction.discord.edit_message import EditMessage
-from src.service.Reaction.discord.send_message import SendMessage
-from src.service.Reaction.github.github_reaction import CreateIssueReaction
-from src.service.Reaction.google.gmail_reaction import GmailSendReaction
-from src.service.Reaction.microsoft.outlook_reaction import OutlookSendReaction
-from src.service.Reaction.print_reaction import PrintReaction
-from src.service.Reaction.reactions import Reaction
-from src.service.Reaction.spotify.add_playlist import AddToPlaylistReaction
-from src.service.Trigger.discord.channel_created import ChannelCreatedTrigger
-from src.service.Trigger.discord.channel_deleted import ChannelDeletedTrigger
-from src.service.Trigger.discord.channel_upadte import ChannelUpdatedTrigger
-from src.service.Trigger.discord.guild_role_added import GuildRoleAddedTrigger
-from src.service.Trigger.discord.member_removed import MemberRemovedTrigger
-from src.service.Trigger.discord.message_updated import MessageUpdatedTrigger
-from src.service.Trigger.date_trigger import DateTrigger
-from src.service.Trigger.hourly_trigger import HourlyTrigger
-from src.service.Trigger.discord.new_message_in_channel import (
-    NewMessageInChannelTrigger,
-)
-from src.service.Trigger.github.github_trigger import NewPushTrigger
-from src.service.Trigger.google.gmail_trigger import GmailTrigger
-from src.service.Trigger.microsoft.outlook_trigger import OutlookTrigger
-from src.service.Trigger.spotify.track_played import CurrentlyPlayingTrigger
+from pydantic import ValidationError
 
-# Import Triggers, Actions, Reactions
-from src.service.Trigger.time_trigger import TimeTrigger
+from src.config import (
+    async_redis_binary_client,
+    async_redis_client,
+    async_session_factory,
+    settings,
+)
+from src.service import metrics
+from src.service.components import REGISTRY
+from src.service.Queue.enqueue import EnqueueBuffer
+from src.service.Queue.envelope import TaskEnvelope, encode_task
+from src.service.Queue.factory import make_dead_letters, make_task_queue
+from src.service.Queue.retry import RetryPolicy, RetryScheduler
+from src.service.registry import ComponentKind
+from src.service.Scheduler.change_feed import AreaChangeFeed
+from src.service.Scheduler.checkpoint import TriggerCheckpointer
+from src.service.Scheduler.dedup import EventDeduplicator
+from src.service.Scheduler.limits import execution_limiter
+from src.service.Scheduler.scheduler import INTERVALS_KEY, TriggerScheduler
+from src.service.Scheduler.sharding import ShardCoordinator
+from src.service.Scheduler.tokens import TokenResolver
+from src.service.services.discord.gateway import bot_gateway
 from src.service.Trigger.triggers import Trigger
 from src.service.Worker.worker import Worker
 
@@ -64,106 +35,201 @@ from src.service.Worker.worker import Worker
 logging.basicConfig(level=logging.INFO)
 LOGGER = logging.getLogger(__name__)
 
-# Constants
-QUEUE_NAME = "task_queue"
+# Queue between the triggers and the worker (see QUEUE_BACKEND)
+TASK_QUEUE = make_task_queue(settings.queue, async_redis_binary_client)
+
+# Failed tasks waiting for a retry, and those out of retries
+RETRIES = RetryScheduler(
+    async_redis_binary_client,
+    TASK_QUEUE,
+    poll_interval=settings.queue.retry_poll_interval,
+    compress_threshold=settings.queue.compress_threshold,
+)
+DEAD_LETTERS = make_dead_letters(settings.queue, TASK_QUEUE, async_redis_binary_client)
+
+# Fingerprints of the events already enqueued (see Trigger.fingerprint)
+DEDUP = EventDeduplicator(
+    async_redis_client,
+    ttl=settings.scheduler.dedup_ttl,
+    pending_ttl=settings.scheduler.dedup_pending_ttl,
+)
+
+# Pipelined batches of the tasks fired by all runners
+ENQUEUE = EnqueueBuffer(
+    TASK_QUEUE,
+    max_batch=settings.queue.enqueue_batch,
+    max_delay=settings.queue.enqueue_delay,
+)
+
+# Placement keys of the areas sharing a resource (see Trigger.placement_key)
+PLACEMENTS: Dict[int, str] = {}
 
 # Global registry for active triggers
-ACTIVE_TRIGGERS: Dict[int, asyncio.Task] = {}
-
-# Dynamically Register All Components
-ALL_COMPONENTS = [
-    MessageUpdatedTrigger,
-    MessageUpdatedAction,
-    MemberRemovedTrigger,
-    MemberRemovedAction,
-    ChannelDeletedAction,
-    ChannelDeletedTrigger,
-    ChannelUpdatedAction,
-    ChannelUpdatedTrigger,
-    ChannelCreatedTrigger,
-    ChannelCreatedAction,
-    GuildRoleAddedTrigger,
-    GuildRoleAddedAction,
-    TrackPlayedAction,
-    OutlookTrigger,
-    GmailTrigger,
-    NewPushTrigger,
-    AddToPlaylistReaction,
-    CurrentlyPlayingTrigger,
-    TimeTrigger,
-    NewMessageInChannelTrigger,
-    NewMessageInChannelAction,
-    TimeAction,
-    PrintReaction,
-    SendMessage,
-    AddReaction,
-    DeleteMessage,
-    EditMessage,
-    AddToPlaylistReaction,
-    OutlookSendReaction,
-    GmailSendReaction,
-    CreateIssueReaction,
-    OutlookReceiveAction,
-    GmailReceiveAction,
-    NewPushAction,
-    HourlyTrigger,
-    DateTrigger,
-    Action,  # Temp Fix
-]
-
-
-async def refresh_triggers():
+ACTIVE_TRIGGERS: Dict[int, Trigger] = {}
+
+# Provider budgets declared on the trigger classes (see Trigger.rate_limit)
+LIMITER = execution_limiter
+
+# Batched writes of the trigger cursors (see Trigger.state_fields)
+CHECKPOINTS = TriggerCheckpointer(
+    async_session_factory, flush_interval=settings.scheduler.checkpoint_interval
+)
+
+# Cached OAuth tokens of the areas run by this process
+TOKENS = TokenResolver(
+    async_session_factory, async_redis_client, ttl=settings.scheduler.token_ttl
+)
+
+
+async def refresh_triggers(coordinator: ShardCoordinator):
     """
-    Periodically refresh triggers by checking for added or removed areas.
+    Keep the running triggers in sync with the database.
+
+    Each tick only fetches the areas created, updated or deleted since the
+    previous one (see AreaChangeFeed). Areas whose configuration changed have
+    their running trigger restarted. Only the areas owned by this process on
+    the scheduler hash ring are started (see ShardCoordinator), along with
+    the Discord gateway shards placed on it.
     """
-    global ACTIVE_TRIGGERS
+    feed = AreaChangeFeed(
+        async_session_factory, overlap=settings.scheduler.watermark_overlap
+    )
+    # Owned areas that could not be started for their current version
+    parked = set()
+    # Areas whose placement key could not be resolved yet
+    unplaced = {}
 
     while True:
         try:
-            async with async_session_factory() as session:
-                # Fetch all areas from the database
-                result = await session.execute(
-                    select(db_area).options(
-                        selectinload(db_area.trigger),
-                        selectinload(db_area.action),
-                        selectinload(db_area.reaction),
-                    )
-                )
-                current_areas = result.scalars().all()
+            if await coordinator.heartbeat():
+                parked.clear()
 
-            # Map current areas by their IDs for easy comparison
-            current_area_ids = {area.id for area in current_areas}
-            active_area_ids = set(ACTIVE_TRIGGERS.keys())
-
-            # Identify areas to start and stop
-            areas_to_start = [
-                area for area in current_areas if area.id not in active_area_ids
-            ]
-            areas_to_stop = active_area_ids - current_area_ids
+            changes = await feed.poll()
+            for area in [*changes.upserted, *unplaced.values()]:
+                await place_area(area, unplaced)
+            await assign_gateway_shards(coordinator)
 
             # Stop triggers for removed areas
-            for area_id in areas_to_stop:
-                LOGGER.info(f"Stopping trigger for removed Area ID {area_id}.")
-                task = ACTIVE_TRIGGERS.pop(area_id, None)
-                if task:
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        LOGGER.info(
-                            f"Trigger for Area ID {area_id} stopped successfully."
-                        )
-
-            # Start triggers for new areas
-            for area in areas_to_start:
-                LOGGER.info(f"Starting trigger for new Area ID {area.id}.")
-                await start_trigger(area)
+            for area_id in changes.deleted:
+                parked.discard(area_id)
+                unplaced.pop(area_id, None)
+                PLACEMENTS.pop(area_id, None)
+                if area_id in ACTIVE_TRIGGERS:
+                    LOGGER.info(f"Stopping trigger for removed Area ID {area_id}.")
+                    await stop_trigger(area_id)
+
+            # Stop the triggers of updated areas, they are restarted below
+            for area in changes.upserted:
+                parked.discard(area.id)
+                if area.id in ACTIVE_TRIGGERS:
+                    LOGGER.info(f"Restarting trigger for updated Area ID {area.id}.")
+                    await stop_trigger(area.id)
+
+            # Hand over the areas now owned by another process
+            for area_id in [
+                i for i in ACTIVE_TRIGGERS if not coordinator.owns(i, PLACEMENTS.get(i))
+            ]:
+                LOGGER.info(f"Handing over Area ID {area_id} to another node.")
+                await stop_trigger(area_id)
+
+            # Claim owned areas once the previous owners had time to let go
+            if coordinator.settled(settings.scheduler.handoff_delay):
+                wanted = {
+                    area_id
+                    for area_id in feed.known
+                    if coordinator.owns(area_id, PLACEMENTS.get(area_id))
+                    and area_id not in unplaced
+                    and area_id not in ACTIVE_TRIGGERS
+                    and area_id not in parked
+                }
+                areas = [area for area in changes.upserted if area.id in wanted]
+                areas += await feed.load(wanted - {area.id for area in areas})
+                await TOKENS.preload(areas)
+
+                for area in areas:
+                    LOGGER.info(f"Starting trigger for Area ID {area.id}.")
+                    await start_trigger(area)
+                    if area.id not in ACTIVE_TRIGGERS:
+                        parked.add(area.id)
+
+            await publish_intervals()
 
         except Exception as e:
             LOGGER.error(f"Error while refreshing triggers: {e}", exc_info=True)
 
-        # Wait for 1 minute before checking again
-        await asyncio.sleep(10)
+        await asyncio.sleep(settings.scheduler.refresh_interval)
+
+
+async def place_area(area, unplaced: Dict[int, object]):
+    """
+    Resolve the placement key of an area (see Trigger.placement_key). Areas
+    whose key cannot be resolved yet are kept in ``unplaced`` and left
+    unclaimed, so that they never run away from the resource they need.
+    """
+    placement: Optional[str] = None
+    trigger_class = None
+    if area.trigger and area.trigger.config:
+        trigger_class = REGISTRY.get_class(ComponentKind.TRIGGER, area.trigger.name)
+    try:
+        if trigger_class:
+            placement = await trigger_class.placement_key(area.trigger.config)
+    except Exception as e:
+        if area.id not in unplaced:
+            LOGGER.warning(f"Cannot place Area ID {area.id} yet: {e}")
+        unplaced[area.id] = area
+        return
+
+    unplaced.pop(area.id, None)
+    if placement:
+        PLACEMENTS[area.id] = placement
+    else:
+        PLACEMENTS.pop(area.id, None)
+
+
+async def assign_gateway_shards(coordinator: ShardCoordinator):
+    """
+    Run the Discord gateway shards this process owns on the hash ring, so
+    that it only receives the events of the guilds its areas watch.
+    """
+    gateway = bot_gateway()
+    if gateway is not None:
+        await gateway.assign_owned(coordinator, settings.scheduler.handoff_delay)
+
+
+async def publish_intervals():
+    """
+    Publish the effective polling interval of every running trigger, so the
+    API can show it (see Trigger.next_interval).
+    """
+    if not ACTIVE_TRIGGERS:
+        return
+    await async_redis_client.hset(
+        INTERVALS_KEY,
+        mapping={
+            area_id: round(trigger.effective_interval, 1)
+            for area_id, trigger in ACTIVE_TRIGGERS.items()
+        },
+    )
+
+
+async def stop_trigger(area_id: int):
+    """
+    Stop the trigger of the given area, if any.
+    """
+    trigger_instance = ACTIVE_TRIGGERS.pop(area_id, None)
+    if not trigger_instance:
+        return
+
+    SCHEDULER.remove(area_id)
+    try:
+        await trigger_instance.close()
+    except Exception as e:
+        LOGGER.error(f"Failed to close trigger of Area ID {area_id}: {e}")
+    try:
+        await async_redis_client.hdel(INTERVALS_KEY, area_id)
+    except Exception as e:
+        LOGGER.error(f"Failed to unpublish interval of Area ID {area_id}: {e}")
+    LOGGER.info(f"Trigger for Area ID {area_id} stopped successfully.")
 
 
 async def start_trigger(area):
@@ -174,14 +240,11 @@ async def start_trigger(area):
         LOGGER.warning(f"Trigger loop already running for Area ID {area.id}. Skipping.")
         return
 
-    trigger_class = next(
-        (
-            cls
-            for cls in ALL_COMPONENTS
-            if issubclass(cls, Trigger) and cls.name == area.trigger.name
-        ),
-        None,
-    )
+    if not area.trigger:
+        LOGGER.info(f"Area ID {area.id} has no trigger yet. Skipping.")
+        return
+
+    trigger_class = REGISTRY.get_class(ComponentKind.TRIGGER, area.trigger.name)
     if not trigger_class:
         LOGGER.error(
             f"No trigger class found for trigger '{area.trigger.name}' in Area ID {area.id}."
@@ -195,16 +258,7 @@ async def start_trigger(area):
             )
             return
 
-        async with async_session_factory() as session:
-            user_service = await session.scalar(
-                select(UserService).where(
-                    UserService.user_id == area.user_id,
-                    UserService.service_id == area.action.service_id,
-                )
-            )
-        token : Optional[str] = None
-        if user_service and user_service.access_token:
-            token = user_service.access_token
+        token = await TOKENS.get(area.user_id, area.action.service_id)
 
         trigger_config_with_token = {
             **area.trigger.config,
@@ -213,9 +267,15 @@ async def start_trigger(area):
         validated_config = trigger_class.config(**trigger_config_with_token)
         trigger_instance = trigger_class(validated_config)
 
-        task = asyncio.create_task(trigger_runner(trigger_instance, area))
-        ACTIVE_TRIGGERS[area.id] = task
-        LOGGER.info(f"Trigger loop started for Area ID {area.id}.")
+        # Resume from the last checkpointed cursor
+        trigger_instance.load_state(area.trigger.state)
+        CHECKPOINTS.restore(area.trigger.id, area.trigger.state)
+
+        SCHEDULER.add(
+            area, trigger_instance, delay=_resume_delay(area, trigger_instance)
+        )
+        ACTIVE_TRIGGERS[area.id] = trigger_instance
+        LOGGER.info(f"Trigger started for Area ID {area.id}.")
 
     except ValidationError as e:
         LOGGER.error(f"Invalid trigger configuration for Area ID {area.id}: {e}")
@@ -225,32 +285,16 @@ async def start_trigger(area):
         )
 
 
-def register_components(worker: Worker):
-    for component in ALL_COMPONENTS:
-        try:
-            if not hasattr(component, "config"):
-                raise ValueError(
-                    f"{component.__name__} is missing a `config` attribute."
-                )
-            if issubclass(component, Trigger):
-                print(component.__name__)
-
-                worker.register_trigger(
-                    component.name, {"class": component, "config": component.config}
-                )
-                LOGGER.info(f"Registered trigger: {component.name}")
-            elif issubclass(component, Action):
-                worker.register_action(
-                    component.name, {"class": component, "config": component.config}
-                )
-                LOGGER.info(f"Registered action: {component.name}")
-            elif issubclass(component, Reaction):
-                worker.register_reaction(
-                    component.name, {"class": component, "config": component.config}
-                )
-                LOGGER.info(f"Registered reaction: {component.name}")
-        except Exception as e:
-            LOGGER.error(f"Failed to register component {component.__name__}: {e}")
+def _resume_delay(area, trigger_instance: Trigger) -> float:
+    """
+    Time left before the first evaluation of a restarted trigger, so that a
+    restart does not evaluate every area at once.
+    """
+    if not area.trigger.last_run:
+        return 0.0
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    elapsed = (now - area.trigger.last_run).total_seconds()
+    return max(0.0, trigger_instance.effective_interval - elapsed)
 
 
 async def test_redis_connection():
@@ -279,170 +323,220 @@ def to_serializable(obj):
         return obj  # Base case: return the object as-is if it's already primitive
 
 
-async def trigger_runner(trigger_instance: Trigger, area):
+async def run_trigger_once(trigger_instance: Trigger, area) -> float:
     """
-    Run a trigger instance in a loop and send events to Redis when triggered.
+    Evaluate a trigger once and send its event to Redis when triggered.
 
-    This version fetches two tokens:
-      - Action token (for area.action.service_id) --> injected into action config
-      - Reaction token (for area.reaction.service_id) --> injected into reaction config
-    """
-    LOGGER.info(f"Starting trigger {trigger_instance.name} for Area ID {area.id}")
+    The task only references the area and the action and reaction services;
+    the worker resolves their configs and tokens (see Worker._resolve).
 
-    while True:
-        try:
-            # Execute the trigger and fetch event data
+    :return: Seconds to wait before evaluating the trigger again.
+    """
+    try:
+        # Execute the trigger within its provider budget and fetch event data
+        async with LIMITER.limit(trigger_instance):
+            started_at = time.perf_counter()
             event_data = await trigger_instance.execute()
-            LOGGER.debug(f"Raw Event Data: {event_data}")
-
-            if event_data:
-                # Serialize event_data to ensure compatibility
-                if hasattr(event_data, "model_dump"):
-                    serialized_event_data = event_data.model_dump()
-                else:
-                    serialized_event_data = to_serializable(event_data)
-
-                # Merge event data and the existing reaction_config (if needed later)
-                reaction_params = {
-                    **serialized_event_data,
-                    **(area.reaction_config or {}),
-                }
-
-                # Fetch the user tokens for both the Action and Reaction services
-                async with async_session_factory() as session:
-                    # Action token
-                    action_user_service = await session.scalar(
-                        select(UserService).where(
-                            UserService.user_id == area.user_id,
-                            UserService.service_id == area.action.service_id,
-                        )
-                    )
-
-                    # Reaction token
-                    reaction_user_service = await session.scalar(
-                        select(UserService).where(
-                            UserService.user_id == area.user_id,
-                            UserService.service_id == area.reaction.service_id,
-                        )
-                    )
-
-                # Build the job/task payload
-                task = {
-                    # Trigger info
-                    "trigger": {"name": trigger_instance.name},
-                    # Action details
-                    "action": {
-                        "name": area.action.name,
-                        # Extract the needed params from event data + area.action_config
-                        "params": _extract_action_params(
-                            serialized_event_data, area.action_config
-                        ),
-                        # Inject the action token into the action's config
-                        "config": {
-                            **(area.action_config or {}),
-                            "token": (
-                                action_user_service.access_token
-                                if action_user_service
-                                else None
-                            ),
-                        },
-                    },
-                    # Reaction details
-                    "reaction": {
-                        "name": area.reaction.name,
-                        # You could include reaction params if needed,
-                        # or keep them separate from 'config':
-                        "params": reaction_params,
-                        # Inject the reaction token into the reaction's config
-                        "config": {
-                            **(area.reaction_config or {}),
-                            "token": (
-                                reaction_user_service.access_token
-                                if reaction_user_service
-                                else None
-                            ),
-                        },
-                    },
-                    # The original (serialized) event data
-                    "event_data": serialized_event_data,
-                }
-
-                LOGGER.info(f"Task to enqueue: {task}")
+        fired_at = time.time()
+        metrics.TRIGGER_DURATION.labels(trigger_instance.name).observe(
+            time.perf_counter() - started_at
+        )
+        LOGGER.debug(f"Raw Event Data: {event_data}")
+
+        if event_data:
+            # Serialize event_data to ensure compatibility
+            if hasattr(event_data, "model_dump"):
+                serialized_event_data = event_data.model_dump()
+            else:
+                serialized_event_data = to_serializable(event_data)
+
+            # Drop the events already enqueued, e.g. before a restart
+            fingerprint = trigger_instance.fingerprint(serialized_event_data)
+            if fingerprint and not await DEDUP.claim(
+                area.id, trigger_instance.name, fingerprint
+            ):
+                LOGGER.info(f"Dropped duplicate event for Area ID {area.id}")
+                metrics.TRIGGER_RUNS.labels(trigger_instance.name, "duplicate").inc()
+                CHECKPOINTS.mark(area.trigger.id, trigger_instance)
+                return trigger_instance.next_interval(False)
+
+            # The event travels once; the worker resolves the area's configs
+            # and the user's tokens from their ids (see TaskEnvelope)
+            envelope = TaskEnvelope(
+                trigger=trigger_instance.name,
+                action=area.action.name,
+                reaction=area.reaction.name,
+                event=serialized_event_data,
+                enqueued_at=time.time(),
+                fired_at=fired_at,
+                area_id=area.id,
+                area_revision=area.updated_at.timestamp() if area.updated_at else None,
+                user_id=area.user_id,
+                action_service_id=area.action.service_id,
+                reaction_service_id=area.reaction.service_id,
+            )
+            LOGGER.debug(f"Task to enqueue: {envelope}")
+
+            # Enqueue the task in the user's share of the trigger's lane
+            try:
+                await ENQUEUE.push(
+                    encode_task(envelope, settings.queue.compress_threshold),
+                    tenant=area.user_id,
+                    lane=trigger_instance.lane,
+                )
+            except (Exception, asyncio.CancelledError):
+                # Let the event through when the trigger emits it again
+                if fingerprint:
+                    await DEDUP.release(area.id, fingerprint)
+                raise
+            if fingerprint:
+                await DEDUP.confirm(area.id, fingerprint)
+            metrics.observe_stage(
+                "enqueue",
+                envelope.trigger,
+                envelope.action,
+                envelope.reaction,
+                fired_at,
+                time.time(),
+            )
+            LOGGER.info(f"Task enqueued successfully for Area ID {area.id}")
 
-                # Enqueue the task to the Redis queue
-                await async_redis_client.lpush(QUEUE_NAME, json.dumps(task))
-                LOGGER.info(f"Task enqueued successfully for Area ID {area.id}")
+        # Only checkpoint the cursor once its event is safely enqueued
+        CHECKPOINTS.mark(area.trigger.id, trigger_instance, fired=bool(event_data))
+        metrics.TRIGGER_RUNS.labels(
+            trigger_instance.name, "fired" if event_data else "idle"
+        ).inc()
 
-            # Wait for the next interval
-            await asyncio.sleep(getattr(trigger_instance.config, "interval", 60))
+        # Wait for the next interval (see Trigger.next_interval)
+        return trigger_instance.next_interval(bool(event_data))
 
-        except Exception as e:
-            LOGGER.error(
-                f"Error in trigger_runner for {trigger_instance.name}: {e}",
-                exc_info=True,
-            )
-            # Sleep briefly to avoid rapid retries on repeated failures
-            await asyncio.sleep(60)
+    except Exception as e:
+        LOGGER.error(
+            f"Error running trigger {trigger_instance.name} "
+            f"for Area ID {area.id}: {e}",
+            exc_info=True,
+        )
+        metrics.TRIGGER_RUNS.labels(trigger_instance.name, "error").inc()
+        # Back off to avoid rapid retries on repeated failures
+        return trigger_instance.failure_interval()
 
 
-def _extract_action_params(event_data: dict, config_model: BaseModel):
-    """
-    Dynamically map event_data into the action's params structure based on the config model.
-    """
-    try:
-        if hasattr(config_model, "__annotations__"):
-            expected_fields = config_model.__annotations__.keys()
-            return {
-                key: event_data.get(key) for key in expected_fields if key in event_data
-            }
-        return event_data
-    except Exception as e:
-        LOGGER.error(f"Failed to extract action params: {e}", exc_info=True)
-        return {}
+# Central timer heap running every trigger
+SCHEDULER = TriggerScheduler(
+    run_trigger_once,
+    workers=settings.scheduler.workers,
+    lateness_warning=settings.scheduler.lateness_warning,
+)
 
 
 async def stop_all_triggers():
     """
-    Stop all active trigger loops.
+    Stop all active triggers.
     """
     LOGGER.info("Stopping all active triggers...")
-    for area_id, task in ACTIVE_TRIGGERS.items():
-        task.cancel()
-        try:
-            await task
-        except asyncio.CancelledError:
-            LOGGER.info(f"Trigger loop for Area ID {area_id} stopped successfully.")
-    ACTIVE_TRIGGERS.clear()
+    for area_id in list(ACTIVE_TRIGGERS):
+        await stop_trigger(area_id)
+    await CHECKPOINTS.flush()
 
 
 async def main():
     """
     Main function to initialize and start the worker and trigger management.
     """
+    coordinator = ShardCoordinator(
+        async_redis_client,
+        node_name=settings.scheduler.node_name,
+        lease_ttl=settings.scheduler.lease_ttl,
+    )
+
+    metrics.start_metrics_server(settings.metrics.port)
+
     try:
         worker = Worker(
-            queue_name=QUEUE_NAME,
-            redis_client=async_redis_client,
+            queue=TASK_QUEUE,
             session_factory=async_session_factory,
+            registry=REGISTRY,
+            tokens=TOKENS,
+            retries=RETRIES,
+            dead_letters=DEAD_LETTERS,
+            retry_policy=RetryPolicy(
+                max_attempts=settings.worker.retry_max_attempts,
+                base_delay=settings.worker.retry_base_delay,
+                max_delay=settings.worker.retry_max_delay,
+            ),
+            batch_size=settings.worker.batch_size,
+            concurrency=settings.worker.concurrency,
+            prefetch=settings.worker.prefetch,
+            reaction_concurrency=settings.worker.reaction_concurrency,
+            drain_timeout=settings.worker.drain_timeout,
+            cache_size=settings.worker.cache_size,
         )
 
-        register_components(worker)
-
         LOGGER.info("Starting the worker...")
         worker_task = asyncio.create_task(worker.listen())
 
-        LOGGER.info("Starting trigger manager...")
-        trigger_manager_task = asyncio.create_task(refresh_triggers())
+        LOGGER.info("Starting task enqueue buffer...")
+        enqueue_task = asyncio.create_task(ENQUEUE.run())
+
+        LOGGER.info("Starting retry promoter...")
+        retries_task = asyncio.create_task(RETRIES.run())
+
+        LOGGER.info("Starting trigger scheduler...")
+        scheduler_task = asyncio.create_task(SCHEDULER.run())
 
-        # Wait for both tasks to complete
-        await asyncio.gather(worker_task, trigger_manager_task)
+        LOGGER.info("Starting token invalidation listener...")
+        tokens_task = asyncio.create_task(TOKENS.listen())
 
-    except KeyboardInterrupt:
-        LOGGER.info("KeyboardInterrupt received. Stopping all triggers...")
+        LOGGER.info("Starting trigger checkpointer...")
+        checkpoint_task = asyncio.create_task(CHECKPOINTS.run())
+
+        LOGGER.info("Starting queue metrics sampler...")
+        metrics_task = asyncio.create_task(
+            metrics.sample_gauges(
+                TASK_QUEUE, RETRIES, DEAD_LETTERS, settings.metrics.sample_interval
+            )
+        )
+
+        LOGGER.info("Starting trigger manager...")
+        trigger_manager_task = asyncio.create_task(refresh_triggers(coordinator))
+
+        # Run until a task stops or a shutdown signal is received
+        shutdown = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, shutdown.set)
+        shutdown_task = asyncio.create_task(shutdown.wait())
+        producers = [scheduler_task, tokens_task, trigger_manager_task, retries_task]
+        await asyncio.wait(
+            [worker_task, enqueue_task, checkpoint_task, shutdown_task, *producers],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        LOGGER.info("Shutting down...")
+        shutdown_task.cancel()
+
+        # Stop producing events first, then let the worker drain its tasks
+        for task in producers:
+            task.cancel()
         await stop_all_triggers()
+        # Write the tasks still buffered before the worker's last pops
+        enqueue_task.cancel()
+        results = await asyncio.gather(enqueue_task, return_exceptions=True)
+        worker.stop()
+        results += await asyncio.gather(worker_task, return_exceptions=True)
+        checkpoint_task.cancel()
+        metrics_task.cancel()
+        results += await asyncio.gather(
+            *producers, checkpoint_task, metrics_task, return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                LOGGER.error(f"Task failed: {result}", exc_info=result)
+
     except Exception as e:
         LOGGER.error(f"Unexpected error in main: {e}", exc_info=True)
         await stop_all_triggers()
+    finally:
+        await coordinator.leave()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Optional
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+if TYPE_CHECKING:
+    import aiohttp
+
+LOGGER = logging.getLogger(__name__)
+
+# Buckets (s) of the pipeline stages, from a cached config to a slow provider
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+# Triggers
+TRIGGER_RUNS = Counter(
+    "area_trigger_runs_total",
+    "Trigger evaluations by outcome (fired, idle, duplicate, error).",
+    ["trigger", "outcome"],
+)
+TRIGGER_DURATION = Histogram(
+    "area_trigger_duration_seconds",
+    "Time spent in Trigger.execute, provider limits excluded.",
+    ["trigger"],
+    buckets=LATENCY_BUCKETS,
+)
+SCHEDULER_LATENESS = Histogram(
+    "area_scheduler_lateness_seconds",
+    "Delay between a trigger's due time and its dispatch.",
+    buckets=LATENCY_BUCKETS,
+)
+LIMITER_WAIT = Histogram(
+    "area_limiter_wait_seconds",
+    "Time trigger executions waited for their provider budget.",
+    ["provider"],
+    buckets=LATENCY_BUCKETS,
+)
+DUPLICATES_DROPPED = Counter(
+    "area_duplicate_events_total",
+    "Events dropped because they were already enqueued.",
+    ["trigger"],
+)
+
+# Tasks, through their pipeline stages (see TaskEnvelope):
+#   enqueue    trigger fire -> written to the queue
+#   queue      written to the queue -> popped by a worker
+#   action     popped -> action done
+#   reaction   action done -> reaction done
+#   end_to_end trigger fire -> reaction done
+TASK_STAGE = Histogram(
+    "area_task_stage_seconds",
+    "Time a task spent in each stage of the pipeline.",
+    ["stage", "trigger", "action", "reaction"],
+    buckets=LATENCY_BUCKETS,
+)
+TASKS = Counter(
+    "area_tasks_total",
+    "Processed tasks by outcome (success, retried, dead_lettered).",
+    ["trigger", "action", "reaction", "outcome"],
+)
+ENQUEUE_BATCH = Histogram(
+    "area_enqueue_batch_size",
+    "Tasks written per pipelined enqueue round trip.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+QUEUE_DEPTH = Gauge(
+    "area_queue_depth",
+    "Tasks waiting in the task queue, per lane for the fair backend.",
+    ["queue", "lane"],
+)
+RETRY_DEPTH = Gauge("area_retry_scheduled", "Failed tasks waiting for a retry.")
+DEAD_LETTER_DEPTH = Gauge("area_dead_letters", "Tasks that failed for good.")
+WORKER_IN_FLIGHT = Gauge("area_worker_in_flight", "Tasks being processed.")
+WORKER_BUFFERED = Gauge(
+    "area_worker_buffered", "Popped tasks waiting for a worker consumer."
+)
+INSTANCE_CACHE = Counter(
+    "area_instance_cache_total",
+    "Lookups of configured action and reaction instances (hit, miss).",
+    ["result"],
+)
+
+# Provider API clients
+PROVIDER_REQUESTS = Counter(
+    "area_provider_requests_total",
+    "HTTP requests sent to the providers, by response status.",
+    ["provider", "method", "status"],
+)
+PROVIDER_LATENCY = Histogram(
+    "area_provider_request_seconds",
+    "Duration of the HTTP requests sent to the providers.",
+    ["provider", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+DISCORD_GATEWAY_BYTES = Counter(
+    "area_discord_gateway_bytes_total",
+    "Discord gateway traffic, as received (wire) and once inflated (decoded).",
+    ["kind"],
+)
+DISCORD_GATEWAY_DROPPED = Counter(
+    "area_discord_gateway_dropped_total",
+    "Discord dispatches dropped undecoded because no trigger needs them.",
+    ["event"],
+)
+DISCORD_GATEWAY_SESSIONS = Counter(
+    "area_discord_gateway_sessions_total",
+    "Discord gateway sessions started (identify) and resumed (resume).",
+    ["kind"],
+)
+DISCORD_BUS_EVENTS = Counter(
+    "area_discord_bus_events_total",
+    "Discord dispatches on the Redis Streams (published, consumed, skipped).",
+    ["event", "direction"],
+)
+
+# Web API
+HTTP_REQUESTS = Counter(
+    "area_http_requests_total",
+    "Requests served by the web API, by route and response status.",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "area_http_request_seconds",
+    "Duration of the requests served by the web API.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def observe_stage(
+    stage: str,
+    trigger: str,
+    action: str,
+    reaction: str,
+    start: Optional[float],
+    end: float,
+):
+    """
+    Record the duration of a pipeline stage of a task, skipped when its start
+    was not stamped (e.g. tasks enqueued by an older release).
+    """
+    if not isinstance(start, (int, float)):
+        return
+    TASK_STAGE.labels(stage, trigger, action, reaction).observe(max(end - start, 0))
+
+
+def provider_trace(provider: str) -> "aiohttp.TraceConfig":
+    """
+    Trace config recording the requests of an ``aiohttp.ClientSession``::
+
+        aiohttp.ClientSession(trace_configs=[provider_trace("github")])
+    """
+    # Imported here, the web API imports this module for the metrics only
+    import aiohttp
+
+    trace = aiohttp.TraceConfig(trace_config_ctx_factory=SimpleNamespace)
+
+    async def on_start(session, context, params):
+        context.started_at = time.perf_counter()
+
+    async def on_end(session, context, params):
+        _observe_request(provider, params.method, params.response.status, context)
+
+    async def on_exception(session, context, params):
+        _observe_request(provider, params.method, "error", context)
+
+    trace.on_request_start.append(on_start)
+    trace.on_request_end.append(on_end)
+    trace.on_request_exception.append(on_exception)
+    return trace
+
+
+def _observe_request(provider: str, method: str, status, context):
+    PROVIDER_REQUESTS.labels(provider, method, str(status)).inc()
+    started_at = getattr(context, "started_at", None)
+    if started_at is not None:
+        PROVIDER_LATENCY.labels(provider, method).observe(
+            time.perf_counter() - started_at
+        )
+
+
+def start_metrics_server(port: Optional[int]):
+    """
+    Serve ``/metrics`` on ``port`` from a background thread, None to disable.
+    """
+    if port is None:
+        return
+    start_http_server(port)
+    LOGGER.info(f"Serving Prometheus metrics on port {port}.")
+
+
+async def sample_gauges(queue, retries=None, dead_letters=None, interval=15.0):
+    """
+    Refresh the gauges read from Redis (queue, retries and dead letters
+    depths) every ``interval`` seconds until cancelled.
+    """
+    while True:
+        try:
+            stats = await queue.stats()
+            lanes = stats.get("lanes")
+            if lanes:
+                for lane, lane_stats in lanes.items():
+                    QUEUE_DEPTH.labels(queue.name, lane).set(lane_stats["depth"])
+            else:
+                QUEUE_DEPTH.labels(queue.name, "").set(stats["depth"])
+            if retries is not None:
+                RETRY_DEPTH.set((await retries.stats())["scheduled"])
+            if dead_letters is not None:
+                DEAD_LETTER_DEPTH.set(await dead_letters.count())
+        except Exception as e:
+            LOGGER.error(f"Failed to sample queue metrics: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,161 @@
+import importlib
+import inspect
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ComponentKind(str, Enum):
+    TRIGGER = "trigger"
+    ACTION = "action"
+    REACTION = "reaction"
+
+
+@dataclass(frozen=True)
+class ComponentSpec:
+    """
+    Declaration of a component: its kind, name and ``"module:Class"`` path.
+    """
+
+    kind: ComponentKind
+    name: str
+    target: str
+
+
+@dataclass(frozen=True)
+class Component:
+    """
+    A loaded trigger, action or reaction.
+    """
+
+    kind: ComponentKind
+    name: str
+    cls: type
+    config: Type[BaseModel]
+
+
+def base_class(kind: ComponentKind) -> type:
+    """
+    Base class of the given kind of component, imported on demand.
+    """
+    if kind == ComponentKind.TRIGGER:
+        from src.service.Trigger.triggers import Trigger
+
+        return Trigger
+    if kind == ComponentKind.ACTION:
+        from src.service.Action.actions import Action
+
+        return Action
+    from src.service.Reaction.reactions import Reaction
+
+    return Reaction
+
+
+class ComponentRegistry:
+    """
+    Index of the components by (kind, name).
+
+    The index is built from the specs alone; a component's module is imported
+    the first time it is looked up, and the result is kept. Specs reusing a
+    (kind, name) keep the first one. Targets that fail to import or do not
+    define a valid component are skipped. Each of these is recorded in
+    ``problems`` and logged.
+    """
+
+    def __init__(self, specs: Iterable[ComponentSpec]):
+        self._specs: Dict[Tuple[ComponentKind, str], ComponentSpec] = {}
+        self._loaded: Dict[Tuple[ComponentKind, str], Optional[Component]] = {}
+        self.problems: List[str] = []
+        for spec in specs:
+            key = (spec.kind, spec.name)
+            existing = self._specs.get(key)
+            if existing is None:
+                self._specs[key] = spec
+            elif existing.target == spec.target:
+                self.problems.append(f"{spec.target} is listed more than once.")
+            else:
+                self.problems.append(
+                    f"{spec.target} shadows {existing.target} as {spec.kind.value} "
+                    f"'{spec.name}' and was ignored."
+                )
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def names(self, kind: ComponentKind) -> List[str]:
+        """
+        Names of the declared components of a kind, without importing them.
+        """
+        return [name for spec_kind, name in self._specs if spec_kind == kind]
+
+    def get(self, kind: ComponentKind, name: str) -> Optional[Component]:
+        """
+        Return the component of the given kind and name, importing it if
+        needed, or None if it is unknown or invalid.
+        """
+        key = (ComponentKind(kind), name)
+        if key in self._loaded:
+            return self._loaded[key]
+        spec = self._specs.get(key)
+        if spec is None:
+            return None
+
+        component = self._load(spec)
+        self._loaded[key] = component
+        return component
+
+    def get_class(self, kind: ComponentKind, name: str) -> Optional[type]:
+        component = self.get(kind, name)
+        return component.cls if component else None
+
+    def of_kind(self, kind: ComponentKind) -> List[Component]:
+        """
+        Every valid component of a kind; imports all of them.
+        """
+        components = (self.get(kind, name) for name in self.names(kind))
+        return [component for component in components if component]
+
+    def report(self):
+        """
+        Log the problems found so far.
+        """
+        for problem in self.problems:
+            LOGGER.warning(f"Component registry: {problem}")
+        LOGGER.info(
+            f"Component registry: {len(self)} components declared, "
+            f"{len(self.problems)} problems."
+        )
+
+    def _load(self, spec: ComponentSpec) -> Optional[Component]:
+        module_name, _, attribute = spec.target.partition(":")
+        try:
+            cls = getattr(importlib.import_module(module_name), attribute)
+        except (ImportError, AttributeError) as e:
+            return self._invalid(f"{spec.target} could not be imported: {e}")
+
+        if not (isinstance(cls, type) and issubclass(cls, base_class(spec.kind))):
+            return self._invalid(f"{spec.target} is not a {spec.kind.value}.")
+        # The base class itself stands for a generic component whose config
+        # template clients fetch (e.g. ``generic_action``)
+        if inspect.isabstract(cls) and cls is not base_class(spec.kind):
+            return self._invalid(f"{spec.target} is abstract.")
+        if getattr(cls, "name", None) != spec.name:
+            return self._invalid(
+                f"{spec.target} is named '{cls.name}', declared as '{spec.name}'."
+            )
+        config = getattr(cls, "config", None)
+        if not (isinstance(config, type) and issubclass(config, BaseModel)):
+            return self._invalid(f"{spec.target} has no valid `config` model.")
+
+        LOGGER.debug(f"Loaded {spec.kind.value} '{spec.name}' from {spec.target}.")
+        return Component(spec.kind, spec.name, cls, config)
+
+    def _invalid(self, problem: str) -> None:
+        self.problems.append(problem)
+        LOGGER.error(f"Component registry: {problem}")
+        return None
@@ -0,0 +1,223 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from typing import Callable, List, Optional, Set, Tuple
+
+from redis.exceptions import ResponseError
+from src.service import metrics
+
+from .sharding import shard_of
+
+LOGGER = logging.getLogger(__name__)
+
+STREAM_PREFIX = "discord:events"
+
+# Field of the stream entries holding the dispatch payload
+DATA_FIELD = "data"
+
+
+def stream_key(event_type: str, shard_id: int) -> str:
+    """
+    Stream of the ``event_type`` dispatches received by a shard, e.g.
+    ``discord:events:MESSAGE_CREATE:3``.
+    """
+    return f"{STREAM_PREFIX}:{event_type}:{shard_id}"
+
+
+class EventPublisher:
+    """
+    Writes the dispatches received by a gateway-ingest process to their
+    Redis Stream, one per event type and shard, each capped to about
+    ``maxlen`` entries.
+
+    ``publish`` is called from the gateway sessions and only buffers the
+    event; ``run`` writes the buffered events with one pipelined round trip.
+    """
+
+    def __init__(self, redis_client, num_shards: int = 1, maxlen: int = 10_000):
+        """
+        :param redis_client: Async Redis client.
+        :param num_shards: Shards the bot's guilds are split across.
+        :param maxlen: Approximate maximum length of each stream.
+        """
+        self.redis_client = redis_client
+        self.num_shards = num_shards
+        self.maxlen = maxlen
+        self.pending: List[Tuple[str, str, str]] = []
+        self._wake = asyncio.Event()
+
+    def publish(self, event_type: str, data: dict):
+        guild_id = data.get("guild_id")
+        # Direct messages are only sent to shard 0
+        shard_id = shard_of(guild_id, self.num_shards) if guild_id else 0
+        self.pending.append(
+            (event_type, stream_key(event_type, shard_id), json.dumps(data))
+        )
+        self._wake.set()
+
+    async def run(self):
+        """
+        Write the buffered events until cancelled.
+        """
+        LOGGER.info(f"Publishing Discord dispatches to {STREAM_PREFIX}:*.")
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        """
+        Write the buffered events, e.g. once the sessions are closed.
+        """
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for _, key, payload in batch:
+                pipe.xadd(
+                    key, {DATA_FIELD: payload}, maxlen=self.maxlen, approximate=True
+                )
+            await pipe.execute()
+        except Exception as e:
+            LOGGER.error(f"Failed to publish {len(batch)} Discord dispatches: {e}")
+            return
+        for event_type, _, _ in batch:
+            metrics.DISCORD_BUS_EVENTS.labels(event_type, "published").inc()
+
+
+class StreamReader:
+    """
+    Reads the dispatches a shard published to the Redis Streams, in place of
+    a gateway session of that shard (see DiscordGateway).
+
+    The streams of the subscribed event types are read through a consumer
+    group shared by the service processes; only the process owning the shard
+    reads them, so the group's cursor carries over when the shard changes
+    hands. Entries are acknowledged once routed, and those older than
+    ``max_age`` seconds are skipped, e.g. a backlog left by a shard that was
+    not read for a while.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        shard_id: int,
+        on_dispatch: Callable[[str, dict], None],
+        dispatch_types: Optional[Set[str]] = None,
+        group: str = "triggers",
+        consumer: Optional[str] = None,
+        block_timeout: float = 2.0,
+        batch_size: int = 100,
+        max_age: float = 300.0,
+        retry_delay: float = 5.0,
+    ):
+        """
+        :param redis_client: Async Redis client, decoded replies.
+        :param shard_id: Shard whose streams are read.
+        :param on_dispatch: Called with each event type and payload.
+        :param dispatch_types: Event types read.
+        :param group: Consumer group shared by the service processes.
+        :param consumer: Unique name of this consumer, defaults to host-pid.
+        :param block_timeout: Seconds a blocking read waits for an event,
+            and before newly subscribed event types are read.
+        :param batch_size: Entries read per stream and round trip.
+        :param max_age: Seconds after which an entry is skipped.
+        :param retry_delay: Seconds before reading again after an error.
+        """
+        self.redis_client = redis_client
+        self.shard_id = shard_id
+        self.on_dispatch = on_dispatch
+        self.dispatch_types = dispatch_types or set()
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.block_timeout = block_timeout
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.retry_delay = retry_delay
+        # Unused, kept for the DiscordGateway sessions interface
+        self.intents = 0
+        # Streams whose consumer group exists
+        self._ready: Set[str] = set()
+        self._closed = False
+
+    async def run(self):
+        """
+        Route the published events until closed.
+        """
+        self._closed = False
+        while not self._closed:
+            streams = {
+                stream_key(event_type, self.shard_id): event_type
+                for event_type in self.dispatch_types
+            }
+            if not streams:
+                await asyncio.sleep(self.block_timeout)
+                continue
+            try:
+                for key in streams.keys() - self._ready:
+                    await self._ensure_group(key)
+                result = await self.redis_client.xreadgroup(
+                    self.group,
+                    self.consumer,
+                    {key: ">" for key in streams},
+                    count=self.batch_size,
+                    block=int(self.block_timeout * 1000),
+                )
+                for key, entries in result or []:
+                    self._route(streams[key], entries)
+                    await self.redis_client.xack(
+                        key, self.group, *[entry_id for entry_id, _ in entries]
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # e.g. NOGROUP, the stream was deleted behind our back
+                LOGGER.error(f"Failed to read Discord shard {self.shard_id}: {e}")
+                self._ready.clear()
+                await asyncio.sleep(self.retry_delay)
+
+    async def reidentify(self):
+        """
+        Nothing to do, new event types are read from the next read on.
+        """
+
+    async def close(self):
+        self._closed = True
+        for key in self._ready:
+            try:
+                await self.redis_client.xgroup_delconsumer(
+                    key, self.group, self.consumer
+                )
+            except Exception as e:
+                LOGGER.warning(f"Failed to leave consumer group of {key}: {e}")
+        self._ready.clear()
+
+    async def _ensure_group(self, key: str):
+        try:
+            # New groups start at the tail, the backlog is stale anyway
+            await self.redis_client.xgroup_create(
+                key, self.group, id="$", mkstream=True
+            )
+            LOGGER.info(f"Created consumer group {self.group} on {key}.")
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._ready.add(key)
+
+    def _route(self, event_type: str, entries):
+        oldest = (time.time() - self.max_age) * 1000
+        for entry_id, fields in entries:
+            if not fields or int(entry_id.split("-")[0]) < oldest:
+                metrics.DISCORD_BUS_EVENTS.labels(event_type, "skipped").inc()
+                continue
+            try:
+                data = json.loads(fields[DATA_FIELD])
+            except (KeyError, ValueError) as e:
+                LOGGER.error(f"Malformed Discord dispatch {entry_id}: {e}")
+                continue
+            metrics.DISCORD_BUS_EVENTS.labels(event_type, "consumed").inc()
+            self.on_dispatch(event_type, data)
@@ -1,60 +1,163 @@
 import asyncio
 import json
 import logging
+import random
+import re
+import time
+import zlib
+from typing import Callable, Optional, Set, Tuple, Union
 
 import aiohttp
 import websockets
 
+from src.service import metrics
+from src.service.metrics import provider_trace
+
 # Logging setup
 logging.basicConfig(level=logging.DEBUG)
 LOGGER = logging.getLogger(__name__)
 
+# Request counts and latencies of this client (see src.service.metrics)
+TRACE_CONFIGS = [provider_trace("discord")]
+
+GATEWAY_URL = "wss://gateway.discord.gg"
+GATEWAY_VERSION = 10
+
+# Gateway opcodes
+DISPATCH = 0
+HEARTBEAT = 1
+IDENTIFY = 2
+RESUME = 6
+RECONNECT = 7
+INVALID_SESSION = 9
+HELLO = 10
+HEARTBEAT_ACK = 11
+
+# Close codes after which reconnecting is pointless (authentication failed,
+# invalid shard or intents...), and those after which the session is lost
+FATAL_CLOSE_CODES = {4004, 4010, 4011, 4012, 4013, 4014}
+RESET_CLOSE_CODES = {4007, 4009}
+
+# Every intent, message content included
+ALL_INTENTS = 32767 | (1 << 15)
+
+# Type and sequence number leading a dispatch, as Discord serializes it, so
+# that unwanted events are dropped without decoding their payload
+DISPATCH_HEADER = re.compile(rb'^\{"t":"([A-Z_]+)","s":(\d+),"op":0,')
+# Dispatches every session needs
+SESSION_EVENTS = {"READY", "RESUMED"}
+
+# Ending of every complete message of the zlib-stream transport
+ZLIB_SUFFIX = b"\x00\x00\xff\xff"
+
 
 class DiscordAPI:
     """Discord WebSocket Connection."""
 
     def __init__(
-        self, token: str, uri: str = "wss://gateway.discord.gg/?v=10&encoding=json"
+        self,
+        token: str,
+        uri: str = GATEWAY_URL,
+        on_dispatch: Optional[Callable[[str, dict], None]] = None,
+        reconnect_delay: float = 5.0,
+        compress: bool = False,
+        report_interval: float = 300.0,
+        intents: int = ALL_INTENTS,
+        dispatch_types: Optional[Set[str]] = None,
+        shard: Optional[Tuple[int, int]] = None,
+        identify_limiter=None,
     ):
+        """
+        :param token: Bot token.
+        :param uri: Gateway URL, without its query string.
+        :param on_dispatch: Called with the type and payload of every
+            dispatched event (see DiscordGateway).
+        :param reconnect_delay: Seconds before reconnecting a dropped session.
+        :param compress: Ask for the zlib-stream transport compression.
+        :param report_interval: Seconds between two traffic summaries.
+        :param intents: Gateway intents requested on IDENTIFY.
+        :param dispatch_types: Dispatches handed to ``on_dispatch``, None for
+            all; the others are dropped before being decoded.
+        :param shard: (shard id, number of shards), None when not sharded.
+        :param identify_limiter: IdentifyLimiter shared by the shards.
+        """
         self.token = token
         self.uri = uri
         self.websocket = None
         self.sequence = None
         self.heartbeat_interval = None
+        self.on_dispatch = on_dispatch
+        self.reconnect_delay = reconnect_delay
+        self.compress = compress
+        self.report_interval = report_interval
+        self.intents = intents
+        self.dispatch_types = dispatch_types
+        self.shard = shard
+        self.identify_limiter = identify_limiter
+        # Session to resume after a reconnection, set by READY
+        self.session_id: Optional[str] = None
+        self.resume_url: Optional[str] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._acked = True
+        self._closed = False
+        self._retry_in = reconnect_delay
+        # zlib-stream state, one per connection
+        self._inflator = None
+        self._chunks = bytearray()
+        # Bytes received, as sent by Discord and once inflated
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self._reported_at = time.monotonic()
 
-        # Event queues for different types
-        self.event_queues = {
-            "MESSAGE_CREATE": asyncio.Queue(),
-            "GUILD_ROLE_CREATE": asyncio.Queue(),
-            "CHANNEL_CREATE": asyncio.Queue(),
-            "GUILD_MEMBER_ADD": asyncio.Queue(),
-            "GUILD_MEMBER_REMOVE": asyncio.Queue(),
-            "MESSAGE_UPDATE": asyncio.Queue(),
-            "MESSAGE_DELETE": asyncio.Queue(),
-            "CHANNEL_UPDATE": asyncio.Queue(),
-            "CHANNEL_DELETE": asyncio.Queue(),
-            "GUILD_UPDATE": asyncio.Queue(),
-            # Add other events as needed...
-        }
-
-        # Event handlers dynamically registered by event type
-        self._event_handlers = {
-            event: self.create_generic_handler(event) for event in self.event_queues
-        }
+    @property
+    def compression_ratio(self) -> float:
+        return self.decoded_bytes / self.wire_bytes if self.wire_bytes else 1.0
 
     async def connect(self):
-        """Connect to Discord WebSocket and handle IDENTIFY payload."""
-        self.websocket = await websockets.connect(self.uri)
-        await self.send_identify()
-        asyncio.create_task(self.listen())  # Run listen as a separate task
+        """
+        Connect to Discord WebSocket; IDENTIFY, or RESUME the previous
+        session, is sent on HELLO.
+        """
+        base = self.resume_url if self.session_id and self.resume_url else self.uri
+        url = f"{base}/?v={GATEWAY_VERSION}&encoding=json"
+        if self.compress:
+            url += "&compress=zlib-stream"
+        self.websocket = await websockets.connect(url)
+        self._inflator = zlib.decompressobj() if self.compress else None
+        self._chunks = bytearray()
+        self._acked = True
+
+    async def run(self):
+        """
+        Keep a gateway session open until ``close`` is called, reconnecting
+        whenever it drops and resuming it when Discord allows it.
+        """
+        while not self._closed:
+            self._retry_in = self.reconnect_delay
+            try:
+                await self.connect()
+                await self.listen()
+            except Exception as e:
+                LOGGER.error(f"Discord gateway connection failed: {e}")
+            finally:
+                self._stop_heartbeat()
+            if not self._closed:
+                await asyncio.sleep(self._retry_in)
+
+    async def close(self):
+        """Close the session for good."""
+        self._closed = True
+        self._stop_heartbeat()
+        if self.websocket is not None:
+            await self.websocket.close()
 
     async def send_identify(self):
         """Send IDENTIFY payload to Discord."""
         payload = {
-            "op": 2,
+            "op": IDENTIFY,
             "d": {
                 "token": self.token,
-                "intents": 32767 | (1 << 15),  # Listen to all intents
+                "intents": self.intents,
                 "properties": {
                     "$os": "linux",
                     "$browser": "aiohttp",
@@ -62,97 +165,209 @@ class DiscordAPI:
                 },
             },
         }
+        if self.shard is not None:
+            payload["d"]["shard"] = list(self.shard)
+        if self.identify_limiter is not None:
+            await self.identify_limiter.acquire(self.shard[0] if self.shard else 0)
+        await self.websocket.send(json.dumps(payload))
+        metrics.DISCORD_GATEWAY_SESSIONS.labels("identify").inc()
+
+    async def send_resume(self):
+        """Send RESUME payload to replay the events missed since ``sequence``."""
+        payload = {
+            "op": RESUME,
+            "d": {
+                "token": self.token,
+                "session_id": self.session_id,
+                "seq": self.sequence,
+            },
+        }
         await self.websocket.send(json.dumps(payload))
+        metrics.DISCORD_GATEWAY_SESSIONS.labels("resume").inc()
 
     async def listen(self):
-        """Listen for events from Discord WebSocket."""
-        while True:
-            try:
-                message = await self.websocket.recv()
+        """Listen for events until the WebSocket connection closes."""
+        try:
+            async for message in self.websocket:
                 await self.handle_message(message)
-            except websockets.ConnectionClosed as e:
-                LOGGER.warning(f"WebSocket connection closed: {e}. Reconnecting...")
-                await self.reconnect()
-                break
-            except Exception as e:
-                LOGGER.error(f"Unexpected error while listening to WebSocket: {e}")
-                break
+        except websockets.ConnectionClosed as e:
+            code = e.rcvd.code if e.rcvd else None
+            if code in FATAL_CLOSE_CODES:
+                LOGGER.error(f"Discord gateway refused the session ({code}): {e}")
+                self._closed = True
+                return
+            if code in RESET_CLOSE_CODES:
+                self._reset_session()
+            LOGGER.warning(f"WebSocket connection closed: {e}. Reconnecting...")
 
-    async def handle_message(self, message: str):
+    async def handle_message(self, message: Union[str, bytes]):
         """Handle incoming messages from Discord WebSocket."""
         try:
+            message = self._decode(message)
+            if message is None or self._unwanted(message):
+                return
             event = json.loads(message)
 
-            if event["op"] == 10:  # HELLO event
+            if event.get("s") is not None:
+                self.sequence = event["s"]
+
+            op = event["op"]
+            if op == DISPATCH:
+                self._on_dispatch(event["t"], event["d"])
+            elif op == HELLO:
                 self.heartbeat_interval = event["d"]["heartbeat_interval"] / 1000
-                asyncio.create_task(self.send_heartbeat())
-            elif event.get("t"):  # Check if the event type exists
-                event_type = event["t"]
-                event_data = event["d"]
-                handler = self._event_handlers.get(event_type)
-                if handler:
-                    await handler(event_data)
+                self._stop_heartbeat()
+                self._heartbeat = asyncio.create_task(self.send_heartbeat())
+                if self.session_id and self.sequence is not None:
+                    await self.send_resume()
+                else:
+                    await self.send_identify()
+            elif op == HEARTBEAT:
+                await self._beat()
+            elif op == HEARTBEAT_ACK:
+                self._acked = True
+            elif op == RECONNECT:
+                LOGGER.info("Discord asked to reconnect, resuming the session.")
+                await self._reconnect_now()
+            elif op == INVALID_SESSION:
+                if not event["d"]:
+                    LOGGER.warning("Discord gateway session invalidated.")
+                    self._reset_session()
+                await self._reconnect_now(random.uniform(1, 5))
         except json.JSONDecodeError as e:
             LOGGER.error(f"Failed to decode message: {e}")
-        except KeyError as e:
-            LOGGER.error(f"Missing expected key in event: {e}")
+        except (KeyError, zlib.error) as e:
+            LOGGER.error(f"Invalid gateway message: {e}")
 
-    def create_generic_handler(self, event_type: str):
-        """Create a generic handler for events."""
+    def _decode(self, message: Union[str, bytes]) -> Optional[Union[str, bytes]]:
+        """
+        Payload of a message, None while a compressed one is incomplete.
+        """
+        # Text frames are counted in UTF-8 bytes, as sent on the wire
+        size = len(message.encode()) if isinstance(message, str) else len(message)
+        self._count("wire", size)
+        if self._inflator is None:
+            self._count("decoded", size)
+            return message
 
-        async def handler(data: dict):
-            LOGGER.info(f"Event {event_type} received: {json.dumps(data, indent=2)}")
-            queue = self.event_queues.get(event_type)
-            if queue:
-                await queue.put(data)
+        # zlib-stream: a message may span several frames, the last one ends
+        # with a sync flush marker; the inflate context spans the connection
+        self._chunks.extend(message)
+        if not message.endswith(ZLIB_SUFFIX):
+            return None
+        payload = self._inflator.decompress(bytes(self._chunks))
+        self._chunks.clear()
+        self._count("decoded", len(payload))
+        return payload
 
-        return handler
+    def _count(self, kind: str, size: int):
+        metrics.DISCORD_GATEWAY_BYTES.labels(kind).inc(size)
+        if kind == "wire":
+            self.wire_bytes += size
+            return
+        self.decoded_bytes += size
+        self._report()
+
+    def _unwanted(self, message: Union[str, bytes]) -> bool:
+        """
+        Whether a message is a dispatch nobody needs, read from its header
+        only. Its sequence number is still recorded for RESUME.
+        """
+        if self.dispatch_types is None:
+            return False
+        header = message[:64]
+        if isinstance(header, str):
+            header = header.encode()
+        match = DISPATCH_HEADER.match(header)
+        if match is None:
+            return False
+        event_type = match.group(1).decode()
+        if event_type in self.dispatch_types or event_type in SESSION_EVENTS:
+            return False
+        self.sequence = int(match.group(2))
+        metrics.DISCORD_GATEWAY_DROPPED.labels(event_type).inc()
+        return True
+
+    async def reidentify(self):
+        """
+        Start a new session, e.g. to apply new ``intents``, which a resumed
+        session would not.
+        """
+        self._reset_session()
+        if self.websocket is not None:
+            await self._reconnect_now()
+
+    def _on_dispatch(self, event_type: str, data: dict):
+        if event_type == "READY":
+            self.session_id = data["session_id"]
+            self.resume_url = data.get("resume_gateway_url")
+            LOGGER.info("Discord gateway session ready.")
+        elif event_type == "RESUMED":
+            LOGGER.info(f"Discord gateway session resumed at {self.sequence}.")
+        LOGGER.debug(f"Event {event_type} received.")
+        if self.on_dispatch is not None:
+            self.on_dispatch(event_type, data)
 
     async def send_heartbeat(self):
         """Send heartbeat to keep the connection alive."""
+        # The first one is jittered, so that reconnecting clients spread out
+        await asyncio.sleep(self.heartbeat_interval * random.random())
         while True:
-            await asyncio.sleep(self.heartbeat_interval)
             try:
                 if self.websocket.state != websockets.protocol.State.OPEN:
                     LOGGER.warning("WebSocket is not open. Stopping heartbeat.")
                     break
+                if not self._acked:
+                    # Zombie connection, resume on a fresh one
+                    LOGGER.warning("Heartbeat not acknowledged. Reconnecting...")
+                    # Not cancelled by the teardown this triggers
+                    self._heartbeat = None
+                    await self._reconnect_now()
+                    break
 
-                heartbeat_payload = {"op": 1, "d": self.sequence}
-                await self.websocket.send(json.dumps(heartbeat_payload))
+                await self._beat()
             except websockets.ConnectionClosed as e:
                 LOGGER.warning(f"WebSocket connection closed: {e}. Stopping heartbeat.")
                 break
             except Exception as e:
                 LOGGER.error(f"Unexpected error while sending heartbeat: {e}")
                 break
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def _beat(self):
+        self._acked = False
+        await self.websocket.send(json.dumps({"op": HEARTBEAT, "d": self.sequence}))
 
-    async def wait_for_event(self, event_type: str, filter_fn=None):
+    async def _reconnect_now(self, delay: float = 0.0):
         """
-        Generator to wait for a specific event.
-        :param event_type: The type of the event to wait for.
-        :param filter_fn: Optional function to filter events.
+        Drop the connection without ending the session, so that the next one
+        resumes it, ``delay`` seconds from now.
         """
-        if event_type not in self.event_queues:
-            raise ValueError(f"Unsupported event type: {event_type}")
+        self._retry_in = delay
+        # Closing with 1000 or 1001 would invalidate the session
+        await self.websocket.close(code=4000)
 
-        while True:
-            try:
-                event_data = await self.event_queues[event_type].get()
-                if not filter_fn or filter_fn(event_data):
-                    yield event_data
-            except asyncio.QueueEmpty:
-                LOGGER.warning(f"Queue for event {event_type} is empty.")
-            except Exception as e:
-                LOGGER.error(f"Error while waiting for event {event_type}: {e}")
+    def _reset_session(self):
+        self.session_id = None
+        self.resume_url = None
+        self.sequence = None
 
-    async def reconnect(self):
-        """Reconnect to the Discord WebSocket."""
-        try:
-            await self.connect()
-        except Exception as e:
-            LOGGER.error(f"Failed to reconnect: {e}")
-            await asyncio.sleep(5)
-            await self.reconnect()
+    def _report(self):
+        now = time.monotonic()
+        if now - self._reported_at < self.report_interval:
+            return
+        LOGGER.info(
+            f"Discord gateway: received {self.wire_bytes} bytes for "
+            f"{self.decoded_bytes} decoded, compression ratio "
+            f"{self.compression_ratio:.1f}."
+        )
+        self.wire_bytes = self.decoded_bytes = 0
+        self._reported_at = now
+
+    def _stop_heartbeat(self):
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
 
     async def send_message(self, channel_id: str, content: str):
         """Send a message to a specific channel."""
@@ -168,7 +383,7 @@ class DiscordAPI:
             }
             payload = {"content": content}
 
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
                 async with session.post(url, headers=headers, json=payload) as response:
                     if response.status == 200:
                         LOGGER.info(
@@ -1,68 +1,423 @@
 import asyncio
 import logging
-from typing import Dict, List
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterable, Optional, Set, Tuple, Union
 
-from ...Trigger.discord.new_message_in_channel import NewMessageInChannelTrigger
-from .dicord import DiscordAPI
+from src.config import async_redis_client, settings
+
+from .bus import StreamReader
+from .dicord import GATEWAY_URL, DiscordAPI
+from .sharding import (
+    IdentifyLimiter,
+    agreed_shard_count,
+    fetch_channel_guild,
+    fetch_gateway_bot,
+    shard_key,
+    shard_of,
+)
 
 LOGGER = logging.getLogger(__name__)
 
+# Dispatch type -> payload field scoping it to a channel or a guild
+EVENT_SCOPES: Dict[str, str] = {
+    "MESSAGE_CREATE": "channel_id",
+    "MESSAGE_UPDATE": "channel_id",
+    "MESSAGE_DELETE": "channel_id",
+    "CHANNEL_CREATE": "guild_id",
+    "CHANNEL_UPDATE": "guild_id",
+    "CHANNEL_DELETE": "guild_id",
+    "GUILD_ROLE_CREATE": "guild_id",
+    "GUILD_MEMBER_ADD": "guild_id",
+    "GUILD_MEMBER_REMOVE": "guild_id",
+}
+
+# Gateway intents (see the Discord gateway documentation)
+GUILDS = 1 << 0
+GUILD_MEMBERS = 1 << 1  # Privileged
+GUILD_MESSAGES = 1 << 9
+DIRECT_MESSAGES = 1 << 12
+MESSAGE_CONTENT = 1 << 15  # Privileged
+
+# Dispatch type -> intents it requires
+EVENT_INTENTS: Dict[str, int] = {
+    "MESSAGE_CREATE": GUILD_MESSAGES | DIRECT_MESSAGES | MESSAGE_CONTENT,
+    "MESSAGE_UPDATE": GUILD_MESSAGES | DIRECT_MESSAGES | MESSAGE_CONTENT,
+    "MESSAGE_DELETE": GUILD_MESSAGES | DIRECT_MESSAGES,
+    "CHANNEL_CREATE": GUILDS,
+    "CHANNEL_UPDATE": GUILDS,
+    "CHANNEL_DELETE": GUILDS,
+    "GUILD_ROLE_CREATE": GUILDS,
+    "GUILD_MEMBER_ADD": GUILD_MEMBERS,
+    "GUILD_MEMBER_REMOVE": GUILD_MEMBERS,
+}
+
+# (dispatch type, channel or guild id)
+SubscriptionKey = Tuple[str, str]
+
+
+@dataclass(eq=False)
+class GatewaySubscription:
+    """
+    Events of one type in one channel or guild, waiting for the trigger that
+    subscribed to them. Only the latest ``maxlen`` events are kept.
+    """
+
+    event_type: str
+    scope_id: str
+    maxlen: int = 100
+    events: Deque[dict] = field(init=False)
+    dropped: int = 0
+
+    def __post_init__(self):
+        self.events = deque(maxlen=max(self.maxlen, 1))
+
+    @property
+    def key(self) -> SubscriptionKey:
+        return self.event_type, self.scope_id
+
+    def push(self, event: dict):
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        self.events.append(event)
+
+    def pop(self) -> Optional[dict]:
+        """
+        Oldest pending event, None if there is none.
+        """
+        return self.events.popleft() if self.events else None
+
 
 class DiscordGateway:
-    def __init__(self, token: str):
+    """
+    Long-lived gateway sessions of a bot token, shared by every Discord
+    trigger of the process.
+
+    Triggers subscribe to a dispatch type in a channel or a guild; each
+    dispatch is routed to the matching subscriptions with a single lookup on
+    (type, channel or guild id) and waits there until the trigger's next
+    evaluation. The sessions open with the first subscription and close with
+    the last one.
+
+    The bot's guilds are split across the number of shards recommended by
+    ``/gateway/bot``; the process only runs the shards ``assign``-ed to it
+    (all of them by default), so it only receives and routes the events of
+    their guilds. Shards identify within Discord's concurrency buckets.
+
+    The sessions only ask for the intents the subscribed dispatch types
+    require, and drop the other dispatches before decoding them. A
+    subscription needing more intents starts new sessions right away;
+    intents no longer needed are given up on the next IDENTIFY, so that
+    stopping triggers never costs one.
+
+    With ``streams``, the shards are not connected to: their dispatches are
+    read from the Redis Streams written by the gateway-ingest processes
+    (see StreamReader), which ``forward`` them there.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        redis_client=None,
+        inbox_size: int = 100,
+        compress: bool = False,
+        reconnect_delay: float = 5.0,
+        shard_count: Optional[int] = None,
+        streams: bool = False,
+        consumer: Optional[str] = None,
+        stream_max_age: float = 300.0,
+    ):
+        """
+        :param token: Bot token.
+        :param redis_client: Async Redis client, to agree on the shard count
+            and identify buckets with the other processes.
+        :param inbox_size: Events kept per subscription between two
+            evaluations of its trigger, the oldest are dropped first.
+        :param compress: Use the zlib-stream transport compression.
+        :param reconnect_delay: Seconds before reconnecting a lost session.
+        :param shard_count: Number of shards, None for Discord's
+            recommendation.
+        :param streams: Read the shards' dispatches from the Redis Streams
+            instead of opening gateway sessions.
+        :param consumer: Consumer name of this process on the streams.
+        :param stream_max_age: Seconds after which a streamed dispatch is
+            skipped.
+        """
         self.token = token
-        self.ws = None
-        self.subscriptions: Dict[str, List["NewMessageInChannelTrigger"]] = {}
-
-    async def start_connection(self):
-        """Start the WebSocket connection to Discord and manage events."""
-        self.ws = await self._connect_to_discord_gateway()
-        await self._listen_for_events()
-
-    async def _connect_to_discord_gateway(self):
-        """Simulated connection to Discord gateway."""
-        # Logic for initiating the WebSocket connection to Discord
-        # You would need to use a library like discord.py here to establish the connection
-        pass
-
-    async def _listen_for_events(self):
-        """Listen for incoming events from Discord."""
-        while True:
-            event = await self.ws.receive()
-            await self._handle_event(event)
-
-    async def _handle_event(self, event: dict):
-        """Filter events and route them to the relevant trigger."""
-        channel_id = event.get("channel_id")
-        user_id = event.get("user_id")
-
-        # Route the event to the appropriate triggers
-        if channel_id and channel_id in self.subscriptions:
-            for trigger in self.subscriptions[channel_id]:
-                await trigger.process_event(event)
-
-        if user_id and user_id in self.subscriptions:
-            for trigger in self.subscriptions[user_id]:
-                await trigger.process_event(event)
-
-    def subscribe_to_channel(
-        self, channel_id: str, trigger: "NewMessageInChannelTrigger"
+        self.redis_client = redis_client
+        self.inbox_size = inbox_size
+        self.compress = compress
+        self.reconnect_delay = reconnect_delay
+        self.shard_count = shard_count
+        self.streams = streams
+        self.consumer = consumer
+        self.stream_max_age = stream_max_age
+        self.subscriptions: Dict[SubscriptionKey, Set[GatewaySubscription]] = {}
+        # Set by configure()
+        self.num_shards: Optional[int] = None
+        self.url = GATEWAY_URL
+        self.identify_limiter: Optional[IdentifyLimiter] = None
+        # Shards this process runs, None for all of them
+        self.assigned: Optional[Set[int]] = None
+        self.shards: Dict[int, Union[DiscordAPI, StreamReader]] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._configuring = asyncio.Lock()
+        # Channel id -> guild id
+        self._channel_guilds: Dict[str, Optional[str]] = {}
+        # Dispatch types handed to the sink whatever the subscriptions
+        self.forwarded: Set[str] = set()
+        self._sink: Optional[Callable[[str, dict], None]] = None
+
+    @property
+    def intents(self) -> int:
+        """
+        Intents required by the current subscriptions.
+        """
+        intents = 0
+        for event_type in self.event_types:
+            intents |= EVENT_INTENTS[event_type]
+        return intents
+
+    @property
+    def event_types(self) -> Set[str]:
+        return {event_type for event_type, _ in self.subscriptions} | self.forwarded
+
+    async def configure(self) -> int:
+        """
+        Fetch the connection parameters from ``/gateway/bot`` on first call.
+
+        :return: The number of shards.
+        """
+        async with self._configuring:
+            if self.num_shards is not None:
+                return self.num_shards
+            bot = await fetch_gateway_bot(self.token)
+            count = self.shard_count or bot.shards
+            if self.redis_client is not None:
+                if not self.shard_count:
+                    count = await agreed_shard_count(
+                        self.redis_client, self.token, count
+                    )
+                self.identify_limiter = IdentifyLimiter(
+                    self.redis_client, self.token, bot.max_concurrency
+                )
+            self.url = bot.url
+            self.num_shards = count
+            return count
+
+    async def placement(self, guild_id: Optional[str]) -> str:
+        """
+        Hash ring key of the shard receiving a guild's events, so that its
+        areas are run by the process running the shard. Direct messages
+        (no guild) are only sent to shard 0.
+        """
+        num_shards = await self.configure()
+        return shard_key(shard_of(guild_id, num_shards) if guild_id else 0)
+
+    async def guild_of_channel(self, channel_id: str) -> Optional[str]:
+        if channel_id not in self._channel_guilds:
+            self._channel_guilds[channel_id] = await fetch_channel_guild(
+                self.token, channel_id
+            )
+        return self._channel_guilds[channel_id]
+
+    async def assign(self, shard_ids: Iterable[int]):
+        """
+        Run the given shards only, e.g. those this process owns on the
+        scheduler hash ring.
+        """
+        self.assigned = set(shard_ids)
+        await self._sync_shards()
+
+    async def assign_owned(self, coordinator, handoff_delay: float):
+        """
+        Run the shards this process owns on a ShardCoordinator's ring. Shards
+        are dropped right away and taken once the previous owner had
+        ``handoff_delay`` seconds to let them go.
+        """
+        if self.num_shards is None:
+            return
+        owned = {
+            shard_id
+            for shard_id in range(self.num_shards)
+            if coordinator.owns_key(shard_key(shard_id))
+        }
+        if not coordinator.settled(handoff_delay):
+            owned &= self.assigned if self.assigned is not None else set()
+        if owned != self.assigned:
+            LOGGER.info(f"Running Discord gateway shards {sorted(owned)}.")
+            await self.assign(owned)
+
+    async def subscribe(self, event_type: str, scope_id: str) -> GatewaySubscription:
+        """
+        Start receiving the ``event_type`` dispatches of a channel or guild,
+        opening the sessions if needed.
+        """
+        if event_type not in EVENT_SCOPES:
+            raise ValueError(f"Unsupported event type: {event_type}")
+        await self.configure()
+        subscription = GatewaySubscription(event_type, scope_id, self.inbox_size)
+        self.subscriptions.setdefault(subscription.key, set()).add(subscription)
+        await self._widen_sessions()
+        await self._sync_shards()
+        return subscription
+
+    async def forward(
+        self, event_types: Iterable[str], sink: Callable[[str, dict], None]
     ):
-        """Subscribe a trigger to a specific channel."""
-        if channel_id not in self.subscriptions:
-            self.subscriptions[channel_id] = []
-        self.subscriptions[channel_id].append(trigger)
-        # Tell Discord to listen to this channel's messages (via WebSocket)
-        self._add_subscription_to_discord(channel_id)
-
-    def subscribe_to_user(self, user_id: str, trigger: "NewMessageInChannelTrigger"):
-        """Subscribe a trigger to a specific user."""
-        if user_id not in self.subscriptions:
-            self.subscriptions[user_id] = []
-        self.subscriptions[user_id].append(trigger)
-        # Tell Discord to listen to this user's messages (via WebSocket)
-        self._add_subscription_to_discord(user_id)
-
-    def _add_subscription_to_discord(self, identifier: str):
-        """Inform Discord that we want to listen to this identifier (channel or user)."""
-        pass  # This would be an API call to subscribe to a channel's or user's messages
+        """
+        Hand every dispatch of the given types to ``sink``, keeping the
+        sessions open without subscriptions (gateway-ingest mode). Called
+        again when the types change; as with ``unsubscribe``, intents no
+        longer needed are given up on the next IDENTIFY.
+        """
+        event_types = set(event_types)
+        unsupported = event_types - EVENT_SCOPES.keys()
+        if unsupported:
+            raise ValueError(f"Unsupported event types: {sorted(unsupported)}")
+        await self.configure()
+        self.forwarded = event_types
+        self._sink = sink
+        await self._widen_sessions()
+        for api in self.shards.values():
+            api.intents = self.intents
+        await self._sync_shards()
+
+    async def unsubscribe(self, subscription: GatewaySubscription):
+        """
+        Stop routing events to a subscription, closing the sessions when it
+        was the last one.
+        """
+        subscribers = self.subscriptions.get(subscription.key)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.subscriptions[subscription.key]
+        if subscription.dropped:
+            LOGGER.warning(
+                f"Discord {subscription.event_type} subscription of "
+                f"{subscription.scope_id} dropped {subscription.dropped} events."
+            )
+        for api in self.shards.values():
+            api.dispatch_types = self.event_types
+            api.intents = self.intents
+        await self._sync_shards()
+
+    async def close(self):
+        for shard_id in list(self.shards):
+            await self._close_shard(shard_id)
+
+    async def _widen_sessions(self):
+        """
+        Re-identify the open sessions missing intents the current
+        subscriptions require.
+        """
+        intents = self.intents
+        for shard_id, api in self.shards.items():
+            api.dispatch_types = self.event_types
+            if not self.streams and intents & ~api.intents:
+                api.intents = intents
+                LOGGER.info(
+                    f"Discord gateway shard {shard_id} re-identifying, "
+                    f"intents {intents}."
+                )
+                await api.reidentify()
+
+    async def _sync_shards(self):
+        """
+        Open the sessions of the assigned shards while there are
+        subscriptions, close the others.
+        """
+        wanted: Set[int] = set()
+        if (self.subscriptions or self.forwarded) and self.num_shards is not None:
+            wanted = set(range(self.num_shards))
+            if self.assigned is not None:
+                wanted &= self.assigned
+        for shard_id in set(self.shards) - wanted:
+            await self._close_shard(shard_id)
+        for shard_id in wanted - set(self.shards):
+            self._open_shard(shard_id)
+
+    def _open_shard(self, shard_id: int):
+        api = self.shards[shard_id] = self._session(shard_id)
+        self._tasks[shard_id] = asyncio.create_task(api.run())
+        source = "the event streams" if self.streams else f"intents {api.intents}"
+        LOGGER.info(
+            f"Discord gateway shard {shard_id}/{self.num_shards} opened, {source}."
+        )
+
+    def _session(self, shard_id: int) -> Union[DiscordAPI, StreamReader]:
+        if self.streams:
+            return StreamReader(
+                self.redis_client,
+                shard_id,
+                on_dispatch=self._dispatch,
+                dispatch_types=self.event_types,
+                consumer=self.consumer,
+                max_age=self.stream_max_age,
+            )
+        return DiscordAPI(
+            self.token,
+            uri=self.url,
+            on_dispatch=self._dispatch,
+            reconnect_delay=self.reconnect_delay,
+            compress=self.compress,
+            intents=self.intents,
+            dispatch_types=self.event_types,
+            shard=(shard_id, self.num_shards),
+            identify_limiter=self.identify_limiter,
+        )
+
+    async def _close_shard(self, shard_id: int):
+        api = self.shards.pop(shard_id)
+        task = self._tasks.pop(shard_id)
+        await api.close()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        LOGGER.info(f"Discord gateway shard {shard_id} closed.")
+
+    def _dispatch(self, event_type: str, data: dict):
+        scope = EVENT_SCOPES.get(event_type)
+        if scope is None:
+            return
+        if event_type in self.forwarded:
+            self._sink(event_type, data)
+        for subscription in self.subscriptions.get((event_type, data.get(scope)), ()):
+            subscription.push(data)
+
+
+# Token -> its process wide sessions
+_GATEWAYS: Dict[str, DiscordGateway] = {}
+
+
+def shared_gateway(token: str) -> DiscordGateway:
+    """
+    Gateway sessions of a bot token, shared by the whole process.
+    """
+    gateway = _GATEWAYS.get(token)
+    if gateway is None:
+        config = settings.discord_gateway
+        gateway = _GATEWAYS[token] = DiscordGateway(
+            token,
+            redis_client=async_redis_client,
+            inbox_size=config.inbox_size,
+            compress=config.compress,
+            reconnect_delay=config.reconnect_delay,
+            shard_count=config.shards,
+            streams=config.consume_streams,
+            consumer=settings.scheduler.node_name,
+            stream_max_age=config.stream_max_age,
+        )
+    return gateway
+
+
+def bot_gateway() -> Optional[DiscordGateway]:
+    """
+    Gateway sessions of the configured Discord bot, None if there is none.
+    """
+    provider = settings.oauth.providers.get("discord")
+    token = getattr(provider, "token", None)
+    return shared_gateway(token) if token else None
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import aiohttp
+
+from src.service.metrics import provider_trace
+from src.service.Scheduler.poller import credential_key
+
+LOGGER = logging.getLogger(__name__)
+
+API_URL = "https://discord.com/api/v10"
+
+# Discord lets one shard per bucket identify every 5 seconds
+IDENTIFY_INTERVAL = 5.0
+
+TRACE_CONFIGS = [provider_trace("discord")]
+
+
+def shard_of(guild_id: str, num_shards: int) -> int:
+    """
+    Shard receiving the events of a guild, as computed by Discord.
+    """
+    return (int(guild_id) >> 22) % num_shards
+
+
+def shard_key(shard_id: int) -> str:
+    """
+    Key of a shard on the scheduler hash ring (see ShardCoordinator).
+    """
+    return f"discord-shard:{shard_id}"
+
+
+@dataclass(frozen=True)
+class GatewayBot:
+    """
+    Connection parameters recommended by ``GET /gateway/bot``.
+    """
+
+    url: str
+    shards: int
+    max_concurrency: int
+
+
+async def fetch_gateway_bot(token: str) -> GatewayBot:
+    """
+    :raises aiohttp.ClientError: If Discord cannot be reached or refuses
+        the token.
+    """
+    headers = {"Authorization": f"Bot {token}"}
+    async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
+        async with session.get(f"{API_URL}/gateway/bot", headers=headers) as response:
+            response.raise_for_status()
+            data = await response.json()
+    limit = data.get("session_start_limit") or {}
+    LOGGER.info(
+        f"Discord recommends {data['shards']} shards, "
+        f"{limit.get('remaining')} identifies left today."
+    )
+    return GatewayBot(
+        url=data["url"],
+        shards=max(int(data["shards"]), 1),
+        max_concurrency=max(int(limit.get("max_concurrency", 1)), 1),
+    )
+
+
+async def agreed_shard_count(redis_client, token: str, recommended: int) -> int:
+    """
+    Shard count shared by every process: the first one to start records the
+    count it got from Discord, the others follow it so that they all map
+    guilds to the same shards. Delete the key to reshard.
+    """
+    key = f"discord:gateway:{credential_key(token)}:shards"
+    await redis_client.set(key, recommended, nx=True)
+    return int(await redis_client.get(key))
+
+
+class IdentifyLimiter:
+    """
+    Enforces Discord's identify concurrency across processes: shards are
+    grouped in ``max_concurrency`` buckets (``shard_id % max_concurrency``)
+    and each bucket may identify once every 5 seconds. A bucket is claimed
+    with a Redis key expiring after that delay.
+    """
+
+    def __init__(self, redis_client, token: str, max_concurrency: int = 1):
+        self.redis_client = redis_client
+        self.prefix = f"discord:identify:{credential_key(token)}"
+        self.max_concurrency = max(max_concurrency, 1)
+
+    async def acquire(self, shard_id: int):
+        """
+        Wait until the shard's bucket lets it identify.
+        """
+        key = f"{self.prefix}:{shard_id % self.max_concurrency}"
+        ttl = int(IDENTIFY_INTERVAL * 1000)
+        while not await self.redis_client.set(key, shard_id, nx=True, px=ttl):
+            wait = await self.redis_client.pttl(key)
+            await asyncio.sleep(max(wait, 100) / 1000)
+
+
+async def fetch_channel_guild(token: str, channel_id: str) -> Optional[str]:
+    """
+    Guild of a channel, None for a DM channel.
+    """
+    headers = {"Authorization": f"Bot {token}"}
+    url = f"{API_URL}/channels/{channel_id}"
+    async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
+        async with session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            data = await response.json()
+    return data.get("guild_id")
@@ -3,8 +3,13 @@ from typing import Any, Dict, List, Union
 
 import aiohttp
 
+from src.service.metrics import provider_trace
+
 LOGGER = logging.getLogger(__name__)
 
+# Request counts and latencies of this client (see src.service.metrics)
+TRACE_CONFIGS = [provider_trace("github")]
+
 
 class GitHubAPI:
     """GitHub API Client."""
@@ -22,7 +27,7 @@ class GitHubAPI:
             "Authorization": f"token {self.token}",
             "Accept": "application/vnd.github.v3+json",
         }
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
             if method == "GET":
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
@@ -5,8 +5,13 @@ from typing import Any, Dict, List, Optional, Union
 
 import aiohttp
 
+from src.service.metrics import provider_trace
+
 LOGGER = logging.getLogger(__name__)
 
+# Request counts and latencies of this client (see src.service.metrics)
+TRACE_CONFIGS = [provider_trace("google")]
+
 
 class GoogleAPI:
     """Google API client for various Google services"""
@@ -29,7 +34,7 @@ class GoogleAPI:
             "Content-Type": "application/json",
         }
 
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
             async with session.request(
                 method, url, headers=headers, params=params, json=json_data
             ) as response:
@@ -3,8 +3,13 @@ from typing import Any, Dict, List, Optional
 
 import aiohttp
 
+from src.service.metrics import provider_trace
+
 LOGGER = logging.getLogger(__name__)
 
+# Request counts and latencies of this client (see src.service.metrics)
+TRACE_CONFIGS = [provider_trace("microsoft")]
+
 
 class OutlookAPI:
     """Microsoft Graph API client for Outlook services"""
@@ -34,7 +39,7 @@ class OutlookAPI:
             else {"$orderby": "receivedDateTime desc"}
         )
 
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
             async with session.get(
                 url, headers=self.get_headers(), params=params
             ) as response:
@@ -49,7 +54,7 @@ class OutlookAPI:
         """Get Outlook message details by ID"""
         url = f"{self.base_url}/me/messages/{message_id}"
 
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
             async with session.get(url, headers=self.get_headers()) as response:
                 if response.status == 200:
                     return await response.json()
@@ -83,7 +88,7 @@ class OutlookAPI:
             }
         }
 
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
             async with session.post(
                 url, headers=self.get_headers(), json=data
             ) as response:
@@ -4,8 +4,13 @@ from typing import Any, Dict, List, Optional
 
 import aiohttp
 
+from src.service.metrics import provider_trace
+
 LOGGER = logging.getLogger(__name__)
 
+# Request counts and latencies of this client (see src.service.metrics)
+TRACE_CONFIGS = [provider_trace("spotify")]
+
 
 class SpotifyAPIClient:
     def __init__(self, token: Optional[str] = None):
@@ -36,7 +41,7 @@ class SpotifyAPIClient:
         if not self.is_token_valid():
             return None
 
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
             async with session.get(
                 f"{self.base_url}/me/player/currently-playing",
                 headers=self.get_headers(),
@@ -52,7 +57,7 @@ class SpotifyAPIClient:
         if not self.is_token_valid():
             return None
 
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
             async with session.get(
                 f"{self.base_url}/me/playlists", headers=self.get_headers()
             ) as response:
@@ -69,7 +74,7 @@ class SpotifyAPIClient:
 
         data = {"name": name, "description": description, "public": public}
 
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
             async with session.post(
                 f"{self.base_url}/users/{user_id}/playlists",
                 headers=self.get_headers(),
@@ -95,7 +100,7 @@ class SpotifyAPIClient:
 
         LOGGER.info(f"Making request to Spotify API with data: {data}")
 
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=TRACE_CONFIGS) as session:
             async with session.post(
                 f"{self.base_url}/playlists/{playlist_id}/tracks",
                 headers=self.get_headers(),
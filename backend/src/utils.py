@@ -1,3 +1,5 @@
+from typing import Optional
+
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
@@ -27,11 +29,15 @@ def make_session_factory(engine: Engine) -> sessionmaker:
     return sessionmaker(bind=engine)
 
 
-def make_async_redis_client(config: RedisConfig) -> Redis:
+def make_async_redis_client(
+    config: RedisConfig, decode_responses: Optional[bool] = None
+) -> Redis:
     return redis.Redis(
         host=config.host,
         port=config.port,
         db=config.db,
         password=config.password,
-        decode_responses=config.decode_responses,
+        decode_responses=(
+            config.decode_responses if decode_responses is None else decode_responses
+        ),
     )
@@ -0,0 +1,62 @@
+from functools import lru_cache
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from src.auth.config import get_current_admin
+from src.config import async_redis_binary_client, settings
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+
+@lru_cache(maxsize=None)
+def dead_letters():
+    """
+    Dead letters of the task queue, built on first use so that the web app
+    does not import the queue runtime (msgpack, zstandard) at startup.
+    """
+    from src.service.Queue.factory import make_dead_letters, make_task_queue
+
+    return make_dead_letters(
+        settings.queue,
+        make_task_queue(settings.queue, async_redis_binary_client),
+        async_redis_binary_client,
+    )
+
+
+@router.get("/dead-letters", response_model=Dict[str, Any])
+async def list_dead_letters(
+    count: int = Query(50, ge=1, le=1000),
+    current_admin=Depends(get_current_admin),
+):
+    """
+    Latest tasks that exhausted their retries, newest first.
+    """
+    entries = await dead_letters().list(count)
+    return {"total": await dead_letters().count(), "entries": entries}
+
+
+@router.post("/dead-letters/replay", response_model=Dict[str, int])
+async def replay_dead_letters(current_admin=Depends(get_current_admin)):
+    """
+    Push every dead letter back onto the task queue with a fresh retry budget.
+    """
+    return {"replayed": await dead_letters().replay_all()}
+
+
+@router.post("/dead-letters/{entry_id}/replay", response_model=Dict[str, int])
+async def replay_dead_letter(entry_id: str, current_admin=Depends(get_current_admin)):
+    if not await dead_letters().replay(entry_id):
+        raise HTTPException(
+            status_code=404, detail=f"Dead letter '{entry_id}' not found."
+        )
+    return {"replayed": 1}
+
+
+@router.delete("/dead-letters/{entry_id}", response_model=Dict[str, int])
+async def delete_dead_letter(entry_id: str, current_admin=Depends(get_current_admin)):
+    if not await dead_letters().delete(entry_id):
+        raise HTTPException(
+            status_code=404, detail=f"Dead letter '{entry_id}' not found."
+        )
+    return {"deleted": 1}
@@ -5,9 +5,10 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.config import get_db_async_session
+from src.config import async_redis_client, get_db_async_session
 from src.db.models import Area, Service
 from src.schemas.area import AreaCreate, AreaResponse
+from src.service.Scheduler.scheduler import INTERVALS_KEY
 
 router = APIRouter(prefix="/api", tags=["API"])
 
@@ -64,6 +65,28 @@ async def get_area(
     return AreaResponse.from_orm(area)
 
 
+@router.get("/areas/{area_id}/interval")
+async def get_area_interval(
+    area_id: int,
+    session: AsyncSession = Depends(get_db_async_session),
+    current_user=Depends(get_current_user),
+):
+    """
+    Current effective polling interval of the area's trigger, in seconds.
+    None when the trigger is not running.
+    """
+    result = await session.execute(
+        select(Area.id).where(Area.id == area_id, Area.user_id == current_user.id)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Area not found")
+    interval = await async_redis_client.hget(INTERVALS_KEY, area_id)
+    return {
+        "area_id": area_id,
+        "interval": float(interval) if interval is not None else None,
+    }
+
+
 @router.put("/areas/{area_id}", response_model=AreaResponse)
 async def update_area(
     area_id: int,
@@ -5,8 +5,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.config import get_current_user
-from src.config import get_db_async_session
+from src.config import async_redis_client, get_db_async_session
 from src.db.models import Service, User, UserService
+from src.oauth.events import publish_token_invalidation
 from src.schemas.user_service import UserServiceResponse
 
 router = APIRouter(prefix="/api", tags=["API"])
@@ -25,6 +26,9 @@ async def add_user_service(
     session.add(new_user_service)
     await session.commit()
     await session.refresh(new_user_service)
+    await publish_token_invalidation(
+        async_redis_client, current_user.id, new_user_service.service_id
+    )
     return new_user_service
 
 
@@ -47,6 +51,7 @@ async def delete_user_service(
         raise HTTPException(status_code=404, detail="Service not found for the user.")
     await session.delete(user_service)
     await session.commit()
+    await publish_token_invalidation(async_redis_client, current_user.id, service_id)
     return {"status": "success"}
 
 
@@ -4,12 +4,15 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import PlainTextResponse
+from prometheus_client import make_asgi_app
 from starlette.middleware.sessions import SessionMiddleware
 
 from src.auth.config import SECRET_KEY
+from src.service import metrics
 
 from .about import router as about_router
 from .api.action import router as action_api_router
+from .api.admin import router as admin_api_router
 from .api.areas import router as areas_api_router
 from .api.config import router as config_router
 from .api.reactions import router as reactions_api_router
@@ -47,6 +50,10 @@ app.include_router(action_api_router)
 app.include_router(areas_api_router)
 app.include_router(user_services_router)
 app.include_router(config_router)
+app.include_router(admin_api_router)
+
+# Prometheus metrics of the API and of the provider clients it uses
+app.mount("/metrics", make_asgi_app())
 
 
 def custom_openapi():
@@ -90,6 +97,11 @@ async def log_requests(request: Request, call_next):
     print(f"Request headers: {request.headers}")  # Debugging
     response = await call_next(request)
     process_time = time.time() - start_time
+    # Label by route template, not by path, to bound the series
+    route = request.scope.get("route")
+    route = route.path if route is not None else "unmatched"
+    metrics.HTTP_REQUESTS.labels(request.method, route, response.status_code).inc()
+    metrics.HTTP_LATENCY.labels(request.method, route).observe(process_time)
     print(
         f"Request: {request.method} {request.url} completed in {process_time:.4f} seconds"
     )
@@ -7,8 +7,9 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.config import decode_access_token, get_current_user
-from src.config import get_db_async_session, settings
+from src.config import async_redis_client, get_db_async_session, settings
 from src.db.models import Service, User, UserService
+from src.oauth.events import publish_token_invalidation
 
 LOGGER = logging.getLogger(__name__)
 
@@ -128,6 +129,7 @@ async def oauth_callback(
         session.add(user_service)
 
     await session.commit()
+    await publish_token_invalidation(async_redis_client, current_user.id, service.id)
     request.session.pop("user_access_token", None)
 
     frontend_url = settings.frontend_url